@@ -0,0 +1,52 @@
+"""add_auth_roles_to_users
+
+Revision ID: a8e3f2c61d07
+Revises: f4b1d8c62e93
+Create Date: 2026-10-18 18:20:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a8e3f2c61d07"
+down_revision: Union[str, Sequence[str], None] = "f4b1d8c62e93"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "users",
+        sa.Column(
+            "auth_roles",
+            postgresql.ARRAY(sa.String()),
+            server_default="{}",
+            nullable=False,
+        ),
+    )
+    # Mavjud rol biriktirishlarini ko'chirish
+    op.execute(
+        """
+        UPDATE users AS u
+        SET auth_roles = sub.names
+        FROM (
+            SELECT ur.user_id, array_agg(r.name ORDER BY r.id) AS names
+            FROM user_roles AS ur
+            JOIN roles AS r ON r.id = ur.role_id
+            GROUP BY ur.user_id
+        ) AS sub
+        WHERE sub.user_id = u.id
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("users", "auth_roles")
@@ -0,0 +1,39 @@
+"""add_keyset_pagination_indexes
+
+Revision ID: b6f0c3a91e28
+Revises: a8e3f2c61d07
+Create Date: 2026-10-18 19:10:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b6f0c3a91e28"
+down_revision: Union[str, Sequence[str], None] = "a8e3f2c61d07"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_INDEXES = [
+    ("ix_workloads_edu_plan_id_id", "workloads", ["edu_plan_id", "id"]),
+    ("ix_specialities_department_id_id", "specialities", ["department_id", "id"]),
+    ("ix_subjects_name_id", "subjects", ["name", "id"]),
+    ("ix_streams_name_id", "streams", ["name", "id"]),
+    ("ix_edu_plans_name_id", "edu_plans", ["name", "id"]),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for name, table, columns in _INDEXES:
+        op.create_index(name, table, columns, unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name, table, _ in reversed(_INDEXES):
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,42 @@
+"""add_name_trigram_indexes
+
+Revision ID: c3d9e4a7f215
+Revises: b6f0c3a91e28
+Create Date: 2026-10-18 20:05:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c3d9e4a7f215"
+down_revision: Union[str, Sequence[str], None] = "b6f0c3a91e28"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# ILIKE '%...%' va trigram o'xshashligi (%) uchun GIN indekslar
+_TABLES = ["groups", "subjects", "streams", "specialities"]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for table in _TABLES:
+        op.create_index(
+            f"ix_{table}_name_trgm",
+            table,
+            ["name"],
+            unique=False,
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in reversed(_TABLES):
+        op.drop_index(f"ix_{table}_name_trgm", table_name=table)
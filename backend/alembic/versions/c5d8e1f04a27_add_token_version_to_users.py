@@ -0,0 +1,34 @@
+"""add_token_version_to_users
+
+Revision ID: c5d8e1f04a27
+Revises: a3f1c9d27e54
+Create Date: 2026-10-18 13:05:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c5d8e1f04a27"
+down_revision: Union[str, Sequence[str], None] = "a3f1c9d27e54"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "users",
+        sa.Column(
+            "token_version", sa.Integer(), server_default="0", nullable=False
+        ),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("users", "token_version")
@@ -0,0 +1,52 @@
+"""add_search_name_indexes
+
+Revision ID: d7a2c5e8b941
+Revises: c3d9e4a7f215
+Create Date: 2026-10-18 20:40:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "d7a2c5e8b941"
+down_revision: Union[str, Sequence[str], None] = "c3d9e4a7f215"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# /search: avtoto'ldirish uchun lower(name) prefiks indekslari (barcha turlar)
+_PREFIX_TABLES = ["faculties", "departments", "specialities", "groups", "subjects", "users"]
+# ILIKE '%...%' uchun trigram indekslari (qolgan jadvallarda c3d9e4a7f215 da yaratilgan)
+_TRGM_TABLES = ["faculties", "departments", "users"]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table in _PREFIX_TABLES:
+        op.create_index(
+            f"ix_{table}_name_prefix",
+            table,
+            [sa.text("lower(name) text_pattern_ops")],
+            unique=False,
+        )
+    for table in _TRGM_TABLES:
+        op.create_index(
+            f"ix_{table}_name_trgm",
+            table,
+            ["name"],
+            unique=False,
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in reversed(_TRGM_TABLES):
+        op.drop_index(f"ix_{table}_name_trgm", table_name=table)
+    for table in reversed(_PREFIX_TABLES):
+        op.drop_index(f"ix_{table}_name_prefix", table_name=table)
@@ -0,0 +1,69 @@
+"""add_bit_to_permissions
+
+Revision ID: d9a4b6e13c80
+Revises: c5d8e1f04a27
+Create Date: 2026-10-18 13:40:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "d9a4b6e13c80"
+down_revision: Union[str, Sequence[str], None] = "c5d8e1f04a27"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# app.core.rbac.PERMISSION_BITS holatidagi tartib (migratsiya yozilgan paytdagi)
+_INITIAL_ORDER = [
+    f"{resource}:{action}"
+    for resource in (
+        "faculty",
+        "department",
+        "user",
+        "group",
+        "role",
+        "subject",
+        "eduplan",
+        "stream",
+        "workload",
+        "speciality",
+    )
+    for action in ("read", "create", "update", "delete")
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("permissions", sa.Column("bit", sa.Integer(), nullable=True))
+    op.create_unique_constraint("uq_permissions_bit", "permissions", ["bit"])
+
+    # Ma'lum ruxsatnomalar boshlang'ich tartibdagi bitlarni oladi,
+    # qolganlari (admin qo'shganlari) ulardan keyin id tartibida
+    conn = op.get_bind()
+    slugs = [
+        row.slug
+        for row in conn.execute(sa.text("SELECT slug FROM permissions ORDER BY id"))
+    ]
+    known = [slug for slug in _INITIAL_ORDER if slug in slugs]
+    others = [slug for slug in slugs if slug not in _INITIAL_ORDER]
+    assignments = {slug: _INITIAL_ORDER.index(slug) for slug in known}
+    next_bit = len(_INITIAL_ORDER)
+    for slug in others:
+        assignments[slug] = next_bit
+        next_bit += 1
+    for slug, bit in assignments.items():
+        conn.execute(
+            sa.text("UPDATE permissions SET bit = :bit WHERE slug = :slug"),
+            {"bit": bit, "slug": slug},
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint("uq_permissions_bit", "permissions", type_="unique")
+    op.drop_column("permissions", "bit")
@@ -0,0 +1,120 @@
+"""add_search_key_columns
+
+Revision ID: e4b8f1a6c320
+Revises: d7a2c5e8b941
+Create Date: 2026-10-18 21:20:00.000000
+
+"""
+
+import re
+import unicodedata
+from typing import Optional, Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e4b8f1a6c320"
+down_revision: Union[str, Sequence[str], None] = "d7a2c5e8b941"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_TABLES = [
+    "faculties",
+    "departments",
+    "specialities",
+    "groups",
+    "subjects",
+    "streams",
+    "users",
+]
+# /search avtoto'ldirishida qatnashadigan jadvallar (streams'dan tashqari)
+_PREFIX_TABLES = [table for table in _TABLES if table != "streams"]
+_BATCH_SIZE = 1000
+
+# app.db.search.normalize_search_key'ning shu reviziyadagi muzlatilgan nusxasi:
+# ilovadagi funksiya keyinchalik o'zgarsa ham, migratsiya natijasi o'zgarmaydi.
+_CYRILLIC = {
+    "а": "a", "б": "b", "в": "v", "г": "g", "д": "d", "е": "e", "ё": "yo", "ж": "j",
+    "з": "z", "и": "i", "й": "y", "к": "k", "л": "l", "м": "m", "н": "n",
+    "о": "o", "п": "p", "р": "r", "с": "s", "т": "t", "у": "u", "ф": "f",
+    "х": "x", "ц": "ts", "ч": "ch", "ш": "sh", "щ": "sh", "ъ": "", "ь": "",
+    "ы": "i", "э": "e", "ю": "yu", "я": "ya", "ў": "o", "қ": "q", "ғ": "g",
+    "ҳ": "h",
+}
+_YE = re.compile(r"(?:(?<=[аеёиоуўэюяъь])|(?<!\w))е")
+_APOSTROPHES = "'`´‘’ʻʼ"
+_TRANSLATE = str.maketrans({**_CYRILLIC, **{mark: "" for mark in _APOSTROPHES}})
+
+
+def _normalize_search_key(value: Optional[str]) -> str:
+    if not value:
+        return ""
+    text = unicodedata.normalize("NFC", value).lower()
+    text = _YE.sub("ye", text).translate(_TRANSLATE)
+    return " ".join(text.split())
+
+
+def _backfill(table: str) -> None:
+    bind = op.get_bind()
+    rows = bind.execute(sa.text(f"SELECT id, name FROM {table}")).all()
+    update = sa.text(f"UPDATE {table} SET search_key = :key WHERE id = :id")
+    for start in range(0, len(rows), _BATCH_SIZE):
+        bind.execute(
+            update,
+            [
+                {"id": row.id, "key": _normalize_search_key(row.name)}
+                for row in rows[start : start + _BATCH_SIZE]
+            ],
+        )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table in _TABLES:
+        op.add_column(
+            table,
+            sa.Column("search_key", sa.String(), server_default="", nullable=False),
+        )
+        _backfill(table)
+        op.drop_index(f"ix_{table}_name_trgm", table_name=table)
+        op.create_index(
+            f"ix_{table}_search_key_trgm",
+            table,
+            ["search_key"],
+            unique=False,
+            postgresql_using="gin",
+            postgresql_ops={"search_key": "gin_trgm_ops"},
+        )
+    for table in _PREFIX_TABLES:
+        op.drop_index(f"ix_{table}_name_prefix", table_name=table)
+        op.create_index(
+            f"ix_{table}_search_key_prefix",
+            table,
+            [sa.text('search_key COLLATE "C"')],
+            unique=False,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in reversed(_PREFIX_TABLES):
+        op.drop_index(f"ix_{table}_search_key_prefix", table_name=table)
+        op.create_index(
+            f"ix_{table}_name_prefix",
+            table,
+            [sa.text("lower(name) text_pattern_ops")],
+            unique=False,
+        )
+    for table in reversed(_TABLES):
+        op.drop_index(f"ix_{table}_search_key_trgm", table_name=table)
+        op.create_index(
+            f"ix_{table}_name_trgm",
+            table,
+            ["name"],
+            unique=False,
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+        )
+        op.drop_column(table, "search_key")
@@ -0,0 +1,50 @@
+"""add_user_directory_indexes
+
+Revision ID: f2c6a9d4e173
+Revises: e4b8f1a6c320
+Create Date: 2026-10-18 22:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "f2c6a9d4e173"
+down_revision: Union[str, Sequence[str], None] = "e4b8f1a6c320"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index("ix_users_search_key_id", "users", ["search_key", "id"], unique=False)
+    op.create_index(
+        "ix_users_email_prefix",
+        "users",
+        [sa.text("lower(email) text_pattern_ops")],
+        unique=False,
+    )
+    op.create_index("ix_users_phone_number", "users", ["phone_number"], unique=False)
+    op.create_index(
+        "ix_users_auth_roles",
+        "users",
+        ["auth_roles"],
+        unique=False,
+        postgresql_using="gin",
+    )
+    op.create_index(
+        "ix_users_department_id_id", "users", ["department_id", "id"], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_users_department_id_id", table_name="users")
+    op.drop_index("ix_users_auth_roles", table_name="users")
+    op.drop_index("ix_users_phone_number", table_name="users")
+    op.drop_index("ix_users_email_prefix", table_name="users")
+    op.drop_index("ix_users_search_key_id", table_name="users")
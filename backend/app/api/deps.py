@@ -1,38 +1,122 @@
 from typing import Generator, Optional
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Query, status
 from fastapi.security import OAuth2PasswordBearer
-from jose import jwt, JWTError
+from jose import jwt, JWTError, ExpiredSignatureError
 from pydantic import ValidationError
+from sqlalchemy import select, bindparam
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core import security
 from app.core.config import settings
 from app.core.jwt import ALGORITHM
+from app.core.principal import Principal, load_principal
+from app.core.permission_registry import decode_mask, permission_registry
+from app.core.revocation import is_token_current, revocation_list
 from app.models.user import User
+from app.schemas.common import IdList
 from app.schemas.token import TokenPayload
-from app.db.session import get_db
+from app.db.session import db_route_class, get_db, get_read_db
+from app.db.statements import cached_statement
 
 reusable_oauth2 = OAuth2PasswordBearer(
     tokenUrl=f"/rest{settings.API_V1_STR}/auth/access-token"
 )
 
 
-async def get_current_user(
-    db: AsyncSession = Depends(get_db), token: str = Depends(reusable_oauth2)
-) -> User:
+@cached_statement
+def _user_by_id():
+    return select(User).where(User.id == bindparam("id"))
+
+
+def _decode_token(token: str) -> dict:
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[ALGORITHM])
         token_data = TokenPayload(**payload)
-    except (JWTError, ValidationError) as e:
+        payload["sub"] = int(token_data.sub)
+        return payload
+    except ExpiredSignatureError:
+        # 401: mijoz refresh token bilan yangi access token oladi
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token has expired",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    except (JWTError, ValidationError, TypeError, ValueError) as e:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Could not validate credentials",
+        )
+
+
+async def get_token_payload(
+    db: AsyncSession = Depends(get_db), token: str = Depends(reusable_oauth2)
+) -> dict:
+    """
+    Tokenni tekshiradi va claim'larini qaytaradi. Bekor qilingan (logout)
+    tokenlar revocation_list orqali rad etiladi - odatda bazaga murojaatsiz.
+    """
+    payload = _decode_token(token)
+    jti = payload.get("jti")
+    if jti and await revocation_list.is_revoked(db, jti):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token has been revoked",
+        )
+    return payload
+
+
+async def _principal_from_claims(db: AsyncSession, payload: dict) -> Principal:
+    """
+    Stateless rejim: ruxsatnomalar imzolangan claim'lardan olinadi, bazadan
+    faqat token versiyasi tekshiriladi (u ham odatda keshdan).
+    """
+    try:
+        version = int(payload["tv"])
+        permission_mask = decode_mask(payload["pm"])
+    except (TypeError, ValueError):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Could not validate credentials",
         )
+    if not await is_token_current(db, payload["sub"], version):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token has been revoked",
+        )
+    return Principal(
+        id=payload["sub"],
+        is_active=True,  # is_token_current faol bo'lmagan foydalanuvchini rad etadi
+        is_superuser=bool(payload.get("su")),
+        roles=frozenset(payload.get("roles") or ()),
+        permission_mask=permission_mask,
+    )
+
+
+async def get_current_principal(
+    db: AsyncSession = Depends(get_db), payload: dict = Depends(get_token_payload)
+) -> Principal:
+    """
+    Token egasini Principal sifatida qaytaradi. Kesh (principal_cache) to'g'ri
+    kelsa bazaga umuman murojaat qilinmaydi; sessiya ulanishni faqat
+    birinchi so'rovda oladi. AUTH_STATELESS yoqilgan bo'lsa, Principal
+    token claim'laridan quriladi.
+    """
+    # PermissionChecker bit pozitsiyalarini reyestrdan oladi (odatda allaqachon yuklangan)
+    await permission_registry.ensure_loaded(db)
+    if settings.AUTH_STATELESS and "pm" in payload and "tv" in payload:
+        return await _principal_from_claims(db, payload)
+
+    principal = await load_principal(db, payload["sub"])
+    if principal is None:
+        raise HTTPException(status_code=404, detail="User not found")
+    return principal
 
-    # Async query to get user
-    from sqlalchemy import select
 
-    result = await db.execute(select(User).where(User.id == int(token_data.sub)))
+async def get_current_user(
+    db: AsyncSession = Depends(get_db), payload: dict = Depends(get_token_payload)
+) -> User:
+    """To'liq User obyekti (rollari bilan) kerak bo'lgan joylar uchun."""
+    result = await db.execute(_user_by_id(), {"id": payload["sub"]})
     user = result.scalars().first()
 
     if not user:
@@ -41,16 +125,16 @@ async def get_current_user(
 
 
 async def get_current_active_user(
-    current_user: User = Depends(get_current_user),
-) -> User:
+    current_user: Principal = Depends(get_current_principal),
+) -> Principal:
     if not current_user.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
     return current_user
 
 
 async def get_current_active_superuser(
-    current_user: User = Depends(get_current_active_user),
-) -> User:
+    current_user: Principal = Depends(get_current_active_user),
+) -> Principal:
     if not current_user.is_superuser:
         raise HTTPException(
             status_code=400, detail="The user doesn't have enough privileges"
@@ -58,21 +142,45 @@ async def get_current_active_superuser(
     return current_user
 
 
-from app.core.rbac import get_role_permissions, Permissions
+from app.core.rbac import Permissions
 
 
 class PermissionChecker:
+    """
+    Ruxsatnoma tekshiruvi: foydalanuvchi maskasi va talab qilingan ruxsatnoma
+    biti o'rtasida bitta AND. Talab maskasi reyestr versiyasi o'zgarguncha eslab qolinadi.
+    """
+
     def __init__(self, required_permission: str):
         self.required_permission = required_permission
-
-    def __call__(self, user: User = Depends(get_current_active_user)) -> User:
-        if user.is_superuser:
-            return user
-
-        user_permissions = get_role_permissions([r.name for r in user.roles])
-        if self.required_permission not in user_permissions:
+        self._mask = 0
+        self._version = -1
+
+    def _required_mask(self) -> int:
+        if self._version != permission_registry.version:
+            self._mask = permission_registry.mask_for(self.required_permission)
+            self._version = permission_registry.version
+        return self._mask
+
+    def __call__(
+        self, user: Principal = Depends(get_current_active_user)
+    ) -> Principal:
+        if not (user.is_superuser or user.permission_mask & self._required_mask()):
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail=f"Operation not permitted. Required: {self.required_permission}",
             )
         return user
+
+
+def get_id_list(
+    ids: str = Query(..., description="Vergul bilan ajratilgan ID'lar, masalan 1,2,3"),
+) -> IdList:
+    """?ids=1,2,3 parametrini IdList'ga aylantiradi (POST tanasi bilan bir xil)."""
+    try:
+        return IdList(ids=[int(part) for part in ids.split(",") if part.strip()])
+    except (ValueError, ValidationError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"ids must be 1-{settings.BULK_FETCH_MAX_IDS} comma-separated integers",
+        )
@@ -0,0 +1,62 @@
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple, Type
+
+from fastapi import HTTPException, status
+from fastapi.encoders import jsonable_encoder
+from pydantic import BaseModel
+
+# Kengaytma (expand) nomi -> (obyekt atributi, sxema, ichki ixtiyoriy maydonlar).
+# Ichki maydon (masalan stream.groups) faqat "nom.maydon" so'ralganda qo'shiladi.
+Expansions = Dict[str, Tuple[str, Type[BaseModel], Set[str]]]
+
+
+def parse_fieldset(
+    value: Optional[str], allowed: Iterable[str], param: str
+) -> Optional[List[str]]:
+    """
+    "a,b,c" ko'rinishidagi parametrni ro'yxatga aylantiradi.
+    Parametr berilmasa None (to'liq javob), noma'lum nom bo'lsa 400.
+    """
+    if value is None:
+        return None
+    names = list(dict.fromkeys(name.strip() for name in value.split(",") if name.strip()))
+    allowed = list(allowed)
+    unknown = [name for name in names if name not in allowed]
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown {param}: {', '.join(unknown)}. Allowed: {', '.join(allowed)}",
+        )
+    return names
+
+
+def expansion_names(expansions: Expansions) -> List[str]:
+    names = []
+    for name, (_, _, nested) in expansions.items():
+        names.append(name)
+        names.extend(f"{name}.{field}" for field in sorted(nested))
+    return names
+
+
+def dump_sparse(
+    obj: Any, fields: Sequence[str], expansions: Expansions, expand: Sequence[str]
+) -> Dict[str, Any]:
+    """
+    Obyektdan faqat so'ralgan maydonlar va kengaytmalarni JSON'ga tayyorlaydi.
+    Kengaytmalar o'z sxemasi orqali, so'ralmagan ichki maydonlarsiz chiqariladi.
+    """
+    data = {field: getattr(obj, field) for field in fields}
+    for name, (attr, schema, nested) in expansions.items():
+        wanted = {field for field in nested if f"{name}.{field}" in expand}
+        if name not in expand and not wanted:
+            continue
+        exclude = nested - wanted
+        value = getattr(obj, attr)
+        if isinstance(value, list):
+            data[name] = [
+                schema.model_validate(item).model_dump(exclude=exclude) for item in value
+            ]
+        elif value is not None:
+            data[name] = schema.model_validate(value).model_dump(exclude=exclude)
+        else:
+            data[name] = None
+    return jsonable_encoder(data)
@@ -12,6 +12,8 @@ from app.api.v1.endpoints import (
     streams,
     workloads,
     edu_plans,
+    monitoring,
+    search,
 )
 
 api_router = APIRouter()
@@ -31,3 +33,7 @@ api_router.include_router(subjects.router, prefix="/subjects", tags=["subjects"]
 api_router.include_router(streams.router, prefix="/streams", tags=["streams"])
 api_router.include_router(workloads.router, prefix="/workloads", tags=["workloads"])
 api_router.include_router(edu_plans.router, prefix="/edu-plans", tags=["edu-plans"])
+api_router.include_router(search.router, prefix="/search", tags=["search"])
+api_router.include_router(
+    monitoring.router, prefix="/monitoring", tags=["monitoring"]
+)
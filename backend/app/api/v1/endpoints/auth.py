@@ -1,4 +1,4 @@
-from typing import Any
+from typing import Any, Optional
 from fastapi import APIRouter, Depends
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -6,7 +6,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.api import deps
 from app.db.session import get_db
 from app.schemas.user import User as UserSchema, UserRegister
-from app.schemas.token import Token
+from app.schemas.token import LogoutRequest, RefreshTokenRequest, Token
 from app.services.auth_service import auth_service
 from app.services.user_service import user_service
 from app.models.user import User
@@ -28,6 +28,30 @@ async def login_access_token(
     return await auth_service.authenticate(db, form_data)
 
 
+@router.post("/refresh", response_model=Token)
+async def refresh_access_token(
+    body: RefreshTokenRequest, db: AsyncSession = Depends(get_db)
+) -> Any:
+    """
+    Refresh token orqali yangi access token (va yangi refresh token) olish.
+    Parol qayta tekshirilmaydi.
+    """
+    return await auth_service.refresh(db, body.refresh_token)
+
+
+@router.post("/logout", status_code=204)
+async def logout(
+    body: Optional[LogoutRequest] = None,
+    db: AsyncSession = Depends(get_db),
+    payload: dict = Depends(deps.get_token_payload),
+) -> None:
+    """
+    Tizimdan chiqish: joriy access token darhol bekor qilinadi,
+    refresh token berilgan bo'lsa, uning sessiyasi ham yopiladi.
+    """
+    await auth_service.logout(db, payload, body.refresh_token if body else None)
+
+
 @router.post("/register", response_model=UserSchema)
 async def register(
     *,
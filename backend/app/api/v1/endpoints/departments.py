@@ -1,9 +1,11 @@
-from typing import Any, List
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Any, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api import deps
+from app.db.pagination import NEXT_CURSOR_HEADER
 from app.core.rbac import Permissions
+from app.schemas.common import IdList
 from app.schemas.department import Department, DepartmentCreate, DepartmentUpdate
 from app.services.department_service import department_service
 
@@ -12,15 +14,24 @@ router = APIRouter()
 
 @router.get("/", response_model=List[Department])
 async def read_departments(
-    db: AsyncSession = Depends(deps.get_db),
+    response: Response,
+    db: AsyncSession = Depends(deps.get_read_db),
     skip: int = 0,
     limit: int = 100,
-    current_user=Depends(deps.get_current_user),
+    cursor: Optional[str] = Query(
+        None, description="Keyingi sahifa uchun oldingi javobdagi X-Next-Cursor"
+    ),
+    sort: str = Query("id", description="id, -id, name, -name"),
+    current_user=Depends(deps.get_current_principal),
 ) -> Any:
     """
     Kafedralar ro'yxatini olish.
     """
-    departments = await department_service.get_multi(db, skip=skip, limit=limit)
+    departments, next_cursor = await department_service.get_multi(
+        db, skip=skip, limit=limit, cursor=cursor, sort=sort
+    )
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
     return departments
 
 
@@ -38,12 +49,39 @@ async def create_department(
     return department
 
 
+@router.get("/by-ids", response_model=List[Department])
+async def read_departments_by_ids(
+    *,
+    db: AsyncSession = Depends(deps.get_read_db),
+    id_list: IdList = Depends(deps.get_id_list),
+    current_user=Depends(deps.get_current_principal),
+) -> Any:
+    """
+    Kafedralarni ID'lar bo'yicha olish (?ids=1,2,3): bitta so'rov, so'ralgan tartibda.
+    Topilmagan ID'lar javobga kirmaydi.
+    """
+    return await department_service.get_many(db, id_list.ids)
+
+
+@router.post("/by-ids", response_model=List[Department])
+async def read_departments_by_ids_post(
+    *,
+    db: AsyncSession = Depends(deps.get_read_db),
+    id_list: IdList,
+    current_user=Depends(deps.get_current_principal),
+) -> Any:
+    """
+    GET /by-ids bilan bir xil; ID'lar ko'p bo'lsa (URL uzunligi) tanada yuboriladi.
+    """
+    return await department_service.get_many(db, id_list.ids)
+
+
 @router.get("/{id}", response_model=Department)
 async def read_department(
     *,
-    db: AsyncSession = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_read_db),
     id: int,
-    current_user=Depends(deps.get_current_user),
+    current_user=Depends(deps.get_current_principal),
 ) -> Any:
     """
     Get department by ID.
@@ -1,26 +1,53 @@
-from typing import Any, List
-from fastapi import APIRouter, Depends, HTTPException, Query
+from typing import Any, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.api import deps
+from app.db.pagination import (
+    NEXT_CURSOR_HEADER,
+    TOTAL_COUNT_HEADER,
+    CountStrategy,
+    count_strategy,
+)
 from app.core.rbac import Permissions
 from app.schemas.edu_plan import EduPlan, EduPlanCreate, EduPlanUpdate
 from app.services.edu_plan_service import edu_plan_service
-from app.models.user import User
+from app.core.principal import Principal
 
 router = APIRouter()
 
 
 @router.get("/", response_model=List[EduPlan])
 async def read_edu_plans(
-    db: AsyncSession = Depends(deps.get_db),
+    response: Response,
+    db: AsyncSession = Depends(deps.get_read_db),
     skip: int = 0,
     limit: int = 100,
-    current_user: User = Depends(deps.PermissionChecker(Permissions.EDUPLAN_READ)),
+    cursor: Optional[str] = Query(
+        None, description="Keyingi sahifa uchun oldingi javobdagi X-Next-Cursor"
+    ),
+    sort: str = Query("id", description="id, -id, name, -name"),
+    include_total: bool = True,
+    count: Optional[CountStrategy] = Query(
+        None, description="Jami hisoblash usuli: exact, window, cached, estimate, none"
+    ),
+    current_user: Principal = Depends(deps.PermissionChecker(Permissions.EDUPLAN_READ)),
 ) -> Any:
     """
     O'quv rejalari ro'yxatini olish.
     """
-    return await edu_plan_service.get_multi(db, skip=skip, limit=limit)
+    edu_plans, total, next_cursor = await edu_plan_service.get_multi(
+        db,
+        skip=skip,
+        limit=limit,
+        cursor=cursor,
+        sort=sort,
+        count=count_strategy(count, include_total),
+    )
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    if total is not None:
+        response.headers[TOTAL_COUNT_HEADER] = str(total)
+    return edu_plans
 
 
 @router.post("/", response_model=EduPlan)
@@ -28,7 +55,7 @@ async def create_edu_plan(
     *,
     db: AsyncSession = Depends(deps.get_db),
     edu_plan_in: EduPlanCreate,
-    current_user: User = Depends(deps.PermissionChecker(Permissions.EDUPLAN_CREATE)),
+    current_user: Principal = Depends(deps.PermissionChecker(Permissions.EDUPLAN_CREATE)),
 ) -> Any:
     """
     Yangi o'quv rejasi yaratish.
@@ -42,7 +69,7 @@ async def update_edu_plan(
     db: AsyncSession = Depends(deps.get_db),
     id: int,
     edu_plan_in: EduPlanUpdate,
-    current_user: User = Depends(deps.PermissionChecker(Permissions.EDUPLAN_UPDATE)),
+    current_user: Principal = Depends(deps.PermissionChecker(Permissions.EDUPLAN_UPDATE)),
 ) -> Any:
     """
     O'quv rejasini yangilash.
@@ -58,7 +85,7 @@ async def delete_edu_plan(
     *,
     db: AsyncSession = Depends(deps.get_db),
     id: int,
-    current_user: User = Depends(deps.PermissionChecker(Permissions.EDUPLAN_DELETE)),
+    current_user: Principal = Depends(deps.PermissionChecker(Permissions.EDUPLAN_DELETE)),
 ) -> Any:
     """
     O'quv rejasini o'chirish.
@@ -1,10 +1,12 @@
-from typing import Any, List
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Any, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api import deps
+from app.db.pagination import NEXT_CURSOR_HEADER
 from app.core.rbac import Permissions
 from app.api.deps import PermissionChecker
+from app.schemas.common import IdList
 from app.schemas.faculty import Faculty, FacultyCreate, FacultyUpdate
 from app.services.faculty_service import faculty_service
 
@@ -13,15 +15,24 @@ router = APIRouter()
 
 @router.get("/", response_model=List[Faculty])
 async def read_faculties(
-    db: AsyncSession = Depends(deps.get_db),
+    response: Response,
+    db: AsyncSession = Depends(deps.get_read_db),
     skip: int = 0,
     limit: int = 100,
-    current_user=Depends(deps.get_current_user),
+    cursor: Optional[str] = Query(
+        None, description="Keyingi sahifa uchun oldingi javobdagi X-Next-Cursor"
+    ),
+    sort: str = Query("id", description="id, -id, name, -name"),
+    current_user=Depends(deps.get_current_principal),
 ) -> Any:
     """
     Fakultetlar ro'yxatini olish.
     """
-    faculties = await faculty_service.get_multi(db, skip=skip, limit=limit)
+    faculties, next_cursor = await faculty_service.get_multi(
+        db, skip=skip, limit=limit, cursor=cursor, sort=sort
+    )
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
     return faculties
 
 
@@ -41,12 +52,39 @@ async def create_faculty(
     return faculty
 
 
+@router.get("/by-ids", response_model=List[Faculty])
+async def read_faculties_by_ids(
+    *,
+    db: AsyncSession = Depends(deps.get_read_db),
+    id_list: IdList = Depends(deps.get_id_list),
+    current_user=Depends(deps.get_current_principal),
+) -> Any:
+    """
+    Fakultetlarni ID'lar bo'yicha olish (?ids=1,2,3): bitta so'rov, so'ralgan tartibda.
+    Topilmagan ID'lar javobga kirmaydi.
+    """
+    return await faculty_service.get_many(db, id_list.ids)
+
+
+@router.post("/by-ids", response_model=List[Faculty])
+async def read_faculties_by_ids_post(
+    *,
+    db: AsyncSession = Depends(deps.get_read_db),
+    id_list: IdList,
+    current_user=Depends(deps.get_current_principal),
+) -> Any:
+    """
+    GET /by-ids bilan bir xil; ID'lar ko'p bo'lsa (URL uzunligi) tanada yuboriladi.
+    """
+    return await faculty_service.get_many(db, id_list.ids)
+
+
 @router.get("/{id}", response_model=Faculty)
 async def read_faculty(
     *,
-    db: AsyncSession = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_read_db),
     id: int,
-    current_user=Depends(deps.get_current_user),
+    current_user=Depends(deps.get_current_principal),
 ) -> Any:
     """
     Get faculty by ID.
@@ -1,31 +1,59 @@
-from typing import Any
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Any, Optional, List
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.rbac import Permissions
 from app.api import deps
+from app.db.pagination import CountStrategy, count_strategy
+from app.db.search import SearchMode
+from app.schemas.common import IdList
 from app.schemas.group import Group, GroupCreate, GroupUpdate, GroupList
 from app.services.group_service import group_service
-from app.models.user import User
+from app.core.principal import Principal
 
 router = APIRouter()
 
 
 @router.get("/", response_model=GroupList)
 async def read_groups(
-    db: AsyncSession = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_read_db),
     page: int = 1,
     size: int = 20,
     search: str | None = None,
-    current_user: User = Depends(deps.PermissionChecker(Permissions.GROUP_READ)),
+    search_mode: SearchMode = Query(
+        SearchMode.contains,
+        description="contains - nom ichida; ranked - o'xshashlik bo'yicha (imlo xatolariga chidamli)",
+    ),
+    cursor: Optional[str] = Query(
+        None, description="Keyingi sahifa uchun oldingi javobdagi next_cursor"
+    ),
+    sort: str = Query("id", description="id, -id, name, -name"),
+    include_total: bool = True,
+    count: Optional[CountStrategy] = Query(
+        None, description="Jami hisoblash usuli: exact, window, cached, estimate, none"
+    ),
+    current_user: Principal = Depends(deps.PermissionChecker(Permissions.GROUP_READ)),
 ) -> Any:
     """
     Guruhlar ro'yxatini olish.
     """
     skip = (page - 1) * size
-    items, total = await group_service.get_multi(
-        db, skip=skip, limit=size, search=search
+    items, total, next_cursor = await group_service.get_multi(
+        db,
+        skip=skip,
+        limit=size,
+        search=search,
+        search_mode=search_mode,
+        cursor=cursor,
+        sort=sort,
+        count=count_strategy(count, include_total),
     )
-    return {"items": items, "total": total, "page": page, "size": size}
+    return {
+        "items": items,
+        "total": total,
+        "page": page,
+        "size": size,
+        "next_cursor": next_cursor,
+    }
 
 
 @router.post("/", response_model=Group)
@@ -33,7 +61,7 @@ async def create_group(
     *,
     db: AsyncSession = Depends(deps.get_db),
     group_in: GroupCreate,
-    current_user: User = Depends(deps.PermissionChecker(Permissions.GROUP_CREATE)),
+    current_user: Principal = Depends(deps.PermissionChecker(Permissions.GROUP_CREATE)),
 ) -> Any:
     """
     Yangi guruh yaratish.
@@ -47,7 +75,7 @@ async def update_group(
     db: AsyncSession = Depends(deps.get_db),
     id: int,
     group_in: GroupUpdate,
-    current_user: User = Depends(deps.PermissionChecker(Permissions.GROUP_UPDATE)),
+    current_user: Principal = Depends(deps.PermissionChecker(Permissions.GROUP_UPDATE)),
 ) -> Any:
     group = await group_service.get(db, id=id)
     if not group:
@@ -55,12 +83,39 @@ async def update_group(
     return await group_service.update(db, db_obj=group, obj_in=group_in)
 
 
+@router.get("/by-ids", response_model=List[Group])
+async def read_groups_by_ids(
+    *,
+    db: AsyncSession = Depends(deps.get_read_db),
+    id_list: IdList = Depends(deps.get_id_list),
+    current_user: Principal = Depends(deps.PermissionChecker(Permissions.GROUP_READ)),
+) -> Any:
+    """
+    Guruhlarni ID'lar bo'yicha olish (?ids=1,2,3): bitta so'rov, so'ralgan tartibda.
+    Topilmagan ID'lar javobga kirmaydi.
+    """
+    return await group_service.get_many(db, id_list.ids)
+
+
+@router.post("/by-ids", response_model=List[Group])
+async def read_groups_by_ids_post(
+    *,
+    db: AsyncSession = Depends(deps.get_read_db),
+    id_list: IdList,
+    current_user: Principal = Depends(deps.PermissionChecker(Permissions.GROUP_READ)),
+) -> Any:
+    """
+    GET /by-ids bilan bir xil; ID'lar ko'p bo'lsa (URL uzunligi) tanada yuboriladi.
+    """
+    return await group_service.get_many(db, id_list.ids)
+
+
 @router.get("/{id}", response_model=Group)
 async def read_group(
     *,
-    db: AsyncSession = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_read_db),
     id: int,
-    current_user: User = Depends(deps.PermissionChecker(Permissions.GROUP_READ)),
+    current_user: Principal = Depends(deps.PermissionChecker(Permissions.GROUP_READ)),
 ) -> Any:
     group = await group_service.get(db, id=id)
     if not group:
@@ -73,6 +128,6 @@ async def delete_group(
     *,
     db: AsyncSession = Depends(deps.get_db),
     id: int,
-    current_user: User = Depends(deps.PermissionChecker(Permissions.GROUP_DELETE)),
+    current_user: Principal = Depends(deps.PermissionChecker(Permissions.GROUP_DELETE)),
 ) -> Any:
     return await group_service.delete(db, id=id)
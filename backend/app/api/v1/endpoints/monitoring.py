@@ -0,0 +1,57 @@
+from typing import Any
+from fastapi import APIRouter, Depends
+
+from app.api import deps
+from app.core import security
+from app.db.session import get_pool_stats
+from app.db.query_log import query_stats
+from app.core.principal import Principal
+from app.core.revocation import revocation_list
+
+router = APIRouter()
+
+
+@router.get("/pool", response_model=dict)
+async def read_pool_stats(
+    current_user: Principal = Depends(deps.get_current_active_superuser),
+) -> Any:
+    """
+    Ulanishlar hovuzi statistikasi (checked out, overflow, kutish vaqti, timeout).
+    """
+    return get_pool_stats()
+
+
+@router.get("/queries", response_model=dict)
+async def read_query_stats(
+    limit: int = 100,
+    reset: bool = False,
+    current_user: Principal = Depends(deps.get_current_active_superuser),
+) -> Any:
+    """
+    SQL so'rovlar statistikasi (marshrut va fingerprint bo'yicha):
+    soni, umumiy va maksimal vaqt. reset=true bo'lsa, o'qilgandan keyin tozalanadi.
+    """
+    stats = query_stats.snapshot(limit=limit)
+    if reset:
+        query_stats.reset()
+    return stats
+
+
+@router.get("/hashing", response_model=dict)
+async def read_hashing_stats(
+    current_user: Principal = Depends(deps.get_current_active_superuser),
+) -> Any:
+    """
+    Parol xeshlash hovuzi holati (oqimlar soni, navbatdagi amallar, navbat chegarasi).
+    """
+    return security.hashing_stats()
+
+
+@router.get("/revocations", response_model=dict)
+async def read_revocation_stats(
+    current_user: Principal = Depends(deps.get_current_active_superuser),
+) -> Any:
+    """
+    Bekor qilingan tokenlar Bloom filtri holati (elementlar soni, hajmi, kursor).
+    """
+    return revocation_list.stats()
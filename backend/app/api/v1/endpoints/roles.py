@@ -13,7 +13,7 @@ router = APIRouter()
 
 @router.get("/", response_model=List[Role])
 async def read_roles(
-    db: AsyncSession = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_read_db),
     skip: int = 0,
     limit: int = 100,
     current_user=Depends(deps.PermissionChecker(Permissions.ROLE_READ)),
@@ -69,7 +69,7 @@ async def delete_role(
 
 @router.get("/permissions", response_model=List[Permission])
 async def read_permissions(
-    db: AsyncSession = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_read_db),
     current_user=Depends(deps.get_current_active_user),
 ) -> Any:
     """
@@ -0,0 +1,64 @@
+from typing import Any, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api import deps
+from app.api.fieldsets import parse_fieldset
+from app.core.config import settings
+from app.core.principal import Principal
+from app.db.search import normalize_search_key
+from app.schemas.search import SearchResults
+from app.services.search_service import SEARCH_TYPES, search_service
+
+router = APIRouter()
+
+
+@router.get("/", response_model=SearchResults)
+async def search(
+    db: AsyncSession = Depends(deps.get_read_db),
+    q: str = Query(..., min_length=1, max_length=100, description="Qidiruv matni"),
+    types: Optional[str] = Query(
+        None, description=f"Vergul bilan ajratilgan turlar: {', '.join(SEARCH_TYPES)}"
+    ),
+    limit: int = Query(
+        settings.SEARCH_DEFAULT_PER_TYPE,
+        ge=1,
+        le=settings.SEARCH_MAX_PER_TYPE,
+        description="Har bir tur uchun natijalar soni",
+    ),
+    prefix: bool = Query(
+        True, description="true - nom boshidan (avtoto'ldirish), false - nom ichidan"
+    ),
+    current_user: Principal = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Fakultet, kafedra, yo'nalish, guruh, fan va foydalanuvchilar bo'yicha
+    bitta so'rovda qidirish. types berilmasa, foydalanuvchi o'qiy oladigan
+    barcha turlar qidiriladi; ruxsati yo'q tur so'ralsa 403.
+    """
+    requested = parse_fieldset(types, SEARCH_TYPES, "types")
+    if requested is None:
+        allowed = [
+            type_
+            for type_, (_, permission) in SEARCH_TYPES.items()
+            if current_user.has_permission(permission)
+        ]
+    else:
+        for type_ in requested:
+            permission = SEARCH_TYPES[type_][1]
+            if not current_user.has_permission(permission):
+                raise HTTPException(
+                    status_code=status.HTTP_403_FORBIDDEN,
+                    detail=f"Operation not permitted. Required: {permission}",
+                )
+        allowed = requested
+
+    query = q.strip()
+    # "'" yoki "-" kabi matn bo'sh kalitga aylanadi: LIKE '%' hamma qatorni
+    # qaytarmasligi uchun qidiruv umuman bajarilmaydi
+    results = (
+        await search_service.search(db, query, allowed, limit=limit, prefix=prefix)
+        if normalize_search_key(query)
+        else {type_: [] for type_ in allowed}
+    )
+    return {"query": query, "results": results}
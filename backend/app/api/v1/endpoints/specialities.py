@@ -1,9 +1,12 @@
-from typing import Any, List
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Any, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.rbac import Permissions
 from app.api import deps
+from app.db.pagination import CountStrategy, count_strategy
+from app.db.search import SearchMode
+from app.schemas.common import IdList
 from app.schemas.speciality import (
     Speciality,
     SpecialityCreate,
@@ -11,20 +14,32 @@ from app.schemas.speciality import (
     SpecialityList,
 )
 from app.services.speciality_service import speciality_service
-from app.models.user import User
+from app.core.principal import Principal
 
 router = APIRouter()
 
 
 @router.get("/", response_model=SpecialityList)
 async def read_specialities(
-    db: AsyncSession = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_read_db),
     page: int = 1,
     size: int = 20,
     search: str | None = None,
+    search_mode: SearchMode = Query(
+        SearchMode.contains,
+        description="contains - nom ichida; ranked - o'xshashlik bo'yicha (imlo xatolariga chidamli)",
+    ),
     department_id: int | None = None,
     education_type: str | None = None,
-    current_user: User = Depends(deps.PermissionChecker(Permissions.SPECIALITY_READ)),
+    cursor: Optional[str] = Query(
+        None, description="Keyingi sahifa uchun oldingi javobdagi next_cursor"
+    ),
+    sort: str = Query("id", description="id, -id, name, -name"),
+    include_total: bool = True,
+    count: Optional[CountStrategy] = Query(
+        None, description="Jami hisoblash usuli: exact, window, cached, estimate, none"
+    ),
+    current_user: Principal = Depends(deps.PermissionChecker(Permissions.SPECIALITY_READ)),
 ) -> Any:
     """
     Yo'nalishlar ro'yxatini olish.
@@ -32,15 +47,25 @@ async def read_specialities(
     if page < 1:
         page = 1
     skip = (page - 1) * size
-    items, total = await speciality_service.get_multi(
+    items, total, next_cursor = await speciality_service.get_multi(
         db,
         skip=skip,
         limit=size,
         search=search,
+        search_mode=search_mode,
         department_id=department_id,
         education_type=education_type,
+        cursor=cursor,
+        sort=sort,
+        count=count_strategy(count, include_total),
     )
-    return {"items": items, "total": total, "page": page, "size": size}
+    return {
+        "items": items,
+        "total": total,
+        "page": page,
+        "size": size,
+        "next_cursor": next_cursor,
+    }
 
 
 @router.post("/", response_model=Speciality)
@@ -48,7 +73,7 @@ async def create_speciality(
     *,
     db: AsyncSession = Depends(deps.get_db),
     speciality_in: SpecialityCreate,
-    current_user: User = Depends(deps.PermissionChecker(Permissions.SPECIALITY_CREATE)),
+    current_user: Principal = Depends(deps.PermissionChecker(Permissions.SPECIALITY_CREATE)),
 ) -> Any:
     """
     Yangi yo'nalish yaratish.
@@ -62,7 +87,7 @@ async def update_speciality(
     db: AsyncSession = Depends(deps.get_db),
     id: int,
     speciality_in: SpecialityUpdate,
-    current_user: User = Depends(deps.PermissionChecker(Permissions.SPECIALITY_UPDATE)),
+    current_user: Principal = Depends(deps.PermissionChecker(Permissions.SPECIALITY_UPDATE)),
 ) -> Any:
     """
     Yo'nalish ma'lumotlarini yangilash.
@@ -73,12 +98,39 @@ async def update_speciality(
     return await speciality_service.update(db, db_obj=speciality, obj_in=speciality_in)
 
 
+@router.get("/by-ids", response_model=List[Speciality])
+async def read_specialities_by_ids(
+    *,
+    db: AsyncSession = Depends(deps.get_read_db),
+    id_list: IdList = Depends(deps.get_id_list),
+    current_user: Principal = Depends(deps.PermissionChecker(Permissions.SPECIALITY_READ)),
+) -> Any:
+    """
+    Yo'nalishlarni ID'lar bo'yicha olish (?ids=1,2,3): bitta so'rov, so'ralgan tartibda.
+    Topilmagan ID'lar javobga kirmaydi.
+    """
+    return await speciality_service.get_many(db, id_list.ids)
+
+
+@router.post("/by-ids", response_model=List[Speciality])
+async def read_specialities_by_ids_post(
+    *,
+    db: AsyncSession = Depends(deps.get_read_db),
+    id_list: IdList,
+    current_user: Principal = Depends(deps.PermissionChecker(Permissions.SPECIALITY_READ)),
+) -> Any:
+    """
+    GET /by-ids bilan bir xil; ID'lar ko'p bo'lsa (URL uzunligi) tanada yuboriladi.
+    """
+    return await speciality_service.get_many(db, id_list.ids)
+
+
 @router.get("/{id}", response_model=Speciality)
 async def read_speciality(
     *,
-    db: AsyncSession = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_read_db),
     id: int,
-    current_user: User = Depends(deps.PermissionChecker(Permissions.SPECIALITY_READ)),
+    current_user: Principal = Depends(deps.PermissionChecker(Permissions.SPECIALITY_READ)),
 ) -> Any:
     """
     Yo'nalishni ID orqali olish.
@@ -94,7 +146,7 @@ async def delete_speciality(
     *,
     db: AsyncSession = Depends(deps.get_db),
     id: int,
-    current_user: User = Depends(deps.PermissionChecker(Permissions.SPECIALITY_DELETE)),
+    current_user: Principal = Depends(deps.PermissionChecker(Permissions.SPECIALITY_DELETE)),
 ) -> Any:
     """
     Yo'nalishni o'chirish.
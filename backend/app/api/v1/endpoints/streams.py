@@ -1,31 +1,91 @@
-from typing import Any
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Any, Optional, List
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import JSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.api import deps
+from app.api.fieldsets import dump_sparse, expansion_names, parse_fieldset
+from app.db.pagination import CountStrategy, count_strategy
+from app.db.search import SearchMode
 from app.core.rbac import Permissions
+from app.schemas.common import IdList
+from app.schemas.group import Group
 from app.schemas.stream import Stream, StreamCreate, StreamUpdate, StreamList
-from app.services.stream_service import stream_service
-from app.models.user import User
+from app.services.stream_service import STREAM_FIELDS, stream_service
+from app.core.principal import Principal
 
 router = APIRouter()
 
+_EXPANSIONS = {"groups": ("groups", Group, set())}
+
 
 @router.get("/", response_model=StreamList)
 async def read_streams(
-    db: AsyncSession = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_read_db),
     page: int = 1,
     size: int = 20,
     search: str | None = None,
-    current_user: User = Depends(deps.PermissionChecker(Permissions.STREAM_READ)),
+    search_mode: SearchMode = Query(
+        SearchMode.contains,
+        description="contains - nom ichida; ranked - o'xshashlik bo'yicha (imlo xatolariga chidamli)",
+    ),
+    cursor: Optional[str] = Query(
+        None, description="Keyingi sahifa uchun oldingi javobdagi next_cursor"
+    ),
+    sort: str = Query("id", description="id, -id, name, -name"),
+    include_total: bool = True,
+    count: Optional[CountStrategy] = Query(
+        None, description="Jami hisoblash usuli: exact, window, cached, estimate, none"
+    ),
+    fields: Optional[str] = Query(
+        None, description="Vergul bilan ajratilgan maydonlar (id, name, academic_year)"
+    ),
+    expand: Optional[str] = Query(
+        None, description="Vergul bilan ajratilgan kengaytmalar (groups)"
+    ),
+    current_user: Principal = Depends(deps.PermissionChecker(Permissions.STREAM_READ)),
 ) -> Any:
     """
     Oqimlar ro'yxatini olish.
+    fields= yoki expand= berilsa, javobda faqat so'ralgan maydonlar bo'ladi
+    (masalan ?fields=id,name - guruhlar yuklanmaydi va qo'shimcha so'rov yo'q).
     """
+    field_list = parse_fieldset(fields, STREAM_FIELDS, "fields")
+    expand_list = parse_fieldset(expand, expansion_names(_EXPANSIONS), "expand")
     skip = (page - 1) * size
-    items, total = await stream_service.get_multi(
-        db, skip=skip, limit=size, search=search
+    items, total, next_cursor = await stream_service.get_multi(
+        db,
+        skip=skip,
+        limit=size,
+        search=search,
+        search_mode=search_mode,
+        cursor=cursor,
+        sort=sort,
+        count=count_strategy(count, include_total),
+        fields=field_list,
+        expand=expand_list,
     )
-    return {"items": items, "total": total, "page": page, "size": size}
+    if field_list is not None or expand_list is not None:
+        selected = STREAM_FIELDS if field_list is None else field_list
+        columns = ["id", *(field for field in selected if field != "id")]
+        return JSONResponse(
+            {
+                "items": [
+                    dump_sparse(item, columns, _EXPANSIONS, expand_list or [])
+                    for item in items
+                ],
+                "total": total,
+                "page": page,
+                "size": size,
+                "next_cursor": next_cursor,
+            }
+        )
+    return {
+        "items": items,
+        "total": total,
+        "page": page,
+        "size": size,
+        "next_cursor": next_cursor,
+    }
 
 
 @router.post("/", response_model=Stream)
@@ -33,7 +93,7 @@ async def create_stream(
     *,
     db: AsyncSession = Depends(deps.get_db),
     stream_in: StreamCreate,
-    current_user: User = Depends(deps.PermissionChecker(Permissions.STREAM_CREATE)),
+    current_user: Principal = Depends(deps.PermissionChecker(Permissions.STREAM_CREATE)),
 ) -> Any:
     """
     Yangi oqim yaratish.
@@ -47,7 +107,7 @@ async def update_stream(
     db: AsyncSession = Depends(deps.get_db),
     id: int,
     stream_in: StreamUpdate,
-    current_user: User = Depends(deps.PermissionChecker(Permissions.STREAM_UPDATE)),
+    current_user: Principal = Depends(deps.PermissionChecker(Permissions.STREAM_UPDATE)),
 ) -> Any:
     stream = await stream_service.get(db, id=id)
     if not stream:
@@ -55,12 +115,39 @@ async def update_stream(
     return await stream_service.update(db, db_obj=stream, obj_in=stream_in)
 
 
+@router.get("/by-ids", response_model=List[Stream])
+async def read_streams_by_ids(
+    *,
+    db: AsyncSession = Depends(deps.get_read_db),
+    id_list: IdList = Depends(deps.get_id_list),
+    current_user: Principal = Depends(deps.PermissionChecker(Permissions.STREAM_READ)),
+) -> Any:
+    """
+    Oqimlarni ID'lar bo'yicha olish (?ids=1,2,3): bitta so'rov, so'ralgan tartibda.
+    Topilmagan ID'lar javobga kirmaydi.
+    """
+    return await stream_service.get_many(db, id_list.ids)
+
+
+@router.post("/by-ids", response_model=List[Stream])
+async def read_streams_by_ids_post(
+    *,
+    db: AsyncSession = Depends(deps.get_read_db),
+    id_list: IdList,
+    current_user: Principal = Depends(deps.PermissionChecker(Permissions.STREAM_READ)),
+) -> Any:
+    """
+    GET /by-ids bilan bir xil; ID'lar ko'p bo'lsa (URL uzunligi) tanada yuboriladi.
+    """
+    return await stream_service.get_many(db, id_list.ids)
+
+
 @router.get("/{id}", response_model=Stream)
 async def read_stream(
     *,
-    db: AsyncSession = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_read_db),
     id: int,
-    current_user: User = Depends(deps.PermissionChecker(Permissions.STREAM_READ)),
+    current_user: Principal = Depends(deps.PermissionChecker(Permissions.STREAM_READ)),
 ) -> Any:
     stream = await stream_service.get(db, id=id)
     if not stream:
@@ -73,6 +160,6 @@ async def delete_stream(
     *,
     db: AsyncSession = Depends(deps.get_db),
     id: int,
-    current_user: User = Depends(deps.PermissionChecker(Permissions.STREAM_DELETE)),
+    current_user: Principal = Depends(deps.PermissionChecker(Permissions.STREAM_DELETE)),
 ) -> Any:
     return await stream_service.delete(db, id=id)
@@ -1,31 +1,59 @@
-from typing import Any
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Any, Optional, List
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.api import deps
+from app.db.pagination import CountStrategy, count_strategy
+from app.db.search import SearchMode
 from app.core.rbac import Permissions
+from app.schemas.common import IdList
 from app.schemas.subject import Subject, SubjectCreate, SubjectUpdate, SubjectList
 from app.services.subject_service import subject_service
-from app.models.user import User
+from app.core.principal import Principal
 
 router = APIRouter()
 
 
 @router.get("/", response_model=SubjectList)
 async def read_subjects(
-    db: AsyncSession = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_read_db),
     page: int = 1,
     size: int = 20,
     search: str | None = None,
-    current_user: User = Depends(deps.PermissionChecker(Permissions.SUBJECT_READ)),
+    search_mode: SearchMode = Query(
+        SearchMode.contains,
+        description="contains - nom ichida; ranked - o'xshashlik bo'yicha (imlo xatolariga chidamli)",
+    ),
+    cursor: Optional[str] = Query(
+        None, description="Keyingi sahifa uchun oldingi javobdagi next_cursor"
+    ),
+    sort: str = Query("id", description="id, -id, name, -name"),
+    include_total: bool = True,
+    count: Optional[CountStrategy] = Query(
+        None, description="Jami hisoblash usuli: exact, window, cached, estimate, none"
+    ),
+    current_user: Principal = Depends(deps.PermissionChecker(Permissions.SUBJECT_READ)),
 ) -> Any:
     """
     Fanlar ro'yxatini olish.
     """
     skip = (page - 1) * size
-    items, total = await subject_service.get_multi(
-        db, skip=skip, limit=size, search=search
+    items, total, next_cursor = await subject_service.get_multi(
+        db,
+        skip=skip,
+        limit=size,
+        search=search,
+        search_mode=search_mode,
+        cursor=cursor,
+        sort=sort,
+        count=count_strategy(count, include_total),
     )
-    return {"items": items, "total": total, "page": page, "size": size}
+    return {
+        "items": items,
+        "total": total,
+        "page": page,
+        "size": size,
+        "next_cursor": next_cursor,
+    }
 
 
 @router.post("/", response_model=Subject)
@@ -33,7 +61,7 @@ async def create_subject(
     *,
     db: AsyncSession = Depends(deps.get_db),
     subject_in: SubjectCreate,
-    current_user: User = Depends(deps.PermissionChecker(Permissions.SUBJECT_CREATE)),
+    current_user: Principal = Depends(deps.PermissionChecker(Permissions.SUBJECT_CREATE)),
 ) -> Any:
     """
     Yangi fan yaratish.
@@ -47,7 +75,7 @@ async def update_subject(
     db: AsyncSession = Depends(deps.get_db),
     id: int,
     subject_in: SubjectUpdate,
-    current_user: User = Depends(deps.PermissionChecker(Permissions.SUBJECT_UPDATE)),
+    current_user: Principal = Depends(deps.PermissionChecker(Permissions.SUBJECT_UPDATE)),
 ) -> Any:
     subject = await subject_service.get(db, id=id)
     if not subject:
@@ -55,12 +83,39 @@ async def update_subject(
     return await subject_service.update(db, db_obj=subject, obj_in=subject_in)
 
 
+@router.get("/by-ids", response_model=List[Subject])
+async def read_subjects_by_ids(
+    *,
+    db: AsyncSession = Depends(deps.get_read_db),
+    id_list: IdList = Depends(deps.get_id_list),
+    current_user: Principal = Depends(deps.PermissionChecker(Permissions.SUBJECT_READ)),
+) -> Any:
+    """
+    Fanlarni ID'lar bo'yicha olish (?ids=1,2,3): bitta so'rov, so'ralgan tartibda.
+    Topilmagan ID'lar javobga kirmaydi.
+    """
+    return await subject_service.get_many(db, id_list.ids)
+
+
+@router.post("/by-ids", response_model=List[Subject])
+async def read_subjects_by_ids_post(
+    *,
+    db: AsyncSession = Depends(deps.get_read_db),
+    id_list: IdList,
+    current_user: Principal = Depends(deps.PermissionChecker(Permissions.SUBJECT_READ)),
+) -> Any:
+    """
+    GET /by-ids bilan bir xil; ID'lar ko'p bo'lsa (URL uzunligi) tanada yuboriladi.
+    """
+    return await subject_service.get_many(db, id_list.ids)
+
+
 @router.get("/{id}", response_model=Subject)
 async def read_subject(
     *,
-    db: AsyncSession = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_read_db),
     id: int,
-    current_user: User = Depends(deps.PermissionChecker(Permissions.SUBJECT_READ)),
+    current_user: Principal = Depends(deps.PermissionChecker(Permissions.SUBJECT_READ)),
 ) -> Any:
     subject = await subject_service.get(db, id=id)
     if not subject:
@@ -73,6 +128,6 @@ async def delete_subject(
     *,
     db: AsyncSession = Depends(deps.get_db),
     id: int,
-    current_user: User = Depends(deps.PermissionChecker(Permissions.SUBJECT_DELETE)),
+    current_user: Principal = Depends(deps.PermissionChecker(Permissions.SUBJECT_DELETE)),
 ) -> Any:
     return await subject_service.delete(db, id=id)
@@ -1,27 +1,49 @@
-from typing import Any
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Any, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.api import deps
+from app.db.pagination import CountStrategy, count_strategy
 from app.schemas.teacher import Teacher, TeacherCreate, TeacherUpdate, TeacherList
 from app.services.teacher_service import teacher_service
-from app.models.user import User
+from app.core.principal import Principal
 
 router = APIRouter()
 
 
 @router.get("/", response_model=TeacherList)
 async def read_teachers(
-    db: AsyncSession = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_read_db),
     page: int = 1,
     size: int = 20,
-    current_user: User = Depends(deps.get_current_active_user),
+    cursor: Optional[str] = Query(
+        None, description="Keyingi sahifa uchun oldingi javobdagi next_cursor"
+    ),
+    sort: str = Query("id", description="id, -id"),
+    include_total: bool = True,
+    count: Optional[CountStrategy] = Query(
+        None, description="Jami hisoblash usuli: exact, window, cached, estimate, none"
+    ),
+    current_user: Principal = Depends(deps.get_current_active_user),
 ) -> Any:
     """
     O'qituvchilar ro'yxatini olish.
     """
     skip = (page - 1) * size
-    items, total = await teacher_service.get_multi(db, skip=skip, limit=size)
-    return {"items": items, "total": total, "page": page, "size": size}
+    items, total, next_cursor = await teacher_service.get_multi(
+        db,
+        skip=skip,
+        limit=size,
+        cursor=cursor,
+        sort=sort,
+        count=count_strategy(count, include_total),
+    )
+    return {
+        "items": items,
+        "total": total,
+        "page": page,
+        "size": size,
+        "next_cursor": next_cursor,
+    }
 
 
 @router.post("/", response_model=Teacher)
@@ -29,7 +51,7 @@ async def create_teacher(
     *,
     db: AsyncSession = Depends(deps.get_db),
     teacher_in: TeacherCreate,
-    current_user: User = Depends(deps.get_current_active_superuser),
+    current_user: Principal = Depends(deps.get_current_active_superuser),
 ) -> Any:
     """
     Yangi o'qituvchi yaratish.
@@ -40,9 +62,9 @@ async def create_teacher(
 @router.get("/{id}", response_model=Teacher)
 async def read_teacher(
     *,
-    db: AsyncSession = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_read_db),
     id: int,
-    current_user: User = Depends(deps.get_current_active_user),
+    current_user: Principal = Depends(deps.get_current_active_user),
 ) -> Any:
     teacher = await teacher_service.get(db, id=id)
     if not teacher:
@@ -1,11 +1,25 @@
-from typing import Any, List
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Any, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
 from app.api import deps
+from app.core.config import settings
+from app.db.pagination import (
+    NEXT_CURSOR_HEADER,
+    TOTAL_COUNT_HEADER,
+    CountStrategy,
+    count_strategy,
+)
 from app.models.user import User
-from app.schemas.user import User as UserSchema, UserCreate, UserUpdate
+from app.core.principal import Principal
+from app.schemas.user import (
+    User as UserSchema,
+    UserBulkReport,
+    UserCreate,
+    UserDirectory,
+    UserUpdate,
+)
 from app.db.session import get_db
 from app.services.user_service import user_service
 from app.core.rbac import Permissions
@@ -18,7 +32,7 @@ async def create_user(
     *,
     db: AsyncSession = Depends(get_db),
     user_in: UserCreate,
-    current_user: User = Depends(deps.PermissionChecker(Permissions.USER_CREATE)),
+    current_user: Principal = Depends(deps.PermissionChecker(Permissions.USER_CREATE)),
 ) -> Any:
     """
     Yangi foydalanuvchi yaratish.
@@ -33,13 +47,63 @@ async def create_user(
     return user
 
 
+async def _read_limited_body(request: Request, limit: int) -> bytes:
+    """
+    So'rov tanasini hajmi cheklangan holda o'qiydi: Content-Length oldindan
+    tekshiriladi, oqim esa o'qilgan baytlar soni bo'yicha to'xtatiladi
+    (sarlavha yo'q yoki noto'g'ri bo'lsa ham).
+    """
+    too_large = HTTPException(
+        status_code=413,
+        detail=f"Request body exceeds {limit} bytes",
+    )
+    declared = request.headers.get("content-length", "")
+    if declared.isdigit() and int(declared) > limit:
+        raise too_large
+    chunks: List[bytes] = []
+    received = 0
+    async for chunk in request.stream():
+        received += len(chunk)
+        if received > limit:
+            raise too_large
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+
+@router.post(
+    "/bulk",
+    response_model=UserBulkReport,
+    dependencies=[Depends(deps.db_route_class("batch"))],
+)
+async def bulk_create_users(
+    *,
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    format: Optional[str] = Query(None, pattern="^(csv|jsonl)$"),
+    current_user: Principal = Depends(deps.PermissionChecker(Permissions.USER_CREATE)),
+) -> Any:
+    """
+    Foydalanuvchilarni ommaviy yaratish (masalan, talabalar qabuli).
+    So'rov tanasi: JSON lines (har qatorda UserCreate obyekti) yoki CSV
+    (sarlavha qatori UserCreate maydonlari, rollar ";" bilan ajratiladi).
+    Format ?format= yoki Content-Type (text/csv) bo'yicha aniqlanadi.
+    Har bir qator uchun natija qaytariladi. Tana hajmi USER_BULK_MAX_BYTES
+    bilan cheklangan (oshsa 413).
+    """
+    if format is None:
+        content_type = request.headers.get("content-type", "")
+        format = "csv" if "csv" in content_type else "jsonl"
+    content = await _read_limited_body(request, settings.USER_BULK_MAX_BYTES)
+    return await user_service.bulk_create(db, content, format)
+
+
 @router.patch("/{user_id}", response_model=UserSchema)
 async def update_user(
     *,
     db: AsyncSession = Depends(get_db),
     user_id: int,
     user_in: UserUpdate,
-    current_user: User = Depends(deps.PermissionChecker(Permissions.USER_UPDATE)),
+    current_user: Principal = Depends(deps.PermissionChecker(Permissions.USER_UPDATE)),
 ) -> Any:
     """
     Foydalanuvchi ma'lumotlarini yangilash.
@@ -65,7 +129,7 @@ async def delete_user(
     *,
     db: AsyncSession = Depends(get_db),
     user_id: int,
-    current_user: User = Depends(deps.PermissionChecker(Permissions.USER_DELETE)),
+    current_user: Principal = Depends(deps.PermissionChecker(Permissions.USER_DELETE)),
 ) -> Any:
     """
     Foydalanuvchini o'chirish.
@@ -88,18 +152,81 @@ async def delete_user(
 
 @router.get("/", response_model=List[UserSchema])
 async def read_users(
-    db: AsyncSession = Depends(get_db),
+    response: Response,
+    db: AsyncSession = Depends(deps.get_read_db),
     skip: int = 0,
     limit: int = 100,
-    current_user: User = Depends(deps.PermissionChecker(Permissions.USER_READ)),
+    cursor: Optional[str] = Query(
+        None, description="Keyingi sahifa uchun oldingi javobdagi X-Next-Cursor"
+    ),
+    sort: str = Query("id", description="id, -id, email, -email"),
+    include_total: bool = True,
+    count: Optional[CountStrategy] = Query(
+        None, description="Jami hisoblash usuli: exact, window, cached, estimate, none"
+    ),
+    current_user: Principal = Depends(deps.PermissionChecker(Permissions.USER_READ)),
 ) -> Any:
     """
     Foydalanuvchilar ro'yxatini olish.
     """
-    users = await user_service.get_multi(db, skip=skip, limit=limit)
+    users, total, next_cursor = await user_service.get_multi(
+        db,
+        skip=skip,
+        limit=limit,
+        cursor=cursor,
+        sort=sort,
+        count=count_strategy(count, include_total),
+    )
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    if total is not None:
+        response.headers[TOTAL_COUNT_HEADER] = str(total)
     return users
 
 
+@router.get("/directory", response_model=UserDirectory)
+async def read_user_directory(
+    db: AsyncSession = Depends(deps.get_read_db),
+    size: int = Query(50, ge=1, le=500),
+    page: int = 1,
+    name: Optional[str] = Query(None, description="Ism bo'yicha (kirill/lotin farqsiz)"),
+    email: Optional[str] = Query(None, description="Email boshi bo'yicha"),
+    jshshir: Optional[str] = None,
+    phone_number: Optional[str] = None,
+    role: Optional[str] = Query(None, description="Rol nomi"),
+    department_id: Optional[int] = None,
+    cursor: Optional[str] = Query(
+        None, description="Keyingi sahifa uchun oldingi javobdagi next_cursor"
+    ),
+    sort: str = Query("id", description="id, -id, name, -name, email, -email"),
+    include_total: bool = True,
+    count: Optional[CountStrategy] = Query(
+        None, description="Jami hisoblash usuli: exact, window, cached, estimate, none"
+    ),
+    current_user: Principal = Depends(deps.PermissionChecker(Permissions.USER_READ)),
+) -> Any:
+    """
+    Foydalanuvchilar katalogi: filtrlar, keyset sahifalash va yengil
+    javob (rollar faqat nomlari bilan).
+    """
+    skip = (max(page, 1) - 1) * size
+    items, total, next_cursor = await user_service.get_directory(
+        db,
+        skip=skip,
+        limit=size,
+        name=name,
+        email=email,
+        jshshir=jshshir,
+        phone_number=phone_number,
+        role=role,
+        department_id=department_id,
+        cursor=cursor,
+        sort=sort,
+        count=count_strategy(count, include_total),
+    )
+    return {"items": items, "total": total, "next_cursor": next_cursor}
+
+
 @router.get("/me", response_model=UserSchema)
 async def read_user_me(
     current_user: User = Depends(deps.get_current_user),
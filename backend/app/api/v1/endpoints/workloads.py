@@ -1,7 +1,10 @@
 from typing import Any, List, Optional
 from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import JSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.api import deps
+from app.api.fieldsets import dump_sparse, expansion_names, parse_fieldset
+from app.db.pagination import CountStrategy, count_strategy
 from app.core.rbac import Permissions
 from app.schemas.workload import (
     Workload,
@@ -9,30 +12,92 @@ from app.schemas.workload import (
     WorkloadUpdate,
     WorkloadList,
     WorkloadBatchCreate,
+    WorkloadBatchResult,
     WorkloadGroupUpdate,
 )
-from app.services.workload_service import workload_service
-from app.models.user import User
+from app.schemas.edu_plan import EduPlan
+from app.schemas.group import Group
+from app.schemas.stream import Stream
+from app.schemas.subject import Subject
+from app.services.workload_service import WORKLOAD_FIELDS, workload_service
+from app.core.principal import Principal
 
 router = APIRouter()
 
+_EXPANSIONS = {
+    "subject": ("subject", Subject, set()),
+    "edu_plan": ("edu_plan", EduPlan, {"speciality"}),
+    "group": ("group", Group, set()),
+    "stream": ("stream", Stream, {"groups"}),
+}
+
 
 @router.get("/", response_model=WorkloadList)
 async def read_workloads(
-    db: AsyncSession = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_read_db),
     page: int = 1,
     size: int = 20,
     edu_plan_id: Optional[int] = Query(None, description="Filter by EduPlan ID"),
-    current_user: User = Depends(deps.PermissionChecker(Permissions.WORKLOAD_READ)),
+    cursor: Optional[str] = Query(
+        None, description="Keyingi sahifa uchun oldingi javobdagi next_cursor"
+    ),
+    sort: str = Query("-id", description="id, -id"),
+    include_total: bool = True,
+    count: Optional[CountStrategy] = Query(
+        None, description="Jami hisoblash usuli: exact, window, cached, estimate, none"
+    ),
+    fields: Optional[str] = Query(
+        None, description="Vergul bilan ajratilgan maydonlar (id, name, subject_id, edu_plan_id, load_type, hours, stream_id, group_id)"
+    ),
+    expand: Optional[str] = Query(
+        None, description="Vergul bilan ajratilgan kengaytmalar (subject, edu_plan, edu_plan.speciality, group, stream, stream.groups)"
+    ),
+    current_user: Principal = Depends(deps.PermissionChecker(Permissions.WORKLOAD_READ)),
 ) -> Any:
     """
     Yuklamalar ro'yxatini olish.
+    Standart javob barcha bog'liq obyektlarni o'z ichiga oladi. fields= yoki
+    expand= berilsa, faqat so'ralgan ustunlar va munosabatlar yuklanadi va
+    qaytariladi (masalan ?fields=id,hours,load_type&expand=subject).
     """
+    field_list = parse_fieldset(fields, WORKLOAD_FIELDS, "fields")
+    expand_list = parse_fieldset(expand, expansion_names(_EXPANSIONS), "expand")
     skip = (page - 1) * size
-    items, total = await workload_service.get_multi(
-        db, skip=skip, limit=size, edu_plan_id=edu_plan_id
+    items, total, next_cursor = await workload_service.get_multi(
+        db,
+        skip=skip,
+        limit=size,
+        edu_plan_id=edu_plan_id,
+        cursor=cursor,
+        sort=sort,
+        count=count_strategy(count, include_total),
+        fields=field_list,
+        expand=expand_list,
     )
-    return {"items": items, "total": total, "page": page, "size": size}
+    # Serializatsiya vaqtida ulanish hovuzda tursin
+    await db.release()
+    if field_list is not None or expand_list is not None:
+        selected = WORKLOAD_FIELDS if field_list is None else field_list
+        columns = ["id", *(field for field in selected if field != "id")]
+        return JSONResponse(
+            {
+                "items": [
+                    dump_sparse(item, columns, _EXPANSIONS, expand_list or [])
+                    for item in items
+                ],
+                "total": total,
+                "page": page,
+                "size": size,
+                "next_cursor": next_cursor,
+            }
+        )
+    return {
+        "items": items,
+        "total": total,
+        "page": page,
+        "size": size,
+        "next_cursor": next_cursor,
+    }
 
 
 @router.post("/", response_model=Workload)
@@ -40,7 +105,7 @@ async def create_workload(
     *,
     db: AsyncSession = Depends(deps.get_db),
     workload_in: WorkloadCreate,
-    current_user: User = Depends(deps.PermissionChecker(Permissions.WORKLOAD_CREATE)),
+    current_user: Principal = Depends(deps.PermissionChecker(Permissions.WORKLOAD_CREATE)),
 ) -> Any:
     """
     Yangi yuklama yaratish.
@@ -48,25 +113,35 @@ async def create_workload(
     return await workload_service.create(db, obj_in=workload_in)
 
 
-@router.post("/batch", response_model=List[Workload])
+@router.post(
+    "/batch",
+    response_model=List[WorkloadBatchResult],
+    dependencies=[Depends(deps.db_route_class("batch"))],
+)
 async def create_batch_workload(
     *,
     db: AsyncSession = Depends(deps.get_db),
     batch_in: WorkloadBatchCreate,
-    current_user: User = Depends(deps.PermissionChecker(Permissions.WORKLOAD_CREATE)),
+    current_user: Principal = Depends(deps.PermissionChecker(Permissions.WORKLOAD_CREATE)),
 ) -> Any:
     """
     Yuklamalarni ommaviy yaratish (Batch).
+    Javobda yaratilgan yuklamalar ichki obyektlarsiz (subject, group, ...)
+    qaytariladi; kerak bo'lsa ular /by-ids endpoint'lari orqali olinadi.
     """
     return await workload_service.create_batch(db, obj_in=batch_in)
 
 
-@router.put("/group_update", response_model=dict)
+@router.put(
+    "/group_update",
+    response_model=dict,
+    dependencies=[Depends(deps.db_route_class("batch"))],
+)
 async def update_workload_group(
     *,
     db: AsyncSession = Depends(deps.get_db),
     group_update: WorkloadGroupUpdate,
-    current_user: User = Depends(deps.PermissionChecker(Permissions.WORKLOAD_UPDATE)),
+    current_user: Principal = Depends(deps.PermissionChecker(Permissions.WORKLOAD_UPDATE)),
 ) -> Any:
     """
     Fan bo'yicha bir nechta yuklamalarni yangilash (Global Tahrirlash).
@@ -75,12 +150,16 @@ async def update_workload_group(
     return {"updated_count": count}
 
 
-@router.delete("/group", response_model=dict)
+@router.delete(
+    "/group",
+    response_model=dict,
+    dependencies=[Depends(deps.db_route_class("batch"))],
+)
 async def delete_workload_group(
     *,
     db: AsyncSession = Depends(deps.get_db),
     subject_id: int,
-    current_user: User = Depends(deps.PermissionChecker(Permissions.WORKLOAD_DELETE)),
+    current_user: Principal = Depends(deps.PermissionChecker(Permissions.WORKLOAD_DELETE)),
 ) -> Any:
     """
     Fan bo'yicha bir nechta yuklamalarni o'chirish.
@@ -92,9 +171,9 @@ async def delete_workload_group(
 @router.get("/{id}", response_model=Workload)
 async def read_workload(
     *,
-    db: AsyncSession = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_read_db),
     id: int,
-    current_user: User = Depends(deps.PermissionChecker(Permissions.WORKLOAD_READ)),
+    current_user: Principal = Depends(deps.PermissionChecker(Permissions.WORKLOAD_READ)),
 ) -> Any:
     """
     Yuklamani ID orqali olish.
@@ -111,7 +190,7 @@ async def update_workload(
     db: AsyncSession = Depends(deps.get_db),
     id: int,
     workload_in: WorkloadUpdate,
-    current_user: User = Depends(deps.PermissionChecker(Permissions.WORKLOAD_UPDATE)),
+    current_user: Principal = Depends(deps.PermissionChecker(Permissions.WORKLOAD_UPDATE)),
 ) -> Any:
     """
     Yuklamani yangilash.
@@ -128,7 +207,7 @@ async def delete_workload(
     *,
     db: AsyncSession = Depends(deps.get_db),
     id: int,
-    current_user: User = Depends(deps.PermissionChecker(Permissions.WORKLOAD_DELETE)),
+    current_user: Principal = Depends(deps.PermissionChecker(Permissions.WORKLOAD_DELETE)),
 ) -> Any:
     """
     Yuklamani o'chirish.
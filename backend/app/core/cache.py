@@ -0,0 +1,98 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+_MISSING = object()
+
+
+class TTLCache:
+    """
+    Hajmi cheklangan, yozuvlari muddati o'tadigan (TTL) LRU kesh.
+    Jarayon (worker) ichida ishlaydi; boshqa worker'lardagi o'zgarishlar
+    haqida invalidation_bus orqali xabar oladi.
+    """
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        # Har bir o'chirishda oshadi: yuklash vaqtida kelgan invalidation'ni aniqlash uchun
+        self.generation = 0
+        # True qaytarsa kesh chetlab o'tiladi (o'qish - miss, yozish - e'tiborsiz)
+        self._bypass: Optional[Callable[[], bool]] = None
+
+    def set_bypass(self, predicate: Callable[[], bool]) -> None:
+        self._bypass = predicate
+
+    def _bypassed(self) -> bool:
+        return self._bypass is not None and self._bypass()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        if self._bypassed():
+            self.misses += 1
+            return default
+        with self._lock:
+            item = self._data.get(key, _MISSING)
+            if item is _MISSING:
+                self.misses += 1
+                return default
+            expires_at, value = item
+            if expires_at < time.monotonic():
+                del self._data[key]
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        with self._lock:
+            self._store(key, value, ttl)
+
+    def _store(self, key: Hashable, value: Any, ttl: Optional[float]) -> None:
+        if self._bypassed():
+            return
+        self._data[key] = (time.monotonic() + (self.ttl if ttl is None else ttl), value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def set_if_current(self, key: Hashable, value: Any, generation: int) -> None:
+        """
+        Qiymatni faqat yuklash boshlangandan beri hech narsa o'chirilmagan
+        bo'lsa yozadi, aks holda eskirgan ma'lumot keshga tushib qolishi mumkin.
+        """
+        with self._lock:
+            if generation == self.generation:
+                self._store(key, value, None)
+
+    def pop(self, key: Hashable) -> None:
+        with self._lock:
+            self.generation += 1
+            self._data.pop(key, None)
+
+    def evict_where(self, predicate: Callable[[Hashable], bool]) -> None:
+        with self._lock:
+            self.generation += 1
+            for key in [k for k in self._data if predicate(k)]:
+                del self._data[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self.generation += 1
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> dict:
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
@@ -1,4 +1,4 @@
-from typing import List, Union
+from typing import Dict, List, Optional, Union
 from pydantic import AnyHttpUrl, validator
 from pydantic_settings import BaseSettings
 
@@ -21,10 +21,111 @@ class Settings(BaseSettings):
 
     # Database
     DATABASE_URL: str
+    # Optional read replica for GET endpoints; unset means all reads go to primary
+    DATABASE_REPLICA_URL: Optional[str] = None
+    # After a write, that client's reads stay on the primary for this many seconds
+    # (signed primary_until cookie, honoured by every worker)
+    READ_YOUR_WRITES_SECONDS: float = 5.0
+
+    # Connection pool
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: float = 10.0  # seconds to wait for a free connection
+    DB_POOL_RECYCLE: int = 1800  # seconds; -1 disables recycling
+    DB_POOL_PRE_PING: bool = True
+
+    # Statement caching
+    DB_QUERY_CACHE_SIZE: int = 1200  # SQLAlchemy compiled statement cache
+    DB_PREPARED_STATEMENT_CACHE_SIZE: int = 500  # asyncpg prepared statements per connection
+    # PgBouncer (transaction pooling) bilan ishlash: prepared statement'lar o'chiriladi
+    DB_PGBOUNCER_MODE: bool = False
+
+    # SQL logging (replaces echo=True)
+    DB_ECHO: bool = False  # SQLAlchemy's own synchronous echo, for local debugging only
+    SQL_LOG_SAMPLE_RATE: float = 0.0  # fraction of statements logged, 0..1
+    SQL_SLOW_QUERY_MS: float = 500.0  # slower statements are always logged
+    SQL_STATS_MAX_ENTRIES: int = 5000  # (route, fingerprint) aggregates kept in memory
+
+    # Cross-worker cache invalidation (Postgres LISTEN/NOTIFY)
+    INVALIDATION_BUS_ENABLED: bool = True
+    # LISTEN needs a session-level connection; set this when DATABASE_URL points at PgBouncer
+    INVALIDATION_DATABASE_URL: Optional[str] = None
+
+    # statement_timeout (ms). Default applies to every connection,
+    # route classes override it per transaction. 0 disables the limit.
+    DB_STATEMENT_TIMEOUT_MS: int = 30000
+    DB_STATEMENT_TIMEOUTS: Dict[str, int] = {
+        "read": 5000,
+        "write": 15000,
+        "batch": 120000,
+    }
+
+    # Resolved principals (user + roles + permissions) cached per worker
+    PRINCIPAL_CACHE_SIZE: int = 10000
+    PRINCIPAL_CACHE_TTL_SECONDS: float = 300.0
+
+    # Stateless authorization: PermissionChecker trusts signed permission claims
+    # ("pm" bitmask, "su", "tv") and only checks the per-user token version
+    AUTH_STATELESS: bool = False
+    TOKEN_VERSION_CACHE_SIZE: int = 50000
+    TOKEN_VERSION_CACHE_TTL_SECONDS: float = 3600.0
+
+    # Password hashing (argon2) runs in a thread pool off the event loop
+    PASSWORD_HASH_WORKERS: Optional[int] = None  # default: min(4, CPU count)
+    PASSWORD_HASH_QUEUE_LIMIT: int = 64  # per worker; beyond this requests get 503
+    PASSWORD_HASH_BULK_WORKERS: Optional[int] = None  # bulk user import; default: CPU count
+
+    # List totals: default count strategy (exact / window / cached / estimate / none)
+    PAGINATION_COUNT_STRATEGY: str = "window"
+    COUNT_CACHE_SIZE: int = 2048
+    COUNT_CACHE_TTL_SECONDS: float = 60.0
+    # "estimate" uses pg_class.reltuples only for unfiltered tables at least this big
+    COUNT_ESTIMATE_MIN_ROWS: int = 100000
+
+    # Bulk fetch-by-IDs endpoints (/<resource>/by-ids): max IDs per request
+    BULK_FETCH_MAX_IDS: int = 1000
+
+    # Unified search (GET /search): hits per entity type
+    SEARCH_DEFAULT_PER_TYPE: int = 5
+    SEARCH_MAX_PER_TYPE: int = 50
+
+    # Bulk user provisioning (POST /users/bulk)
+    USER_BULK_MAX_ROWS: int = 20000
+    USER_BULK_MAX_BYTES: int = 20 * 1024 * 1024  # request body cap, checked while streaming
+    USER_BULK_CHUNK_SIZE: int = 1000  # rows per multi-row INSERT / commit
+
+    @validator("USER_BULK_CHUNK_SIZE")
+    def limit_user_bulk_chunk(cls, v: int) -> int:
+        # asyncpg binds at most 32767 parameters per statement; a users row binds 14
+        if not 1 <= v <= 2000:
+            raise ValueError("USER_BULK_CHUNK_SIZE must be between 1 and 2000")
+        return v
+
+    # Workload batch create (POST /workloads/batch): rows per multi-row INSERT
+    WORKLOAD_BATCH_CHUNK_SIZE: int = 1000
+
+    @validator("WORKLOAD_BATCH_CHUNK_SIZE")
+    def limit_workload_batch_chunk(cls, v: int) -> int:
+        # asyncpg binds at most 32767 parameters per statement; a workloads row
+        # binds at most len(workload_service._BATCH_COLUMNS) = 8 -> 32767 // 8
+        if not 1 <= v <= 4095:
+            raise ValueError("WORKLOAD_BATCH_CHUNK_SIZE must be between 1 and 4095")
+        return v
+
+    # Revoked access tokens (jti): in-memory Bloom filter, confirmed against the table
+    REVOCATION_BLOOM_CAPACITY: int = 100000
+    REVOCATION_BLOOM_ERROR_RATE: float = 0.001
+    REVOCATION_REFRESH_SECONDS: float = 30.0  # incremental reload of new revocations
+    REVOCATION_REBUILD_SECONDS: float = 3600.0  # full rebuild, drops expired entries
 
     # Security
     SECRET_KEY: str
-    ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 8  # 8 days
+    # Short-lived access tokens; clients renew them with a rotating refresh token
+    ACCESS_TOKEN_EXPIRE_MINUTES: int = 15
+    REFRESH_TOKEN_EXPIRE_DAYS: int = 30
+    # A just-rotated refresh token presented again within this window (parallel tabs)
+    # is rejected without revoking its family
+    REFRESH_TOKEN_REUSE_GRACE_SECONDS: float = 10.0
 
     class Config:
         case_sensitive = True
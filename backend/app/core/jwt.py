@@ -1,3 +1,4 @@
+import secrets
 from datetime import datetime, timedelta
 from typing import Optional, Union, Any
 from jose import jwt
@@ -11,7 +12,8 @@ def create_access_token(subject: Union[str, Any], expires_delta: Optional[timede
     else:
         expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     
-    to_encode = {"exp": expire, "sub": str(subject)}
+    # jti: tokenni alohida bekor qilish (logout) uchun identifikator
+    to_encode = {"exp": expire, "sub": str(subject), "jti": secrets.token_urlsafe(12)}
     if additional_claims:
         to_encode.update(additional_claims)
         
@@ -0,0 +1,125 @@
+import asyncio
+import base64
+from typing import Dict, FrozenSet, Iterable, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.invalidation import invalidation_bus
+from app.db.statements import cached_statement
+from app.models.role import Permission, Role, role_permissions
+
+
+def encode_mask(mask: int) -> str:
+    """Bitmask'ni token uchun ixcham base64url satriga aylantiradi."""
+    raw = mask.to_bytes((mask.bit_length() + 7) // 8 or 1, "big")
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_mask(encoded: str) -> int:
+    return int.from_bytes(
+        base64.urlsafe_b64decode(encoded + "=" * (-len(encoded) % 4)), "big"
+    )
+
+
+@cached_statement
+def _permission_bits():
+    return select(Permission.slug, Permission.bit).where(Permission.bit.is_not(None))
+
+
+@cached_statement
+def _role_permission_bits():
+    return (
+        select(Role.name, Permission.bit)
+        .select_from(Role)
+        .outerjoin(role_permissions, role_permissions.c.role_id == Role.id)
+        .outerjoin(Permission, Permission.id == role_permissions.c.permission_id)
+    )
+
+
+class PermissionRegistry:
+    """
+    Ruxsatnomalar reyestri: har bir Permission'ning bit pozitsiyasi va har bir
+    rolning bazadagi ruxsatnomalaridan yig'ilgan butun son maskasi.
+
+    Ruxsat tekshiruvi bitta AND amaliga aylanadi:
+        principal_mask & permission_mask != 0
+    Rollar o'zgarganda (invalidation_bus "roles"/"permissions" hodisalari)
+    reyestr eskirgan deb belgilanadi va keyingi so'rovda qayta yuklanadi;
+    har bir qayta yuklash version'ni oshiradi. LISTEN ishlamayotganda
+    reyestr har bir so'rovda qayta yuklanadi.
+    """
+
+    def __init__(self) -> None:
+        self.version = 0
+        self._bits: Dict[str, int] = {}
+        self._slugs: Dict[int, str] = {}
+        self._role_masks: Dict[str, int] = {}
+        self._stale = True
+        self._invalidations = 0
+        self._lock = asyncio.Lock()
+
+    def invalidate(self, *_) -> None:
+        self._stale = True
+        self._invalidations += 1
+
+    async def ensure_loaded(self, db: AsyncSession) -> "PermissionRegistry":
+        # LISTEN ishlamayotganda rol o'zgarishlari haqida xabar kelmaydi:
+        # reyestr har bir so'rovda bazadan qayta yuklanadi
+        if self._stale or not invalidation_bus.connected:
+            async with self._lock:
+                if self._stale or not invalidation_bus.connected:
+                    await self._reload(db)
+        return self
+
+    async def _reload(self, db: AsyncSession) -> None:
+        """
+        Maskalar avval lokal o'zgaruvchilarga yig'iladi va faqat so'rovlar
+        muvaffaqiyatli tugaganda almashtiriladi. Xato bo'lsa reyestr eskirgan
+        holida qoladi (keyingi so'rov yana yuklaydi); yuklash davomida kelgan
+        invalidation ham keyingi so'rovda qayta yuklatadi.
+        """
+        invalidations = self._invalidations
+        try:
+            rows = (await db.execute(_permission_bits())).all()
+            bits = {slug: bit for slug, bit in rows}
+            role_masks: Dict[str, int] = {}
+            for name, bit in (await db.execute(_role_permission_bits())).all():
+                role_masks[name] = role_masks.get(name, 0) | (
+                    1 << bit if bit is not None else 0
+                )
+        except Exception:
+            self._stale = True
+            raise
+
+        self._bits = bits
+        self._slugs = {bit: slug for slug, bit in bits.items()}
+        self._role_masks = role_masks
+        self.version += 1
+        self._stale = self._invalidations != invalidations
+
+    def mask_for(self, *slugs: str) -> int:
+        """Ruxsatnoma(lar) maskasi; bazada yo'q ruxsatnoma uchun 0."""
+        mask = 0
+        for slug in slugs:
+            bit = self._bits.get(slug)
+            if bit is not None:
+                mask |= 1 << bit
+        return mask
+
+    def mask_for_roles(self, roles: Iterable[str]) -> int:
+        mask = 0
+        for role in roles:
+            mask |= self._role_masks.get(role, 0)
+        return mask
+
+    def slugs(self, mask: int) -> FrozenSet[str]:
+        return frozenset(
+            slug for bit, slug in self._slugs.items() if mask & (1 << bit)
+        )
+
+
+permission_registry = PermissionRegistry()
+invalidation_bus.subscribe("roles", permission_registry.invalidate)
+invalidation_bus.subscribe("permissions", permission_registry.invalidate)
+invalidation_bus.on_reset(permission_registry.invalidate)
@@ -0,0 +1,74 @@
+from dataclasses import dataclass
+from typing import FrozenSet, Optional
+
+from sqlalchemy import bindparam, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.permission_registry import permission_registry
+from app.db.invalidation import invalidation_bus
+from app.db.statements import cached_statement
+from app.models.user import User
+
+
+@dataclass(frozen=True)
+class Principal:
+    """
+    Autentifikatsiyadan o'tgan foydalanuvchining ruxsat tekshiruvi uchun
+    kerakli qismi: ID, faollik va superuser bayroqlari, rollar va ruxsatnomalar
+    maskasi (permission_registry bitlari bo'yicha).
+    To'liq User obyekti kerak bo'lganda (masalan /users/me) alohida yuklanadi.
+    """
+
+    id: int
+    is_active: bool
+    is_superuser: bool
+    roles: FrozenSet[str]
+    permission_mask: int
+
+    def has_permission(self, permission: str) -> bool:
+        return self.is_superuser or bool(
+            self.permission_mask & permission_registry.mask_for(permission)
+        )
+
+
+# user_id -> Principal. Foydalanuvchi o'zgarsa faqat uning yozuvi,
+# rollar o'zgarsa (nomi, ruxsatnomalari, o'chirilishi) butun kesh tozalanadi.
+principal_cache = TTLCache(
+    maxsize=settings.PRINCIPAL_CACHE_SIZE, ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS
+)
+invalidation_bus.bind_cache(principal_cache, "users")
+invalidation_bus.bind_cache(principal_cache, "roles", by_id=False)
+
+
+@cached_statement
+def _principal_rows():
+    # Bitta qator: rollar users.auth_roles nusxasidan, JOIN'siz
+    return select(
+        User.id, User.is_active, User.is_superuser, User.auth_roles
+    ).where(User.id == bindparam("id"))
+
+
+async def load_principal(db: AsyncSession, user_id: int) -> Optional[Principal]:
+    """Principal'ni keshdan, bo'lmasa bazadan (bitta so'rov) oladi."""
+    principal = principal_cache.get(user_id)
+    if principal is not None:
+        return principal
+
+    generation = principal_cache.generation
+    await permission_registry.ensure_loaded(db)
+    row = (await db.execute(_principal_rows(), {"id": user_id})).first()
+    if row is None:
+        return None
+
+    roles = frozenset(row.auth_roles)
+    principal = Principal(
+        id=row.id,
+        is_active=row.is_active,
+        is_superuser=row.is_superuser,
+        roles=roles,
+        permission_mask=permission_registry.mask_for_roles(roles),
+    )
+    principal_cache.set_if_current(user_id, principal, generation)
+    return principal
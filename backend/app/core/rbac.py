@@ -1,3 +1,5 @@
+import hashlib
+import json
 from typing import List, Dict
 
 
@@ -127,3 +129,23 @@ def get_role_permissions(roles: str | List[str]) -> List[str]:
         role_perms = ROLE_PERMISSIONS.get(role, [])
         permissions.update(role_perms)
     return list(permissions)
+
+
+# Permission.bit uchun boshlang'ich tartib: Permissions'dagi e'lon tartibi.
+# Bitlar bazada saqlanadi va o'zgarmaydi; yangi ruxsatnomalar seed'da
+# keyingi bo'sh bitni oladi.
+PERMISSION_BITS: List[str] = [
+    value
+    for name, value in vars(Permissions).items()
+    if not name.startswith("_") and isinstance(value, str)
+]
+
+
+def role_permissions_fingerprint() -> str:
+    """
+    ROLE_PERMISSIONS'ning sha256 fingerprint'i (tartibga bog'liq emas).
+    Seed faqat shu qiymat o'zgarganda qayta bajariladi.
+    """
+    canonical = {role: sorted(set(perms)) for role, perms in ROLE_PERMISSIONS.items()}
+    payload = json.dumps(canonical, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode()).hexdigest()
@@ -0,0 +1,232 @@
+import asyncio
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import bindparam, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.bloom import BloomFilter
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.db.invalidation import invalidation_bus
+from app.db.statements import cached_statement
+from app.models.revoked_token import RevokedToken
+from app.models.user import User
+
+"""
+Tokenlarni bekor qilish: foydalanuvchi darajasida (token versiyasi) va
+alohida token darajasida (jti bo'yicha bekor qilingan tokenlar ro'yxati).
+
+Stateless avtorizatsiya uchun token versiyalari reyestri.
+
+Har bir token "tv" (users.token_version) claim'ini olib yuradi. Versiya
+oshirilganda (parol, rollar, faollik o'zgarishi, rol ruxsatnomalarining
+o'zgarishi) foydalanuvchining eski tokenlari bekor bo'ladi. Reyestr
+worker ichida saqlanadi va invalidation_bus hodisalari bilan yangilanadi,
+shuning uchun har bir foydalanuvchi uchun bazaga faqat birinchi marta murojaat
+qilinadi.
+"""
+
+# user_id -> (token_version, is_active)
+token_versions = TTLCache(
+    maxsize=settings.TOKEN_VERSION_CACHE_SIZE,
+    ttl=settings.TOKEN_VERSION_CACHE_TTL_SECONDS,
+)
+invalidation_bus.bind_cache(token_versions, "users")
+invalidation_bus.bind_cache(token_versions, "roles", by_id=False)
+
+
+@cached_statement
+def _token_state():
+    return select(User.token_version, User.is_active).where(
+        User.id == bindparam("id")
+    )
+
+
+async def _current_state(db: AsyncSession, user_id: int) -> Optional[Tuple[int, bool]]:
+    state = token_versions.get(user_id)
+    if state is not None:
+        return state
+    generation = token_versions.generation
+    row = (await db.execute(_token_state(), {"id": user_id})).first()
+    if row is None:
+        return None
+    state = (row.token_version, row.is_active)
+    token_versions.set_if_current(user_id, state, generation)
+    return state
+
+
+async def is_token_current(db: AsyncSession, user_id: int, version: int) -> bool:
+    """Token versiyasi amaldagi versiyaga teng va foydalanuvchi faol bo'lsa True."""
+    state = await _current_state(db, user_id)
+    return state is not None and state[1] and state[0] == version
+
+
+@cached_statement
+def _revoked_since():
+    return select(RevokedToken.jti, RevokedToken.revoked_at).where(
+        RevokedToken.revoked_at > bindparam("since")
+    )
+
+
+@cached_statement
+def _revoked_active():
+    return select(RevokedToken.jti, RevokedToken.revoked_at).where(
+        RevokedToken.expires_at > func.now()
+    )
+
+
+@cached_statement
+def _revoked_exists():
+    return select(RevokedToken.id).where(RevokedToken.jti == bindparam("jti"))
+
+
+class RevocationList:
+    """
+    Bekor qilingan tokenlar (jti) ro'yxatining worker'dagi nusxasi.
+
+    Xotirada faqat Bloom filtri saqlanadi: aksariyat so'rovlar uchun "yo'q"
+    javobi aniq va bazaga murojaat qilinmaydi. Filtr "bor bo'lishi mumkin"
+    desa (haqiqatan bekor qilingan token yoki kam uchraydigan false positive),
+    natija revoked_tokens jadvalidan (aniq to'plam) jti indeksi orqali tasdiqlanadi.
+
+    Yangilanish:
+      - logout'da invalidation_bus "revoked_tokens" hodisasi jti'ni darhol qo'shadi;
+      - REVOCATION_REFRESH_SECONDS'da bir marta faqat yangi yozuvlar o'qiladi
+        (revoked_at bo'yicha, commit tartibi uchun kichik overlap bilan;
+        overlap oynasidagi jti'lar _recent'da eslab qolinadi va filtrga
+        qayta qo'shilmaydi, aks holda Bloom count har safar o'sib borardi);
+      - REVOCATION_REBUILD_SECONDS'da yoki bus qayta ulanganda filtr
+        muddati o'tmagan yozuvlardan qaytadan quriladi (eskilari tushib qoladi);
+      - LISTEN ishlamayotganda filtr ishlatilmaydi, har bir tekshiruv bazadan.
+    """
+
+    _OVERLAP = timedelta(seconds=30)
+
+    def __init__(self) -> None:
+        self._bloom = BloomFilter(
+            settings.REVOCATION_BLOOM_CAPACITY, settings.REVOCATION_BLOOM_ERROR_RATE
+        )
+        self._cursor: Optional[datetime] = None
+        # overlap oynasida filtrga qo'shilgan jti -> revoked_at
+        self._recent: Dict[str, datetime] = {}
+        self._last_refresh = 0.0
+        self._last_rebuild = 0.0
+        self._stale = True
+        self._invalidations = 0
+        # qayta qurish davomida hodisalardan kelgan jti'lar (yangi filtrga ham)
+        self._late: Optional[List[str]] = None
+        self._lock = asyncio.Lock()
+
+    def add(self, jti: str) -> None:
+        self._bloom.add(jti)
+        if self._late is not None:
+            self._late.append(jti)
+        if self._bloom.is_full:
+            self.invalidate()
+
+    def invalidate(self) -> None:
+        self._stale = True
+        self._invalidations += 1
+
+    def _on_event(self, evt) -> None:
+        jti = evt.data.get("jti")
+        if jti:
+            self.add(jti)
+
+    async def is_revoked(self, db: AsyncSession, jti: str) -> bool:
+        if not invalidation_bus.connected:
+            # LISTEN ishlamayapti: logout hodisalari kelmaydi, filtrga
+            # ishonib bo'lmaydi - to'g'ridan-to'g'ri jti indeksi tekshiriladi
+            return (await db.scalar(_revoked_exists(), {"jti": jti})) is not None
+        await self._maybe_refresh(db)
+        if jti not in self._bloom:
+            return False
+        return (await db.scalar(_revoked_exists(), {"jti": jti})) is not None
+
+    def _needs_rebuild(self) -> bool:
+        return (
+            self._stale
+            or time.monotonic() - self._last_rebuild > settings.REVOCATION_REBUILD_SECONDS
+        )
+
+    def _needs_refresh(self) -> bool:
+        return time.monotonic() - self._last_refresh >= settings.REVOCATION_REFRESH_SECONDS
+
+    async def _maybe_refresh(self, db: AsyncSession) -> None:
+        if not self._needs_rebuild() and not self._needs_refresh():
+            return
+        async with self._lock:
+            if self._needs_rebuild():
+                await self._rebuild(db)
+            elif self._needs_refresh():
+                await self._refresh(db)
+
+    async def _rebuild(self, db: AsyncSession) -> None:
+        """
+        Yangi filtr lokal quriladi va faqat so'rov muvaffaqiyatli tugaganda
+        almashtiriladi. Xato bo'lsa eski filtr ishlashda davom etadi va
+        ro'yxat eskirgan holida qoladi (keyingi so'rov yana quradi).
+        """
+        invalidations = self._invalidations
+        self._late = []
+        try:
+            rows = (await db.execute(_revoked_active())).all()
+        except Exception:
+            self._stale = True
+            raise
+        finally:
+            late, self._late = self._late, None
+
+        bloom = BloomFilter(
+            max(settings.REVOCATION_BLOOM_CAPACITY, len(rows) * 2),
+            settings.REVOCATION_BLOOM_ERROR_RATE,
+        )
+        for jti, _ in rows:
+            bloom.add(jti)
+        for jti in late:
+            bloom.add(jti)
+        self._bloom = bloom
+        self._cursor = max((revoked_at for _, revoked_at in rows), default=self._cursor)
+        self._recent = dict(rows)
+        self._forget_old()
+        self._last_rebuild = self._last_refresh = time.monotonic()
+        self._stale = self._invalidations != invalidations or bloom.is_full
+
+    async def _refresh(self, db: AsyncSession) -> None:
+        if self._cursor is None:
+            rows = (await db.execute(_revoked_active())).all()
+        else:
+            rows = (
+                await db.execute(_revoked_since(), {"since": self._cursor - self._OVERLAP})
+            ).all()
+        for jti, revoked_at in rows:
+            if jti in self._recent:
+                continue
+            self.add(jti)
+            self._recent[jti] = revoked_at
+            if self._cursor is None or revoked_at > self._cursor:
+                self._cursor = revoked_at
+        self._forget_old()
+        self._last_refresh = time.monotonic()
+
+    def _forget_old(self) -> None:
+        """Keyingi overlap oynasiga tushmaydigan jti'larni _recent'dan o'chiradi."""
+        if self._cursor is None:
+            self._recent.clear()
+            return
+        since = self._cursor - self._OVERLAP
+        self._recent = {
+            jti: revoked_at
+            for jti, revoked_at in self._recent.items()
+            if revoked_at > since
+        }
+
+    def stats(self) -> dict:
+        return {**self._bloom.stats(), "cursor": self._cursor}
+
+
+revocation_list = RevocationList()
+invalidation_bus.subscribe("revoked_tokens", revocation_list._on_event)
+invalidation_bus.on_reset(revocation_list.invalidate)
@@ -1,9 +1,94 @@
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Sequence
+
+from fastapi import HTTPException, status
 from passlib.context import CryptContext
 
+from app.core.config import settings
+
 pwd_context = CryptContext(schemes=["argon2"], deprecated="auto")
 
+# argon2 C kodi GIL'ni bo'shatadi, shuning uchun oqimlar (thread) yetarli:
+# xeshlash event loop'ni to'xtatmaydi va boshqa so'rovlar kutib qolmaydi.
+_hash_executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS or min(4, os.cpu_count() or 1),
+    thread_name_prefix="password-hash",
+)
+# Worker'dagi navbatdagi + bajarilayotgan xeshlash amallari soni
+_hash_inflight = 0
+# Ommaviy (bulk) xeshlash uchun alohida hovuz: login navbatini band qilmaydi
+_bulk_hash_executor: Optional[ThreadPoolExecutor] = None
+
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
+
+
+async def _run_hashing(fn, *args):
+    """
+    Xeshlashni cheklangan oqimlar hovuzida bajaradi. Navbat
+    PASSWORD_HASH_QUEUE_LIMIT'dan oshsa, kutib turmasdan 503 qaytaradi:
+    login to'lqini paytida so'rovlar cheksiz to'planib qolmasligi uchun.
+    """
+    global _hash_inflight
+    if _hash_inflight >= settings.PASSWORD_HASH_QUEUE_LIMIT:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Server is busy, please retry shortly",
+            headers={"Retry-After": "1"},
+        )
+    _hash_inflight += 1
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_hash_executor, fn, *args)
+    finally:
+        _hash_inflight -= 1
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await _run_hashing(verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    return await _run_hashing(get_password_hash, password)
+
+
+async def hash_passwords_bulk(passwords: Sequence[str]) -> List[str]:
+    """
+    Ko'p parolni parallel xeshlaydi (ommaviy foydalanuvchi yaratish uchun).
+    Alohida hovuzda bajariladi, shuning uchun login'lar 503 olmaydi.
+    Bir vaqtda hovuzga faqat 2 x worker ta amal topshiriladi: 20k parol
+    20k future'ni birdaniga navbatga qo'ymaydi.
+    """
+    global _bulk_hash_executor
+    if _bulk_hash_executor is None:
+        _bulk_hash_executor = ThreadPoolExecutor(
+            max_workers=settings.PASSWORD_HASH_BULK_WORKERS or os.cpu_count() or 1,
+            thread_name_prefix="password-hash-bulk",
+        )
+    loop = asyncio.get_running_loop()
+    slots = asyncio.Semaphore(_bulk_hash_executor._max_workers * 2)
+
+    async def _hash(password: str) -> str:
+        async with slots:
+            return await loop.run_in_executor(
+                _bulk_hash_executor, get_password_hash, password
+            )
+
+    return await asyncio.gather(*(_hash(password) for password in passwords))
+
+
+def hashing_stats() -> dict:
+    return {
+        "workers": _hash_executor._max_workers,
+        "inflight": _hash_inflight,
+        "queue_limit": settings.PASSWORD_HASH_QUEUE_LIMIT,
+        "bulk_workers": (
+            _bulk_hash_executor._max_workers if _bulk_hash_executor else 0
+        ),
+    }
@@ -11,3 +11,6 @@ from app.models.subject import Subject
 from app.models.stream import Stream, StreamGroup
 from app.models.workload import Workload
 from app.models.edu_plan import EduPlan
+from app.models.seed_state import SeedState
+from app.models.refresh_token import RefreshToken
+from app.models.revoked_token import RevokedToken
@@ -0,0 +1,230 @@
+import asyncio
+import json
+import logging
+import os
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+import asyncpg
+from sqlalchemy import event, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.db.session import RequestSession
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "cache_invalidation"
+_NOTIFY = text("SELECT pg_notify(:channel, :payload)")
+
+
+@dataclass
+class InvalidationEvent:
+    table: str
+    op: str  # create / update / delete
+    entity_id: Optional[Any] = None
+    data: Dict[str, Any] = field(default_factory=dict)
+    source: Optional[str] = None
+
+
+Handler = Callable[[InvalidationEvent], None]
+
+
+class InvalidationBus:
+    """
+    Worker'lar o'rtasida keshni bekor qilish (invalidation) shinasi.
+    Postgres LISTEN/NOTIFY ustida ishlaydi, qo'shimcha infratuzilma talab qilmaydi.
+
+    Servislar yozish amalidan keyin, commit'dan oldin publish() chaqiradi:
+    NOTIFY tranzaksiya bilan birga commit qilinadi (rollback bo'lsa yuborilmaydi).
+    Joriy worker hodisani commit'dan so'ng darhol oladi, qolganlari LISTEN orqali.
+    LISTEN ishlamayotgan paytda (birinchi ulanishgacha yoki uzilishda)
+    hodisalar yo'qolishi mumkin: bog'langan keshlar chetlab o'tiladi
+    (connected=False) va har bir muvaffaqiyatli (qayta) ulanishda reset
+    handler'lari (odatda kesh.clear()) chaqiriladi.
+    """
+
+    def __init__(self) -> None:
+        self.worker_id = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._handlers: Dict[str, List[Handler]] = {}
+        self._reset_handlers: List[Callable[[], None]] = []
+        self._task: Optional[asyncio.Task] = None
+        self._connection: Optional[asyncpg.Connection] = None
+        self._listening = False
+        self._stopping = False
+
+    @property
+    def connected(self) -> bool:
+        """
+        Hodisalarga ishonish mumkinmi: LISTEN faol yoki shina o'chirilgan
+        (u holda keshlar faqat TTL bilan ishlaydi).
+        """
+        return not settings.INVALIDATION_BUS_ENABLED or self._listening
+
+    # --- Obuna ---------------------------------------------------------------
+
+    def subscribe(self, table: str, handler: Handler) -> None:
+        self._handlers.setdefault(table, []).append(handler)
+
+    def on_reset(self, handler: Callable[[], None]) -> None:
+        self._reset_handlers.append(handler)
+
+    def bind_cache(self, cache: TTLCache, *tables: str, by_id: bool = True) -> None:
+        """
+        Keshni jadval(lar) hodisalariga bog'laydi: hodisada ID bo'lsa va kesh
+        kalitlari entity ID bo'lsa (by_id=True) faqat o'sha kalit o'chiriladi,
+        aks holda kesh butunlay tozalanadi. LISTEN ishlamayotganda kesh
+        chetlab o'tiladi, qayta ulanganda tozalanadi.
+        """
+
+        def evict(evt: InvalidationEvent) -> None:
+            if by_id and evt.entity_id is not None:
+                cache.pop(evt.entity_id)
+            else:
+                cache.clear()
+
+        for table in tables:
+            self.subscribe(table, evict)
+        cache.set_bypass(lambda: not self.connected)
+        self.on_reset(cache.clear)
+
+    # --- Nashr qilish --------------------------------------------------------
+
+    async def publish(
+        self,
+        db: AsyncSession,
+        table: str,
+        op: str,
+        entity_id: Optional[Any] = None,
+        data: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """
+        O'zgarish hodisasini joriy tranzaksiyaga qo'shadi.
+        Commit'dan oldin chaqirilishi kerak.
+        """
+        evt = InvalidationEvent(
+            table=table,
+            op=op,
+            entity_id=entity_id,
+            data=data or {},
+            source=self.worker_id,
+        )
+        db.info.setdefault("invalidation_events", []).append(evt)
+        if settings.INVALIDATION_BUS_ENABLED:
+            await db.execute(
+                _NOTIFY, {"channel": CHANNEL, "payload": self._encode(evt)}
+            )
+
+    def dispatch(self, evt: InvalidationEvent) -> None:
+        for handler in self._handlers.get(evt.table, ()):
+            try:
+                handler(evt)
+            except Exception:
+                logger.exception("Invalidation handler failed for %s", evt.table)
+
+    def _reset(self) -> None:
+        for handler in self._reset_handlers:
+            try:
+                handler()
+            except Exception:
+                logger.exception("Invalidation reset handler failed")
+
+    @staticmethod
+    def _encode(evt: InvalidationEvent) -> str:
+        payload = {"t": evt.table, "op": evt.op, "src": evt.source}
+        if evt.entity_id is not None:
+            payload["id"] = evt.entity_id
+        if evt.data:
+            payload["d"] = evt.data
+        return json.dumps(payload, separators=(",", ":"), default=str)
+
+    @staticmethod
+    def _decode(payload: str) -> InvalidationEvent:
+        raw = json.loads(payload)
+        return InvalidationEvent(
+            table=raw["t"],
+            op=raw.get("op", "update"),
+            entity_id=raw.get("id"),
+            data=raw.get("d") or {},
+            source=raw.get("src"),
+        )
+
+    # --- LISTEN --------------------------------------------------------------
+
+    def _on_notification(self, connection, pid, channel, payload) -> None:
+        try:
+            evt = self._decode(payload)
+        except (ValueError, KeyError):
+            logger.warning("Malformed invalidation payload: %r", payload)
+            return
+        if evt.source == self.worker_id:
+            # O'zimiz yuborgan hodisa commit'da allaqachon qayta ishlangan
+            return
+        self.dispatch(evt)
+
+    async def _listen_forever(self) -> None:
+        dsn = (
+            make_url(settings.INVALIDATION_DATABASE_URL or settings.DATABASE_URL)
+            .set(drivername="postgresql")
+            .render_as_string(hide_password=False)
+        )
+        delay = 1.0
+        while not self._stopping:
+            lost = asyncio.Event()
+            try:
+                self._connection = await asyncpg.connect(dsn)
+                self._connection.add_termination_listener(lambda _: lost.set())
+                await self._connection.add_listener(CHANNEL, self._on_notification)
+                # Shu paytgacha (birinchi ulanishgacha yoki uzilish vaqtida)
+                # hodisalar yo'qolgan bo'lishi mumkin
+                self._listening = True
+                self._reset()
+                delay = 1.0
+                await lost.wait()
+                logger.warning("Invalidation listener connection lost")
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning(
+                    "Invalidation listener failed (%s), retrying in %.0fs", exc, delay
+                )
+            finally:
+                self._listening = False
+                if self._connection is not None and not self._connection.is_closed():
+                    await self._connection.close()
+                self._connection = None
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 30.0)
+
+    async def start(self) -> None:
+        if not settings.INVALIDATION_BUS_ENABLED or self._task is not None:
+            return
+        self._stopping = False
+        self._task = asyncio.create_task(self._listen_forever())
+
+    async def stop(self) -> None:
+        self._stopping = True
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+invalidation_bus = InvalidationBus()
+
+
+@event.listens_for(RequestSession, "after_commit")
+def _dispatch_committed_events(session):
+    for evt in session.info.pop("invalidation_events", ()):
+        invalidation_bus.dispatch(evt)
+
+
+@event.listens_for(RequestSession, "after_rollback")
+def _discard_events(session):
+    session.info.pop("invalidation_events", None)
@@ -0,0 +1,126 @@
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Set, Tuple, Type
+
+from sqlalchemy import bindparam, event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.util import identity_key
+
+from app.db.session import RequestSession
+
+_MISSING = object()
+
+# (model, ustun) -> SELECT ... WHERE ustun IN (:keys); bir marta quriladi
+_statements: Dict[Tuple[type, str], Any] = {}
+
+
+def _in_statement(model: type, by: str):
+    stmt = _statements.get((model, by))
+    if stmt is None:
+        column = getattr(model, by)
+        stmt = _statements[(model, by)] = select(model).where(
+            column.in_(bindparam("keys", expanding=True))
+        )
+    return stmt
+
+
+class Loader:
+    """
+    So'rov (request) doirasidagi ma'lumot yuklovchi.
+
+    Bir so'rov davomida takrorlanadigan ma'lumotnoma qidiruvlarini (kafedra,
+    fakultet, guruh, rol va h.k.) bitta IN (...) so'roviga birlashtiradi va
+    natijani (topilmaganlarini ham) so'rov oxirigacha eslab qoladi.
+    prime() orqali oldindan navbatga qo'yilgan kalitlar keyingi load*()
+    chaqiruvida bitta so'rov bilan yuklanadi.
+
+    Sessiyada yozish (flush, bulk update/delete) yoki rollback bo'lsa,
+    eslab qolingan natijalar tozalanadi.
+    """
+
+    def __init__(self, db: AsyncSession) -> None:
+        self.db = db
+        self._memo: Dict[Tuple[type, str], Dict[Hashable, Any]] = {}
+        self._pending: Dict[Tuple[type, str], Set[Hashable]] = {}
+
+    def prime(self, model: Type, keys: Iterable[Hashable], by: str = "id") -> None:
+        """Kalitlarni keyingi yuklashda birga olish uchun navbatga qo'yadi."""
+        memo = self._memo.get((model, by), {})
+        pending = self._pending.setdefault((model, by), set())
+        pending.update(key for key in keys if key is not None and key not in memo)
+
+    async def load(self, model: Type, key: Hashable, by: str = "id") -> Optional[Any]:
+        if key is None:
+            return None
+        return (await self.load_many(model, [key], by=by))[0]
+
+    async def load_many(
+        self, model: Type, keys: Iterable[Hashable], by: str = "id"
+    ) -> List[Optional[Any]]:
+        """
+        Kalitlar tartibida obyektlarni qaytaradi (topilmagani uchun None).
+        """
+        keys = list(keys)
+        self.prime(model, keys, by=by)
+        await self._dispatch(model, by)
+        memo = self._memo.get((model, by), {})
+        return [memo.get(key) for key in keys]
+
+    async def load_existing(
+        self, model: Type, keys: Iterable[Hashable], by: str = "id"
+    ) -> List[Any]:
+        """load_many(), topilmagan kalitlarsiz (IN (...) so'rovi kabi)."""
+        return [obj for obj in await self.load_many(model, keys, by=by) if obj is not None]
+
+    async def _dispatch(self, model: Type, by: str) -> None:
+        pending = self._pending.pop((model, by), None)
+        if not pending:
+            return
+        memo = self._memo.setdefault((model, by), {})
+
+        if by == "id":
+            # Sessiya identity map'ida bor obyektlar uchun so'rov kerak emas
+            for key in list(pending):
+                obj = self.db.identity_map.get(identity_key(model, key))
+                if obj is not None:
+                    memo[key] = obj
+                    pending.discard(key)
+            if not pending:
+                return
+
+        result = await self.db.execute(_in_statement(model, by), {"keys": list(pending)})
+        for obj in result.scalars().all():
+            memo[getattr(obj, by)] = obj
+        for key in pending:
+            memo.setdefault(key, None)
+
+    def clear(self) -> None:
+        self._memo.clear()
+
+
+def get_loader(db: AsyncSession) -> Loader:
+    """Sessiyaga (ya'ni joriy so'rovga) biriktirilgan Loader'ni qaytaradi."""
+    loader = db.info.get("loader")
+    if loader is None:
+        loader = db.info["loader"] = Loader(db)
+    return loader
+
+
+def _clear_loader(session) -> None:
+    loader = session.info.get("loader")
+    if loader is not None:
+        loader.clear()
+
+
+@event.listens_for(RequestSession, "after_flush")
+def _clear_after_flush(session, flush_context):
+    _clear_loader(session)
+
+
+@event.listens_for(RequestSession, "after_rollback")
+def _clear_after_rollback(session):
+    _clear_loader(session)
+
+
+@event.listens_for(RequestSession, "do_orm_execute")
+def _clear_after_bulk_write(orm_execute_state):
+    if not orm_execute_state.is_select:
+        _clear_loader(orm_execute_state.session)
@@ -0,0 +1,285 @@
+import base64
+import binascii
+import json
+from enum import Enum
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy import func, select, text, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Select
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.db.invalidation import invalidation_bus
+
+# Saralash nomi -> ustunlar. Oxirgi ustun doim unikal (odatda id) bo'lishi
+# kerak, ustunlar NULL bo'lmasligi va (filtr ustunlari bilan birga)
+# indeksga ega bo'lishi kerak. "-" prefiksi kamayish tartibini bildiradi.
+SortColumns = Tuple[Any, ...]
+
+# Javob sarlavhasi: ro'yxatni to'g'ridan-to'g'ri qaytaradigan endpoint'lar uchun
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+TOTAL_COUNT_HEADER = "X-Total-Count"
+
+
+class CountStrategy(str, Enum):
+    """
+    Ro'yxat jami (total) qanday hisoblanadi:
+      exact    - alohida SELECT count(*) (avvalgi xatti-harakat);
+      window   - sahifa so'rovining o'zida count(*) OVER (), qo'shimcha so'rovsiz;
+      cached   - exact natijasi keshlanadi, jadvalga yozilganda tozalanadi;
+      estimate - filtrsiz katta jadvallar uchun planner bahosi (pg_class.reltuples);
+      none     - jami hisoblanmaydi (total = null).
+    """
+
+    exact = "exact"
+    window = "window"
+    cached = "cached"
+    estimate = "estimate"
+    none = "none"
+
+
+def count_strategy(
+    count: Optional[CountStrategy], include_total: bool = True
+) -> CountStrategy:
+    """Endpoint parametrlaridan strategiyani aniqlaydi (standart - sozlamadan)."""
+    if not include_total:
+        return CountStrategy.none
+    return count or CountStrategy(settings.PAGINATION_COUNT_STRATEGY)
+
+
+# (jadval, filtrlar) -> jami. Jadval hodisasi kelganda faqat o'sha jadval
+# kalitlari o'chiriladi; shina uzilganda chetlab o'tiladi, qayta ulanganda
+# butunlay tozalanadi.
+count_cache = TTLCache(
+    maxsize=settings.COUNT_CACHE_SIZE, ttl=settings.COUNT_CACHE_TTL_SECONDS
+)
+invalidation_bus.bind_cache(count_cache)
+_bound_tables: set = set()
+
+_RELTUPLES = text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:table)")
+
+
+def _bind_count_cache(table: str) -> None:
+    if table in _bound_tables:
+        return
+    _bound_tables.add(table)
+    invalidation_bus.subscribe(
+        table, lambda evt: count_cache.evict_where(lambda key: key[0] == table)
+    )
+
+
+def count_query(query: Select) -> Select:
+    return select(func.count()).select_from(query.order_by(None).subquery())
+
+
+def encode_cursor(sort: str, values: Sequence[Any]) -> str:
+    """Oxirgi qatorning saralash kalitlarini shaffof bo'lmagan satrga aylantiradi."""
+    raw = json.dumps({"s": sort, "v": list(values)}, separators=(",", ":"), default=str)
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _cursor_value_valid(column: Any, value: Any) -> bool:
+    """Cursor qiymati ustun turiga mos keladimi (int ustunga bool ham emas)."""
+    try:
+        expected = column.type.python_type
+    except NotImplementedError:
+        return True
+    if expected is int:
+        return isinstance(value, int) and not isinstance(value, bool)
+    if expected is str:
+        return isinstance(value, str)
+    return True
+
+
+def decode_cursor(cursor: str, sort: str, columns: SortColumns) -> List[Any]:
+    """
+    Cursor'ni saralash kalitlariga qaytaradi. Qiymatlar soni va turlari
+    saralash ustunlariga mos kelmasa (qo'lda o'zgartirilgan cursor) - 400,
+    aks holda noto'g'ri turdagi parametr bazada 500 xatoga aylanardi.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        values = payload["v"]
+        valid = (
+            payload["s"] == sort
+            and isinstance(values, list)
+            and len(values) == len(columns)
+            and all(map(_cursor_value_valid, columns, values))
+        )
+    except (binascii.Error, ValueError, KeyError, TypeError):
+        valid = False
+    if not valid:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor (it must come from a response with the same sort)",
+        )
+    return values
+
+
+def resolve_sort(sorts: Dict[str, SortColumns], sort: str) -> Tuple[SortColumns, bool]:
+    descending = sort.startswith("-")
+    columns = sorts.get(sort.lstrip("-"))
+    if columns is None:
+        allowed = ", ".join(f"{name}, -{name}" for name in sorts)
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid sort '{sort}'. Allowed: {allowed}",
+        )
+    return columns, descending
+
+
+def order_page(
+    query: Select,
+    sorts: Dict[str, SortColumns],
+    sort: str,
+    cursor: Optional[str],
+    skip: int,
+    limit: int,
+    rank: Optional[Any] = None,
+) -> Select:
+    """
+    So'rovga saralash va sahifalashni qo'shadi.
+    cursor berilsa - keyset: WHERE (a, id) > (:a, :id), OFFSET'siz, chuqur
+    sahifalar ham indeks bo'yicha birinchi sahifa kabi tez va parallel
+    qo'shilgan qatorlar sahifalarni siljitmaydi. Aks holda eski OFFSET rejimi.
+    rank (relevantlik ifodasi) berilsa, natija u bo'yicha saralanadi va
+    faqat OFFSET rejimi ishlaydi.
+    Keyingi sahifa borligini bilish uchun limit + 1 qator olinadi.
+    """
+    if rank is not None:
+        if cursor:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="cursor is not supported with ranked search",
+            )
+        query = query.order_by(rank.desc(), *sorts["id"])
+        return (query.offset(skip) if skip else query).limit(limit + 1)
+
+    columns, descending = resolve_sort(sorts, sort)
+    query = query.order_by(
+        *(column.desc() if descending else column.asc() for column in columns)
+    )
+    if cursor:
+        values = decode_cursor(cursor, sort, columns)
+        key, after = tuple_(*columns), tuple_(*values)
+        query = query.where(key < after if descending else key > after)
+    elif skip:
+        query = query.offset(skip)
+    return query.limit(limit + 1)
+
+
+def next_cursor(
+    rows: List[Any],
+    sorts: Dict[str, SortColumns],
+    sort: str,
+    limit: int,
+    keyset: bool = True,
+) -> Tuple[List[Any], Optional[str]]:
+    """limit + 1 qatordan sahifani va (davomi bo'lsa) keyingi cursor'ni qaytaradi."""
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    if not keyset:
+        return rows, None
+    columns, _ = resolve_sort(sorts, sort)
+    last = rows[-1]
+    return rows, encode_cursor(sort, [getattr(last, column.key) for column in columns])
+
+
+async def paginate(
+    db: AsyncSession,
+    query: Select,
+    sorts: Dict[str, SortColumns],
+    sort: str,
+    cursor: Optional[str],
+    skip: int,
+    limit: int,
+    rank: Optional[Any] = None,
+) -> Tuple[List[Any], Optional[str]]:
+    """order_page() + so'rovni bajarish + next_cursor()."""
+    result = await db.execute(order_page(query, sorts, sort, cursor, skip, limit, rank))
+    return next_cursor(result.scalars().all(), sorts, sort, limit, rank is None)
+
+
+async def count_total(
+    db: AsyncSession,
+    strategy: CountStrategy,
+    count_stmt: Select,
+    params: Optional[Dict[str, Any]],
+    table: str,
+    filters: Dict[str, Any],
+) -> Optional[int]:
+    """
+    Tanlangan strategiya bo'yicha jami qatorlar soni (window bu yerda
+    cached sifatida ishlaydi: sahifa so'rovisiz hisoblab bo'lmaydi).
+    """
+    if strategy is CountStrategy.none:
+        return None
+    if strategy is CountStrategy.exact:
+        return await db.scalar(count_stmt, params) or 0
+
+    active = tuple(sorted((k, v) for k, v in filters.items() if v not in (None, "")))
+    if strategy is CountStrategy.estimate and not active:
+        estimate = await db.scalar(_RELTUPLES, {"table": table})
+        if estimate is not None and estimate >= settings.COUNT_ESTIMATE_MIN_ROWS:
+            return int(estimate)
+
+    _bind_count_cache(table)
+    key = (table, active)
+    total = count_cache.get(key)
+    if total is None:
+        generation = count_cache.generation
+        total = await db.scalar(count_stmt, params) or 0
+        count_cache.set_if_current(key, total, generation)
+    return total
+
+
+async def paginate_counted(
+    db: AsyncSession,
+    query: Select,
+    sorts: Dict[str, SortColumns],
+    sort: str,
+    cursor: Optional[str],
+    skip: int,
+    limit: int,
+    count: Optional[CountStrategy],
+    table: str,
+    filters: Dict[str, Any],
+    rank: Optional[Any] = None,
+) -> Tuple[List[Any], Optional[int], Optional[str]]:
+    """
+    paginate() + jami. window strategiyasida jami sahifa qatorlari bilan
+    birga keladi (bitta so'rov). Cursor bilan window faqat qolgan qatorlarni
+    sanaydi, shuning uchun u holda (va bo'sh sahifada) cached ishlatiladi.
+    """
+    strategy = count or CountStrategy(settings.PAGINATION_COUNT_STRATEGY)
+    if strategy is CountStrategy.window and not cursor:
+        stmt = order_page(
+            query.add_columns(func.count().over().label("_total")),
+            sorts,
+            sort,
+            cursor,
+            skip,
+            limit,
+            rank,
+        )
+        rows = (await db.execute(stmt)).all()
+        items, cursor = next_cursor(
+            [row[0] for row in rows], sorts, sort, limit, rank is None
+        )
+        if rows:
+            return items, rows[0][1], cursor
+        if not skip:
+            return items, 0, cursor
+    else:
+        items, cursor = await paginate(
+            db, query, sorts, sort, cursor, skip, limit, rank
+        )
+
+    if strategy is CountStrategy.window:
+        strategy = CountStrategy.cached
+    total = await count_total(db, strategy, count_query(query), None, table, filters)
+    return items, total, cursor
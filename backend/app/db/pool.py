@@ -0,0 +1,124 @@
+import logging
+import threading
+import time
+from contextvars import ContextVar
+from typing import Any, Dict
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+logger = logging.getLogger(__name__)
+
+# Joriy checkout ichida yangi ulanish yaratishga ketgan vaqt (kutishdan ayriladi)
+_connect_time: ContextVar[float] = ContextVar("pool_connect_time", default=0.0)
+
+
+class PoolStats:
+    """
+    Ulanishlar hovuzi (connection pool) statistikasi.
+    Checkout soni, kutish vaqti (faqat hovuzda bo'sh ulanish kutilgan vaqt),
+    yangi ulanishlar soni va ularni yaratish vaqti hamda timeout'larni yig'adi.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.connections_created = 0
+        self.connect_time_total = 0.0
+        self.connect_time_max = 0.0
+        self.wait_time_total = 0.0
+        self.wait_time_max = 0.0
+
+    def record_checkout(self, waited: float) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.wait_time_total += waited
+            if waited > self.wait_time_max:
+                self.wait_time_max = waited
+
+    def record_timeout(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+
+    def record_connect(self, elapsed: float) -> None:
+        with self._lock:
+            self.connections_created += 1
+            self.connect_time_total += elapsed
+            if elapsed > self.connect_time_max:
+                self.connect_time_max = elapsed
+
+    def as_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            avg = self.wait_time_total / self.checkouts if self.checkouts else 0.0
+            connect_avg = (
+                self.connect_time_total / self.connections_created
+                if self.connections_created
+                else 0.0
+            )
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "connections_created": self.connections_created,
+                "connect_ms_avg": round(connect_avg * 1000, 3),
+                "connect_ms_max": round(self.connect_time_max * 1000, 3),
+                "wait_ms_avg": round(avg * 1000, 3),
+                "wait_ms_max": round(self.wait_time_max * 1000, 3),
+                "wait_ms_total": round(self.wait_time_total * 1000, 3),
+            }
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """
+    Statistikani yig'uvchi AsyncAdaptedQueuePool.
+    Har bir checkout uchun kutish vaqtini o'lchaydi va timeout'larni sanaydi.
+    Checkout ichida yangi ulanish ochilsa, uning vaqti kutishga qo'shilmaydi:
+    sekin ulanish hovuz to'lib qolgandek ko'rinmasligi uchun alohida yoziladi.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+
+    def _do_get(self):
+        started = time.perf_counter()
+        token = _connect_time.set(0.0)
+        try:
+            record = super()._do_get()
+        except exc.TimeoutError:
+            self.stats.record_timeout()
+            logger.warning("Connection pool exhausted: %s", self.status())
+            raise
+        finally:
+            connecting = _connect_time.get()
+            _connect_time.reset(token)
+        self.stats.record_checkout(time.perf_counter() - started - connecting)
+        return record
+
+    def _create_connection(self):
+        started = time.perf_counter()
+        try:
+            record = super()._create_connection()
+        finally:
+            elapsed = time.perf_counter() - started
+            _connect_time.set(_connect_time.get() + elapsed)
+        self.stats.record_connect(elapsed)
+        return record
+
+    def recreate(self) -> "InstrumentedQueuePool":
+        # engine.dispose() hovuzni qayta yaratadi, statistikani saqlab qolamiz
+        new_pool = super().recreate()
+        new_pool.stats = self.stats
+        return new_pool
+
+    def telemetry(self) -> Dict[str, Any]:
+        """Hovuzning joriy holati va yig'ilgan statistikasi."""
+        return {
+            "size": self.size(),
+            "max_overflow": self._max_overflow,
+            "checked_in": self.checkedin(),
+            "checked_out": self.checkedout(),
+            "overflow": max(self.overflow(), 0),
+            "timeout_s": self.timeout(),
+            **self.stats.as_dict(),
+        }
@@ -0,0 +1,205 @@
+import atexit
+import contextvars
+import hashlib
+import json
+import logging
+import queue
+import random
+import re
+import sys
+import time
+from functools import lru_cache
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+
+logger = logging.getLogger("app.sql")
+
+# Joriy HTTP so'rovning ASGI scope'i (marshrut nomini aniqlash uchun)
+_current_scope: contextvars.ContextVar[Optional[dict]] = contextvars.ContextVar(
+    "sql_log_scope", default=None
+)
+
+_IN_LIST_RE = re.compile(r"\(\s*\$\d+(?:\s*,\s*\$\d+)*\s*\)")
+_PARAM_RE = re.compile(r"\$\d+|%\(\w+\)s|\?")
+_SPACE_RE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=4096)
+def fingerprint(statement: str) -> Tuple[str, str]:
+    """
+    SQL matnini normallashtiradi (parametrlar, IN ro'yxatlari, bo'shliqlar)
+    va (qisqa hash, normallashgan matn) juftligini qaytaradi.
+    """
+    normalized = _IN_LIST_RE.sub("(...)", statement)
+    normalized = _PARAM_RE.sub("?", normalized)
+    normalized = _SPACE_RE.sub(" ", normalized).strip()
+    digest = hashlib.sha1(normalized.encode()).hexdigest()[:12]
+    return digest, normalized
+
+
+def current_route() -> str:
+    scope = _current_scope.get()
+    if scope is None:
+        return "-"
+    route = scope.get("route")
+    path = getattr(route, "path", None) or scope.get("path", "-")
+    return f"{scope.get('method', '')} {path}"
+
+
+class QueryStats:
+    """
+    Marshrut va so'rov fingerprint'i bo'yicha yig'ma statistika:
+    soni, umumiy va maksimal bajarilish vaqti.
+    """
+
+    def __init__(self, max_entries: int) -> None:
+        self.max_entries = max_entries
+        self.dropped = 0
+        self._entries: Dict[Tuple[str, str], List[float]] = {}
+        self._statements: Dict[str, str] = {}
+
+    def record(self, route: str, digest: str, statement: str, elapsed_ms: float):
+        key = (route, digest)
+        entry = self._entries.get(key)
+        if entry is None:
+            if len(self._entries) >= self.max_entries:
+                self.dropped += 1
+                return
+            entry = self._entries[key] = [0, 0.0, 0.0]
+            self._statements.setdefault(digest, statement[:1000])
+        entry[0] += 1
+        entry[1] += elapsed_ms
+        if elapsed_ms > entry[2]:
+            entry[2] = elapsed_ms
+
+    def snapshot(self, limit: int = 100) -> Dict[str, Any]:
+        rows = sorted(self._entries.items(), key=lambda kv: kv[1][1], reverse=True)
+        return {
+            "dropped": self.dropped,
+            "items": [
+                {
+                    "route": route,
+                    "fingerprint": digest,
+                    "statement": self._statements.get(digest),
+                    "count": count,
+                    "total_ms": round(total, 3),
+                    "avg_ms": round(total / count, 3) if count else 0.0,
+                    "max_ms": round(max_ms, 3),
+                }
+                for (route, digest), (count, total, max_ms) in rows[:limit]
+            ],
+        }
+
+    def reset(self) -> None:
+        self._entries.clear()
+        self._statements.clear()
+        self.dropped = 0
+
+
+query_stats = QueryStats(settings.SQL_STATS_MAX_ENTRIES)
+
+
+class _JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        payload = getattr(record, "sql", None) or {"message": record.getMessage()}
+        return json.dumps({"level": record.levelname, **payload}, default=str)
+
+
+_listener: Optional[QueueListener] = None
+
+
+def _setup_logger() -> None:
+    """
+    Log yozuvlari navbatga (QueueHandler) tushadi, ularni alohida oqim
+    (QueueListener) yozadi: event loop stdout'ga yozishni kutmaydi.
+    """
+    global _listener
+    if _listener is not None:
+        return
+    log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(-1)
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(_JsonFormatter())
+    _listener = QueueListener(log_queue, stream_handler)
+    _listener.start()
+    atexit.register(_listener.stop)
+
+    logger.addHandler(QueueHandler(log_queue))
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    starts = conn.info.get("query_start")
+    if not starts:
+        return
+    elapsed_ms = (time.perf_counter() - starts.pop()) * 1000
+    route = current_route()
+    digest, normalized = fingerprint(statement)
+    query_stats.record(route, digest, normalized, elapsed_ms)
+
+    slow = elapsed_ms >= settings.SQL_SLOW_QUERY_MS
+    if not slow and (
+        settings.SQL_LOG_SAMPLE_RATE <= 0
+        or random.random() >= settings.SQL_LOG_SAMPLE_RATE
+    ):
+        return
+    logger.log(
+        logging.WARNING if slow else logging.INFO,
+        "sql",
+        extra={
+            "sql": {
+                "event": "sql",
+                "route": route,
+                "fingerprint": digest,
+                "ms": round(elapsed_ms, 3),
+                "rows": getattr(cursor, "rowcount", None),
+                "executemany": executemany,
+                "slow": slow,
+                "statement": normalized[:2000],
+            }
+        },
+    )
+
+
+def _handle_error(exception_context):
+    # Xato bilan tugagan so'rovning boshlanish vaqtini stekdan olib tashlaymiz
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("query_start"):
+        conn.info["query_start"].pop()
+
+
+def setup_query_logging(engine: Engine) -> None:
+    """Sinxron engine'ga (async engine uchun engine.sync_engine) hodisalarni ulaydi."""
+    _setup_logger()
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+
+
+class QueryContextMiddleware:
+    """
+    ASGI middleware: joriy so'rov scope'ini contextvar'ga yozadi, shunda
+    SQL statistikasi marshrut (masalan "GET /api/v1/workloads/") bo'yicha yig'iladi.
+    """
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        token = _current_scope.set(scope)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _current_scope.reset(token)
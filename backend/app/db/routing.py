@@ -0,0 +1,74 @@
+import hashlib
+import hmac
+import time
+from typing import Optional
+
+from fastapi import Request
+
+from app.core.config import settings
+
+# "Read-your-writes" belgisi: yozish amalidan keyin mijozga beriladi va
+# muddati tugaguncha uning GET so'rovlari primary bazaga yo'naltiriladi.
+# Belgi mijozda saqlanadi, shuning uchun so'rov qaysi worker'ga tushishidan
+# qat'i nazar ishlaydi.
+PRIMARY_PIN_COOKIE = "primary_until"
+
+
+def _pin_signature(until: int) -> str:
+    return hmac.new(
+        settings.SECRET_KEY.encode(), f"primary-until:{until}".encode(), hashlib.sha256
+    ).hexdigest()[:32]
+
+
+def issue_primary_pin(window_seconds: float) -> str:
+    """Imzolangan "primary-until" qiymati: <unix vaqt>.<hmac>."""
+    until = int(time.time() + window_seconds) + 1
+    return f"{until}.{_pin_signature(until)}"
+
+
+def is_primary_pinned(request: Optional[Request]) -> bool:
+    """
+    So'rovda amal qilayotgan, imzosi to'g'ri belgi bormi. Muddati oynadan
+    uzun belgilar (soxta yoki eski sozlama) hisobga olinmaydi.
+    """
+    if request is None:
+        return False
+    value = request.cookies.get(PRIMARY_PIN_COOKIE)
+    if not value:
+        return False
+    until, _, signature = value.partition(".")
+    if not until.isdigit() or not hmac.compare_digest(
+        signature, _pin_signature(int(until))
+    ):
+        return False
+    now = time.time()
+    return now < int(until) <= now + settings.READ_YOUR_WRITES_SECONDS + 1
+
+
+class PrimaryPinMiddleware:
+    """
+    ASGI middleware: so'rov davomida yozish tranzaksiyasi commit qilingan
+    bo'lsa (scope["state"]["primary_pin"]), javobga belgi cookie'sini qo'shadi.
+    """
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or settings.READ_YOUR_WRITES_SECONDS <= 0:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_pin(message):
+            pinned = scope.get("state", {}).get("primary_pin")
+            if message["type"] == "http.response.start" and pinned:
+                window = settings.READ_YOUR_WRITES_SECONDS
+                cookie = (
+                    f"{PRIMARY_PIN_COOKIE}={issue_primary_pin(window)}; "
+                    f"Max-Age={int(window) + 1}; Path=/; HttpOnly; SameSite=Lax"
+                )
+                headers = [*message.get("headers", []), (b"set-cookie", cookie.encode())]
+                message = {**message, "headers": headers}
+            await send(message)
+
+        await self.app(scope, receive, send_with_pin)
@@ -0,0 +1,97 @@
+import re
+import unicodedata
+from enum import Enum
+from typing import Any, Optional
+
+from sqlalchemy import String, func, or_
+from sqlalchemy.orm import Mapped, mapped_column, validates
+from sqlalchemy.sql.elements import ColumnElement
+
+# O'zbek kirill -> lotin (1995 yilgi imlo), tutuq belgisisiz (ў -> o, ғ -> g).
+# "е" so'z boshida va unlidan keyin "ye" (_YE), qolgan joyda "e".
+_CYRILLIC = {
+    "а": "a", "б": "b", "в": "v", "г": "g", "д": "d", "е": "e", "ё": "yo", "ж": "j",
+    "з": "z", "и": "i", "й": "y", "к": "k", "л": "l", "м": "m", "н": "n",
+    "о": "o", "п": "p", "р": "r", "с": "s", "т": "t", "у": "u", "ф": "f",
+    "х": "x", "ц": "ts", "ч": "ch", "ш": "sh", "щ": "sh", "ъ": "", "ь": "",
+    "ы": "i", "э": "e", "ю": "yu", "я": "ya", "ў": "o", "қ": "q", "ғ": "g",
+    "ҳ": "h",
+}
+_YE = re.compile(r"(?:(?<=[аеёиоуўэюяъь])|(?<!\w))е")
+# o', o‘, o’, oʻ, oʼ, o` ... - kalitda tutuq belgisi umuman qoldirilmaydi
+_APOSTROPHES = "'`´‘’ʻʼ"
+_TRANSLATE = str.maketrans({**_CYRILLIC, **{mark: "" for mark in _APOSTROPHES}})
+
+
+class SearchMode(str, Enum):
+    """
+    Nom bo'yicha qidiruv usuli:
+      contains - search_key LIKE '%qidiruv%' (pg_trgm GIN indeksi orqali);
+      ranked   - contains + trigram o'xshashligi (search_key % qidiruv, imlo
+                 xatolariga chidamli), natija similarity() bo'yicha saralanadi.
+    """
+
+    contains = "contains"
+    ranked = "ranked"
+
+
+def normalize_search_key(value: Optional[str]) -> str:
+    """
+    Qidiruv kaliti: kichik harf, kirill -> lotin, tutuq belgisi variantlarisiz,
+    ortiqcha bo'shliqlarsiz. "Oʻzbek tili", "O'zbek tili" va "Ўзбек тили"
+    bir xil kalitga ("ozbek tili") aylanadi.
+    """
+    if not value:
+        return ""
+    text = unicodedata.normalize("NFC", value).lower()
+    text = _YE.sub("ye", text).translate(_TRANSLATE)
+    return " ".join(text.split())
+
+
+class SearchKeyMixin:
+    """
+    name ustunining normallashtirilgan nusxasi (search_key). name
+    o'zgartirilganda (konstruktor yoki setattr orqali) yozish vaqtida bir marta
+    hisoblanadi, shuning uchun qidiruv so'rovlari indeksli ustunni to'g'ridan-
+    to'g'ri solishtiradi. Core INSERT/UPDATE ishlatilsa, kalit qo'lda beriladi.
+    """
+
+    search_key: Mapped[str] = mapped_column(String, default="", server_default="")
+
+    @validates("name")
+    def _set_search_key(self, key: str, value: Optional[str]) -> Optional[str]:
+        self.search_key = normalize_search_key(value)
+        return value
+
+
+def escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def search_clause(column: Any, search: str, mode: SearchMode) -> ColumnElement:
+    """
+    WHERE sharti (column - search_key, qidiruv matni shu yerda normallashtiriladi).
+    Ikkala usul ham gin_trgm_ops indeksidan foydalanadi (ranked'da ikki shart
+    BitmapOr bilan birlashadi).
+    """
+    search = normalize_search_key(search)
+    contains = column.like(f"%{escape_like(search)}%", escape="\\")
+    if mode is SearchMode.ranked:
+        return or_(contains, column.op("%")(search))
+    return contains
+
+
+def search_rank(column: Any, search: str) -> ColumnElement:
+    """ranked usuli uchun saralash ifodasi (katta - yaxshiroq)."""
+    return func.similarity(column, normalize_search_key(search))
+
+
+def prefix_clause(column: Any, search: str) -> ColumnElement:
+    """
+    Avtoto'ldirish (autocomplete) sharti: search_key COLLATE "C" LIKE 'qidiruv%'.
+    (search_key COLLATE "C") indeksi bo'yicha diapazon sifatida o'qiladi va
+    xuddi shu ifoda bo'yicha saralansa LIMIT indeksdan birinchi N qatorni oladi.
+    """
+    return column.collate("C").like(
+        f"{escape_like(normalize_search_key(search))}%", escape="\\"
+    )
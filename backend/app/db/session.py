@@ -1,17 +1,200 @@
+from functools import lru_cache
+from typing import Optional
+from uuid import uuid4
+
+from fastapi import Request
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import sessionmaker, Session
 from app.core.config import settings
+from app.db.pool import InstrumentedQueuePool
+from app.db.query_log import setup_query_logging
+from app.db.routing import is_primary_pinned
+
+
+def _connect_args() -> dict:
+    connect_args = {
+        "server_settings": {
+            "statement_timeout": str(settings.DB_STATEMENT_TIMEOUT_MS),
+        },
+        "prepared_statement_cache_size": settings.DB_PREPARED_STATEMENT_CACHE_SIZE,
+    }
+    if settings.DB_PGBOUNCER_MODE:
+        # Transaction pooling: ulanish har safar boshqa backend'ga tushishi mumkin,
+        # shuning uchun nomlangan prepared statement'lar qayta ishlatilmaydi.
+        connect_args["prepared_statement_cache_size"] = 0
+        connect_args["statement_cache_size"] = 0
+        connect_args["prepared_statement_name_func"] = (
+            lambda: f"__asyncpg_{uuid4()}__"
+        )
+    return connect_args
+
+
+def _create_engine(url: str):
+    async_engine = create_async_engine(
+        url,
+        echo=settings.DB_ECHO,
+        poolclass=InstrumentedQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        query_cache_size=settings.DB_QUERY_CACHE_SIZE,
+        connect_args=_connect_args(),
+    )
+    setup_query_logging(async_engine.sync_engine)
+    return async_engine
+
+
+engine = _create_engine(settings.DATABASE_URL)
+replica_engine = (
+    _create_engine(settings.DATABASE_REPLICA_URL)
+    if settings.DATABASE_REPLICA_URL
+    else None
+)
+
+
+class RequestSession(Session):
+    """
+    So'rov (request) sessiyasi.
+    session.info["statement_timeout"] berilgan bo'lsa, har bir tranzaksiya
+    boshida SET LOCAL statement_timeout bajariladi.
+    Yozish amallari commit qilinganda so'rov holatiga (request.state)
+    primary_pin belgisi qo'yiladi; PrimaryPinMiddleware uni cookie qilib
+    mijozga qaytaradi.
+    """
+
+
+@event.listens_for(RequestSession, "after_begin")
+def _apply_statement_timeout(session, transaction, connection):
+    timeout = session.info.get("statement_timeout")
+    if timeout is not None:
+        connection.exec_driver_sql(f"SET LOCAL statement_timeout = {int(timeout)}")
+
+
+@event.listens_for(RequestSession, "after_flush")
+def _flag_flush_writes(session, flush_context):
+    session.info["has_writes"] = True
+
+
+@event.listens_for(RequestSession, "do_orm_execute")
+def _flag_bulk_writes(orm_execute_state):
+    if not orm_execute_state.is_select:
+        orm_execute_state.session.info["has_writes"] = True
+
+
+@event.listens_for(RequestSession, "after_commit")
+def _track_committed_writes(session):
+    if session.info.pop("has_writes", False):
+        request = session.info.get("request")
+        if request is not None:
+            request.state.primary_pin = True
+
+
+@event.listens_for(RequestSession, "after_rollback")
+def _discard_writes(session):
+    session.info.pop("has_writes", None)
+
+
+class RequestAsyncSession(AsyncSession):
+    """
+    Ulanishni imkon qadar qisqa ushlab turuvchi sessiya.
+    Ulanish birinchi so'rovda olinadi (autobegin). Uzoq CPU ishidan oldin
+    (argon2 xeshlash, katta javobni serializatsiya qilish) release()
+    chaqiriladi: o'qish tranzaksiyasi yakunlanib, ulanish hovuzga qaytadi.
+    Har bir so'rovdan keyin emas - aks holda pre-ping bilan round-trip'lar
+    ikki baravar ko'payadi va bitta handler'ning o'qishlari turli
+    snapshot'larga bo'linib ketadi.
+    """
+
+    sync_session_class = RequestSession
+
+    async def release(self) -> None:
+        """O'qish tranzaksiyasini yakunlab, ulanishni hovuzga qaytaradi."""
+        sync_session = self.sync_session
+        if not sync_session.in_transaction() or sync_session.info.get("has_writes"):
+            return
+        if sync_session.new or sync_session.dirty or sync_session.deleted:
+            return
+        # expire_on_commit=False: yuklangan obyektlar ishlatilishda davom etadi
+        await self.commit()
 
-engine = create_async_engine(settings.DATABASE_URL, echo=True)
 
 SessionLocal = sessionmaker(
     bind=engine,
-    class_=AsyncSession,
+    class_=RequestAsyncSession,
     autocommit=False,
     autoflush=False,
     expire_on_commit=False,
 )
 
-async def get_db():
-    async with SessionLocal() as session:
+ReplicaSessionLocal = (
+    sessionmaker(
+        bind=replica_engine,
+        class_=RequestAsyncSession,
+        autocommit=False,
+        autoflush=False,
+        expire_on_commit=False,
+    )
+    if replica_engine is not None
+    else None
+)
+
+
+def _open_session(
+    request: Optional[Request], maker=SessionLocal, timeout: Optional[int] = None
+) -> AsyncSession:
+    session = maker()
+    session.info["request"] = request
+    if timeout is not None and timeout != settings.DB_STATEMENT_TIMEOUT_MS:
+        session.info["statement_timeout"] = timeout
+    return session
+
+
+@lru_cache
+def db_route_class(route_class: str):
+    """
+    Route sinfini (read, write, batch) so'rov holatiga yozuvchi dependency.
+    Endpoint'ning dependencies=[...] ro'yxatida beriladi, shuning uchun
+    get_db (auth dependency'lari ham ishlatadigan o'sha bitta sessiya) uni
+    ochilishidan oldin o'qiydi.
+    """
+
+    async def _set_route_class(request: Request) -> None:
+        request.state.db_route_class = route_class
+
+    return _set_route_class
+
+
+async def get_db(request: Request):
+    """
+    Primary sessiyasi. statement_timeout so'rovning route sinfidan olinadi
+    (db_route_class; berilmagan bo'lsa - write).
+    """
+    route_class = getattr(request.state, "db_route_class", "write")
+    timeout = settings.DB_STATEMENT_TIMEOUTS.get(route_class)
+    async with _open_session(request, timeout=timeout) as session:
         yield session
+
+
+async def get_read_db(request: Request):
+    """
+    Faqat o'qish uchun sessiya (GET handlerlar uchun).
+    Replika sozlangan bo'lsa unga ulanadi. Mijoz yaqinda yozish amalini
+    bajargan bo'lsa (imzolangan primary_until cookie'si, READ_YOUR_WRITES_SECONDS),
+    primary ishlatiladi - qaysi worker yozganidan qat'i nazar.
+    """
+    timeout = settings.DB_STATEMENT_TIMEOUTS.get("read")
+    maker = SessionLocal
+    if ReplicaSessionLocal is not None and not is_primary_pinned(request):
+        maker = ReplicaSessionLocal
+    async with _open_session(request, maker, timeout) as session:
+        yield session
+
+
+def get_pool_stats() -> dict:
+    stats = {"primary": engine.sync_engine.pool.telemetry()}
+    if replica_engine is not None:
+        stats["replica"] = replica_engine.sync_engine.pool.telemetry()
+    return stats
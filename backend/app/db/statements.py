@@ -0,0 +1,29 @@
+from functools import wraps
+from typing import Callable, Dict
+
+from sqlalchemy.sql import Executable
+
+# Ro'yxatdan o'tgan barcha keshlangan so'rovlar (benchmark va diagnostika uchun)
+registry: Dict[str, Callable[[], Executable]] = {}
+
+
+def cached_statement(builder: Callable[[], Executable]) -> Callable[[], Executable]:
+    """
+    So'rovni bir marta quradi va keyingi chaqiruvlarda o'sha obyektni qaytaradi.
+
+    Qiymatlar bindparam() orqali beriladi, shuning uchun statement obyekti
+    o'zgarmaydi: SQLAlchemy uning cache key'ini memoizatsiya qiladi va
+    kompilyatsiya keshidan (query_cache_size) foydalanadi, asyncpg esa
+    bir xil SQL matni uchun tayyorlangan (prepared) statement'ni qayta ishlatadi.
+    """
+    statement = None
+
+    @wraps(builder)
+    def get() -> Executable:
+        nonlocal statement
+        if statement is None:
+            statement = builder()
+        return statement
+
+    registry[f"{builder.__module__}.{builder.__qualname__}"] = builder
+    return get
@@ -1,16 +1,30 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
 from app.api.v1.api import api_router
+from app.db.pagination import NEXT_CURSOR_HEADER, TOTAL_COUNT_HEADER
+from app.db.query_log import QueryContextMiddleware
+from app.db.routing import PrimaryPinMiddleware
+from app.db.invalidation import invalidation_bus
 
 # Import base to register all models
 from app.db import base
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await invalidation_bus.start()
+    yield
+    await invalidation_bus.stop()
+
+
 app = FastAPI(
     title=settings.PROJECT_NAME,
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
     root_path="/rest",
+    lifespan=lifespan,
 )
 
 # Set all CORS enabled origins
@@ -20,8 +34,12 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, TOTAL_COUNT_HEADER],
 )
 
+app.add_middleware(QueryContextMiddleware)
+app.add_middleware(PrimaryPinMiddleware)
+
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
 
@@ -1,9 +1,10 @@
-from sqlalchemy import ForeignKey
+from sqlalchemy import ForeignKey, Index, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.db.base_class import Base
+from app.db.search import SearchKeyMixin
 
 
-class Department(Base):
+class Department(SearchKeyMixin, Base):
     """
     Kafedra modeli.
     Fakultet tarkibidagi kafedralarni ifodalaydi.
@@ -11,6 +12,18 @@ class Department(Base):
     """
 
     __tablename__ = "departments"
+    __table_args__ = (
+        Index(
+            "ix_departments_search_key_trgm",
+            "search_key",
+            postgresql_using="gin",
+            postgresql_ops={"search_key": "gin_trgm_ops"},
+        ),
+        Index(
+            "ix_departments_search_key_prefix",
+            text('search_key COLLATE "C"'),
+        ),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
     faculty_id: Mapped[int] = mapped_column(ForeignKey("faculties.id"), index=True)
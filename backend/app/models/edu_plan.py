@@ -1,4 +1,4 @@
-from sqlalchemy import String, Integer, ForeignKey, Boolean
+from sqlalchemy import String, Integer, ForeignKey, Boolean, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.db.base_class import Base
 
@@ -11,6 +11,8 @@ class EduPlan(Base):
     """
 
     __tablename__ = "edu_plans"
+    # Keyset sahifalash (filtr + tartib) uchun
+    __table_args__ = (Index("ix_edu_plans_name_id", "name", "id"),)
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
     name: Mapped[str] = mapped_column(
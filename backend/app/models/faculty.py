@@ -1,14 +1,28 @@
+from sqlalchemy import Index, text
 from sqlalchemy.orm import Mapped, mapped_column
 from app.db.base_class import Base
+from app.db.search import SearchKeyMixin
 
 
-class Faculty(Base):
+class Faculty(SearchKeyMixin, Base):
     """
     Fakultet modeli.
     Universitetdagi fakultetlarni ifodalaydi.
     """
 
     __tablename__ = "faculties"
+    __table_args__ = (
+        Index(
+            "ix_faculties_search_key_trgm",
+            "search_key",
+            postgresql_using="gin",
+            postgresql_ops={"search_key": "gin_trgm_ops"},
+        ),
+        Index(
+            "ix_faculties_search_key_prefix",
+            text('search_key COLLATE "C"'),
+        ),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
     name: Mapped[str] = mapped_column(unique=True, index=True)
@@ -1,8 +1,9 @@
 from typing import List, Optional
 import enum
-from sqlalchemy import String, Integer, ForeignKey, Boolean, Enum as SqEnum
+from sqlalchemy import String, Integer, ForeignKey, Boolean, Enum as SqEnum, Index, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.db.base_class import Base
+from app.db.search import SearchKeyMixin
 
 
 class EducationShape(str, enum.Enum):
@@ -12,7 +13,7 @@ class EducationShape(str, enum.Enum):
     MASOFAVIY = "masofaviy"
 
 
-class Group(Base):
+class Group(SearchKeyMixin, Base):
     """
     Guruh modeli.
     Talabalar guruhini ifodalaydi.
@@ -20,6 +21,18 @@ class Group(Base):
     """
 
     __tablename__ = "groups"
+    __table_args__ = (
+        Index(
+            "ix_groups_search_key_trgm",
+            "search_key",
+            postgresql_using="gin",
+            postgresql_ops={"search_key": "gin_trgm_ops"},
+        ),
+        Index(
+            "ix_groups_search_key_prefix",
+            text('search_key COLLATE "C"'),
+        ),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
     name: Mapped[str] = mapped_column(String, unique=True, index=True)
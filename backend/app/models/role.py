@@ -30,6 +30,8 @@ class Permission(Base):
         String, unique=True, index=True
     )  # e.g. "faculty:create"
     description: Mapped[str] = mapped_column(String, nullable=True)
+    # Rol maskalaridagi bit pozitsiyasi (permission_registry); berilgandan keyin o'zgarmaydi
+    bit: Mapped[int | None] = mapped_column(unique=True, nullable=True)
 
 
 class Role(Base):
@@ -0,0 +1,22 @@
+from datetime import datetime
+
+from sqlalchemy import DateTime, String, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base_class import Base
+
+
+class SeedState(Base):
+    """
+    Boshlang'ich ma'lumotlar (seed) holati.
+    Har bir seed turi uchun oxirgi marta yozilgan ma'lumotlar fingerprint'ini saqlaydi
+    (masalan: 'rbac' -> ROLE_PERMISSIONS sha256), o'zgarmagan bo'lsa seed o'tkazib yuboriladi.
+    """
+
+    __tablename__ = "seed_state"
+
+    key: Mapped[str] = mapped_column(String, primary_key=True)
+    fingerprint: Mapped[str] = mapped_column(String)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
@@ -1,7 +1,8 @@
 from enum import Enum
-from sqlalchemy import ForeignKey, String, Enum as SaEnum
+from sqlalchemy import ForeignKey, String, Enum as SaEnum, Index, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.db.base_class import Base
+from app.db.search import SearchKeyMixin
 
 
 class EducationType(str, Enum):
@@ -9,13 +10,27 @@ class EducationType(str, Enum):
     MASTER = "Magistr"
 
 
-class Speciality(Base):
+class Speciality(SearchKeyMixin, Base):
     """
     Yo'nalish (Mutaxassislik) modeli.
     Universitetdagi ta'lim yo'nalishlarini ifodalaydi.
     """
 
     __tablename__ = "specialities"
+    # Keyset sahifalash (filtr + tartib) uchun
+    __table_args__ = (
+        Index("ix_specialities_department_id_id", "department_id", "id"),
+        Index(
+            "ix_specialities_search_key_trgm",
+            "search_key",
+            postgresql_using="gin",
+            postgresql_ops={"search_key": "gin_trgm_ops"},
+        ),
+        Index(
+            "ix_specialities_search_key_prefix",
+            text('search_key COLLATE "C"'),
+        ),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
     name: Mapped[str] = mapped_column(String, unique=True, index=True)
@@ -1,7 +1,8 @@
 from typing import List
-from sqlalchemy import String, Integer, ForeignKey
+from sqlalchemy import String, Integer, ForeignKey, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.db.base_class import Base
+from app.db.search import SearchKeyMixin
 from app.models.group import Group
 
 
@@ -12,7 +13,7 @@ class StreamGroup(Base):
     group_id: Mapped[int] = mapped_column(ForeignKey("groups.id"), primary_key=True)
 
 
-class Stream(Base):
+class Stream(SearchKeyMixin, Base):
     """
     Oqim (Stream) modeli.
     Bir nechta guruhlarni birlashtiruvchi oqim (potok).
@@ -20,6 +21,16 @@ class Stream(Base):
     """
 
     __tablename__ = "streams"
+    # Keyset sahifalash (filtr + tartib) uchun
+    __table_args__ = (
+        Index("ix_streams_name_id", "name", "id"),
+        Index(
+            "ix_streams_search_key_trgm",
+            "search_key",
+            postgresql_using="gin",
+            postgresql_ops={"search_key": "gin_trgm_ops"},
+        ),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
     name: Mapped[str] = mapped_column(String, index=True)
@@ -1,7 +1,8 @@
-from sqlalchemy import String, ForeignKey, Integer
+from sqlalchemy import String, ForeignKey, Integer, Index, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.dialects.postgresql import ARRAY
 from app.db.base_class import Base
+from app.db.search import SearchKeyMixin
 import enum
 
 
@@ -10,7 +11,7 @@ class SemesterType(str, enum.Enum):
     BAHORGI = "bahorgi"
 
 
-class Subject(Base):
+class Subject(SearchKeyMixin, Base):
     """
     Fan (Subject) modeli.
     O'quv rejasidagi fanlarni ifodalaydi.
@@ -18,6 +19,20 @@ class Subject(Base):
     """
 
     __tablename__ = "subjects"
+    # Keyset sahifalash (filtr + tartib) uchun
+    __table_args__ = (
+        Index("ix_subjects_name_id", "name", "id"),
+        Index(
+            "ix_subjects_search_key_trgm",
+            "search_key",
+            postgresql_using="gin",
+            postgresql_ops={"search_key": "gin_trgm_ops"},
+        ),
+        Index(
+            "ix_subjects_search_key_prefix",
+            text('search_key COLLATE "C"'),
+        ),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
     name: Mapped[str] = mapped_column(String, index=True)  # Subject name
@@ -1,7 +1,9 @@
 from typing import List
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import Table, Column, ForeignKey
+from sqlalchemy import Table, Column, ForeignKey, String, Index, text
+from sqlalchemy.dialects.postgresql import ARRAY
 from app.db.base_class import Base
+from app.db.search import SearchKeyMixin
 
 # Association Table for User-Roles
 user_roles = Table(
@@ -12,7 +14,7 @@ user_roles = Table(
 )
 
 
-class User(Base):
+class User(SearchKeyMixin, Base):
     """
     Foydalanuvchi modeli.
     Tizimdagi barcha foydalanuvchilar (admin, o'qituvchi, talaba) uchun umumiy model.
@@ -20,6 +22,24 @@ class User(Base):
     """
 
     __tablename__ = "users"
+    __table_args__ = (
+        Index(
+            "ix_users_search_key_trgm",
+            "search_key",
+            postgresql_using="gin",
+            postgresql_ops={"search_key": "gin_trgm_ops"},
+        ),
+        Index(
+            "ix_users_search_key_prefix",
+            text('search_key COLLATE "C"'),
+        ),
+        # /users/directory filtrlari va saralashlari
+        Index("ix_users_search_key_id", "search_key", "id"),
+        Index("ix_users_email_prefix", text("lower(email) text_pattern_ops")),
+        Index("ix_users_phone_number", "phone_number"),
+        Index("ix_users_auth_roles", "auth_roles", postgresql_using="gin"),
+        Index("ix_users_department_id_id", "department_id", "id"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
     email: Mapped[str] = mapped_column(unique=True, index=True)
@@ -27,6 +47,14 @@ class User(Base):
     hashed_password: Mapped[str] = mapped_column()
     is_active: Mapped[bool] = mapped_column(default=True)
     is_superuser: Mapped[bool] = mapped_column(default=False)
+    # Oshirilsa, foydalanuvchining avval berilgan barcha tokenlari bekor bo'ladi
+    token_version: Mapped[int] = mapped_column(default=0, server_default="0")
+    # Rollar nomlari (roles munosabatining nusxasi): login va token claim'lari
+    # user_roles/roles jadvallariga JOIN qilmasdan olinadi.
+    # Rollar servislar orqali o'zgartirilganda birga yangilanadi.
+    auth_roles: Mapped[list[str]] = mapped_column(
+        ARRAY(String), default=list, server_default="{}"
+    )
     # role column removed, using relationship below
 
     # New fields
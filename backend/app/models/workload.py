@@ -1,6 +1,6 @@
 from enum import Enum
 from typing import Optional
-from sqlalchemy import Integer, String, ForeignKey, Enum as SaEnum
+from sqlalchemy import Integer, String, ForeignKey, Enum as SaEnum, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.db.base_class import Base
 
@@ -19,6 +19,8 @@ class Workload(Base):
     """
 
     __tablename__ = "workloads"
+    # Keyset sahifalash (filtr + tartib) uchun
+    __table_args__ = (Index("ix_workloads_edu_plan_id_id", "edu_plan_id", "id"),)
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
 
@@ -0,0 +1,10 @@
+from typing import List
+
+from pydantic import BaseModel, Field
+
+from app.core.config import settings
+
+
+# Bulk fetch-by-IDs (GET /<resource>/by-ids?ids=1,2,3 yoki POST)
+class IdList(BaseModel):
+    ids: List[int] = Field(..., min_length=1, max_length=settings.BULK_FETCH_MAX_IDS)
@@ -41,4 +41,5 @@ class Group(GroupBase):
 
 class GroupList(BaseModel):
     items: List[Group]
-    total: int
+    total: Optional[int] = None  # include_total=false yoki count=none bo'lsa null
+    next_cursor: Optional[str] = None  # keyingi sahifa (keyset) uchun
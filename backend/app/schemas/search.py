@@ -0,0 +1,15 @@
+from typing import Dict, List, Optional
+
+from pydantic import BaseModel
+
+
+class SearchHit(BaseModel):
+    id: int
+    # users.name NULL bo'lishi mumkin
+    name: Optional[str] = None
+
+
+# GET /search: tur (faculties, groups, users, ...) -> eng mos N ta natija
+class SearchResults(BaseModel):
+    query: str
+    results: Dict[str, List[SearchHit]]
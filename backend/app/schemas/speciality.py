@@ -29,6 +29,7 @@ class Speciality(SpecialityBase):
 
 class SpecialityList(BaseModel):
     items: List[Speciality]
-    total: int
+    total: Optional[int] = None  # include_total=false yoki count=none bo'lsa null
     page: int
     size: int
+    next_cursor: Optional[str] = None  # keyingi sahifa (keyset) uchun
@@ -23,4 +23,5 @@ class Stream(StreamBase):
 
 class StreamList(BaseModel):
     items: List[Stream]
-    total: int
+    total: Optional[int] = None  # include_total=false yoki count=none bo'lsa null
+    next_cursor: Optional[str] = None  # keyingi sahifa (keyset) uchun
@@ -29,4 +29,5 @@ class Subject(SubjectBase):
 
 class SubjectList(BaseModel):
     items: List[Subject]
-    total: int
+    total: Optional[int] = None  # include_total=false yoki count=none bo'lsa null
+    next_cursor: Optional[str] = None  # keyingi sahifa (keyset) uchun
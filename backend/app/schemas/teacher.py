@@ -21,4 +21,5 @@ class Teacher(TeacherBase):
 
 class TeacherList(BaseModel):
     items: List[Teacher]
-    total: int
+    total: Optional[int] = None  # include_total=false yoki count=none bo'lsa null
+    next_cursor: Optional[str] = None  # keyingi sahifa (keyset) uchun
@@ -1,9 +1,19 @@
-from typing import Optional
+from typing import List, Optional
 from pydantic import BaseModel
 
 class Token(BaseModel):
     access_token: str
     token_type: str
+    refresh_token: Optional[str] = None
+    expires_in: Optional[int] = None  # access token muddati, soniyalarda
+    # Token ichida faqat ixcham "pm" bitmask bor; frontend ro'yxatni shu yerdan oladi
+    permissions: List[str] = []
 
 class TokenPayload(BaseModel):
     sub: Optional[str] = None
+
+class RefreshTokenRequest(BaseModel):
+    refresh_token: str
+
+class LogoutRequest(BaseModel):
+    refresh_token: Optional[str] = None
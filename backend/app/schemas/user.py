@@ -1,5 +1,5 @@
 from typing import Optional, List
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, Field
 from app.schemas.role import Role
 
 
@@ -51,3 +51,42 @@ class User(UserBase):
 
     class Config:
         from_attributes = True
+
+
+# User directory (GET /users/directory): roles are names only (users.auth_roles)
+class UserDirectoryItem(BaseModel):
+    id: int
+    name: Optional[str] = None
+    email: str
+    username: Optional[str] = None
+    jshshir: Optional[str] = None
+    phone_number: Optional[str] = None
+    department_id: Optional[int] = None
+    is_active: bool
+    roles: List[str] = Field(default_factory=list, validation_alias="auth_roles")
+
+    class Config:
+        from_attributes = True
+
+
+class UserDirectory(BaseModel):
+    items: List[UserDirectoryItem]
+    total: Optional[int] = None  # include_total=false yoki count=none bo'lsa null
+    next_cursor: Optional[str] = None  # keyingi sahifa (keyset) uchun
+
+
+# Bulk provisioning (POST /users/bulk) report
+class UserBulkResult(BaseModel):
+    row: int  # 1-based line number in the uploaded file (CSV header excluded)
+    status: str  # created / skipped / error
+    id: Optional[int] = None
+    email: Optional[str] = None
+    detail: Optional[str] = None
+
+
+class UserBulkReport(BaseModel):
+    total: int
+    created: int
+    skipped: int
+    failed: int
+    items: List[UserBulkResult]
@@ -47,6 +47,14 @@ class WorkloadBatchCreate(BaseModel):
     items: List[BatchWorkloadItem]
 
 
+# POST /workloads/batch natijasi: yaratilgan qatorlar, ichki obyektlarsiz
+class WorkloadBatchResult(WorkloadBase):
+    id: int
+
+    class Config:
+        from_attributes = True
+
+
 class WorkloadGroupUpdate(BaseModel):
     subject_id: int  # The ID to search for (original)
     new_subject_id: Optional[int] = None  # If changing the subject
@@ -69,4 +77,5 @@ class Workload(WorkloadBase):
 
 class WorkloadList(BaseModel):
     items: List[Workload]
-    total: int
+    total: Optional[int] = None  # include_total=false yoki count=none bo'lsa null
+    next_cursor: Optional[str] = None  # keyingi sahifa (keyset) uchun
@@ -1,19 +1,37 @@
-from datetime import timedelta
-from typing import Optional
-from typing import Any, Optional
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
 
-from fastapi import HTTPException
+from fastapi import HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
+from sqlalchemy import bindparam, delete, func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core import jwt
-from app.core import security
+from app.core.permission_registry import encode_mask, permission_registry
 from app.core.config import settings
+from app.db.invalidation import invalidation_bus
+from app.db.statements import cached_statement
+from app.models.revoked_token import RevokedToken
 from app.models.user import User
 from app.schemas.token import Token
+from app.services.token_service import token_service
 from app.services.user_service import user_service
 
 
+@cached_statement
+def _token_subject():
+    # Token claim'lari uchun foydalanuvchi va rollari (auth_roles) - bitta qator
+    return select(
+        User.id,
+        User.name,
+        User.is_active,
+        User.is_superuser,
+        User.token_version,
+        User.auth_roles,
+    ).where(User.id == bindparam("id"))
+
+
 class AuthService:
     """
     Autentifikatsiya xizmati.
@@ -25,18 +43,16 @@ class AuthService:
     ) -> Token:
         """
         Foydalanuvchini autentifikatsiya qilish.
-        1. JSHSHIR bo'yicha qidiradi.
-        2. Topilmasa Email bo'yicha qidiradi.
-        3. Parolni tekshiradi.
-        4. Token (JWT) yaratadi va qaytaradi.
+        1. JSHSHIR, email yoki username bo'yicha bitta so'rov bilan qidiradi
+           (parol hash'i va rollar nusxasi - auth_roles bilan birga).
+        2. Parolni tekshiradi.
+        3. Token (JWT) yaratadi va qaytaradi.
         """
-        # Try to authenticate by JSHSHIR first (as requested by user)
-        user = await user_service.get_by_jshshir(db, form_data.username)
-        # If not found, fall back to email (for legacy or admin users without JSHSHIR)
-        if not user:
-            user = await user_service.get_by_email(db, form_data.username)
+        user = await user_service.get_login_subject(db, form_data.username)
+        # argon2 tekshiruvi vaqtida ulanish hovuzda tursin
+        await db.release()
 
-        if not user or not user_service.verify_password(
+        if not user or not await user_service.verify_password(
             form_data.password, user.hashed_password
         ):
             raise HTTPException(status_code=400, detail="Incorrect email or password")
@@ -44,45 +60,120 @@ class AuthService:
         if not user.is_active:
             raise HTTPException(status_code=400, detail="Inactive user")
 
+        refresh_token = token_service.issue(db, user.id)
+        response = await self._token_response(
+            db,
+            user_id=user.id,
+            name=user.name,
+            roles_list=list(user.auth_roles),
+            is_superuser=user.is_superuser,
+            token_version=user.token_version,
+            refresh_token=refresh_token,
+        )
+        await db.commit()
+        return response
+
+    async def refresh(self, db: AsyncSession, refresh_token: str) -> Token:
+        """
+        Refresh token orqali yangi access token berish.
+        Parol (argon2) tekshirilmaydi: bitta indeksli qidiruv, token almashtirish
+        va foydalanuvchi claim'lari uchun bitta so'rov.
+        """
+        user_id, new_refresh_token = await token_service.rotate(db, refresh_token)
+
+        user = (await db.execute(_token_subject(), {"id": user_id})).first()
+        if user is None or not user.is_active:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED, detail="Inactive user"
+            )
+
+        response = await self._token_response(
+            db,
+            user_id=user_id,
+            name=user.name,
+            roles_list=list(user.auth_roles),
+            is_superuser=user.is_superuser,
+            token_version=user.token_version,
+            refresh_token=new_refresh_token,
+        )
+        await db.commit()
+        return response
+
+    async def logout(
+        self, db: AsyncSession, payload: dict, refresh_token: Optional[str] = None
+    ) -> None:
+        """
+        Joriy access tokenni (jti) bekor qilingan tokenlar ro'yxatiga qo'shadi
+        va berilgan bo'lsa, refresh token oilasini yopadi.
+        """
+        jti = payload.get("jti")
+        if jti:
+            await db.execute(
+                pg_insert(RevokedToken)
+                .values(
+                    jti=jti,
+                    expires_at=datetime.fromtimestamp(payload["exp"], tz=timezone.utc),
+                )
+                .on_conflict_do_nothing(index_elements=["jti"])
+            )
+            # Muddati o'tgan yozuvlar endi kerak emas
+            await db.execute(
+                delete(RevokedToken)
+                .where(RevokedToken.expires_at < func.now())
+                .execution_options(synchronize_session=False)
+            )
+            await invalidation_bus.publish(
+                db, "revoked_tokens", "create", data={"jti": jti}
+            )
+        if refresh_token:
+            await token_service.revoke_by_token(db, refresh_token)
+        await db.commit()
+
+    async def _token_response(
+        self,
+        db: AsyncSession,
+        *,
+        user_id: int,
+        name: Optional[str],
+        roles_list: List[str],
+        is_superuser: bool,
+        token_version: int,
+        refresh_token: str,
+    ) -> dict:
         access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
 
-        # Get permissions based on roles from Database
-        # User object already has roles loaded via selectin in get_by_* methods if we did it right.
-        # However, get_by_email/jshshir in UserService currently returns simple scalars without loading options?
-        # Actually lazy="selectin" in User model handles this automatically on access if session is open.
-
-        # NOTE: UserService methods return scalars().first(). If lazy="selectin" is set on relationship,
-        # accessing user.roles will trigger a query (if not async compatible) or should be already loaded.
-        # Since we are using AsyncSession and selectin, let's explicitely ensure it is loaded or rely on model definition.
-        # For now, let's assume valid loading.
-
-        permissions = set()  # Use set to deduplicate
-        roles_list = []
-
-        for role in user.roles:
-            roles_list.append(role.name)
-            for perm in role.permissions:
-                permissions.add(perm.slug)
+        # Ruxsatnomalar rollar maskalaridan (permission_registry) olinadi -
+        # PermissionChecker ham aynan shu maskalarni tekshiradi
+        registry = await permission_registry.ensure_loaded(db)
+        permission_mask = registry.mask_for_roles(roles_list)
+        permissions = registry.slugs(permission_mask)
 
         # If superuser, they essentially have all permissions.
 
         additional_claims = {
-            "id": user.id,
+            "id": user_id,
             "role": (
                 roles_list[0] if roles_list else "student"
             ),  # Legacy support for single role field in token
             "roles": roles_list,  # New field for multi-role
-            "name": user.name,
-            "permissions": list(permissions),
+            "name": name,
+            # Stateless avtorizatsiya uchun: ixcham ruxsatnomalar bitmask'i,
+            # superuser bayrog'i va token versiyasi (bekor qilish uchun)
+            "pm": encode_mask(permission_mask),
+            "su": is_superuser,
+            "tv": token_version,
         }
 
         return {
             "access_token": jwt.create_access_token(
-                subject=str(user.id),
+                subject=str(user_id),
                 expires_delta=access_token_expires,
                 additional_claims=additional_claims,
             ),
             "token_type": "bearer",
+            "refresh_token": refresh_token,
+            "expires_in": settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+            "permissions": sorted(permissions),
         }
 
 
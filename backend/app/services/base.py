@@ -0,0 +1,39 @@
+from typing import Any, List, Sequence, Tuple, Type
+
+from sqlalchemy import bindparam, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+class BulkFetchMixin:
+    """
+    Servislar uchun umumiy "ID'lar bo'yicha olish" (get_many).
+    Bitta IN (...) so'rovi, natija so'ralgan tartibda; topilmagan ID'lar
+    tashlab ketiladi, takrorlanganlari bir marta qaytariladi.
+
+    Servis `model` va (javob sxemasi ichki munosabatlarni talab qilsa)
+    `bulk_options` (masalan selectinload(Stream.groups)) ni belgilaydi.
+    """
+
+    model: Type[Any]
+    bulk_options: Tuple[Any, ...] = ()
+
+    @classmethod
+    def _by_ids_statement(cls):
+        # Har bir servis klassi uchun bir marta quriladi (cached_statement kabi)
+        stmt = cls.__dict__.get("_by_ids_stmt")
+        if stmt is None:
+            stmt = (
+                select(cls.model)
+                .where(cls.model.id.in_(bindparam("ids", expanding=True)))
+                .options(*cls.bulk_options)
+            )
+            cls._by_ids_stmt = stmt
+        return stmt
+
+    async def get_many(self, db: AsyncSession, ids: Sequence[int]) -> List[Any]:
+        ids = list(dict.fromkeys(ids))
+        if not ids:
+            return []
+        result = await db.execute(self._by_ids_statement(), {"ids": ids})
+        found = {obj.id: obj for obj in result.scalars().all()}
+        return [found[id] for id in ids if id in found]
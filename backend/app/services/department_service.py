@@ -1,44 +1,60 @@
 from typing import List, Optional
-from sqlalchemy import select
+from sqlalchemy import select, bindparam
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException
 
+from app.db.statements import cached_statement
+from app.db.invalidation import invalidation_bus
+from app.db.pagination import paginate
+from app.db.loader import get_loader
+from app.services.base import BulkFetchMixin
 from app.models.department import Department
 from app.models.faculty import Faculty
 from app.schemas.department import DepartmentCreate, DepartmentUpdate
 
 
-class DepartmentService:
+@cached_statement
+def _department_by_name():
+    return select(Department).where(Department.name == bindparam("name"))
+
+
+_SORTS = {"id": (Department.id,), "name": (Department.name, Department.id)}
+
+
+class DepartmentService(BulkFetchMixin):
     """
     Kafedra servisi.
     Kafedralar bilan bog'liq barcha CRUD amallarini bajaradi.
     """
 
+    model = Department
+
     async def get_multi(
-        self, db: AsyncSession, skip: int = 0, limit: int = 100
-    ) -> List[Department]:
+        self,
+        db: AsyncSession,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        sort: str = "id",
+    ) -> tuple[List[Department], Optional[str]]:
         """
         Barcha kafedralarni olish (sahifalash bilan).
         """
-        result = await db.execute(select(Department).offset(skip).limit(limit))
-        return result.scalars().all()
+        return await paginate(db, select(Department), _SORTS, sort, cursor, skip, limit)
 
     async def get(self, db: AsyncSession, id: int) -> Optional[Department]:
         result = await db.execute(select(Department).where(Department.id == id))
         return result.scalars().first()
 
     async def get_by_name(self, db: AsyncSession, name: str) -> Optional[Department]:
-        result = await db.execute(select(Department).where(Department.name == name))
+        result = await db.execute(_department_by_name(), {"name": name})
         return result.scalars().first()
 
     async def create(
         self, db: AsyncSession, department_in: DepartmentCreate
     ) -> Department:
         # Check faculty existence
-        faculty_result = await db.execute(
-            select(Faculty).where(Faculty.id == department_in.faculty_id)
-        )
-        if not faculty_result.scalars().first():
+        if not await get_loader(db).load(Faculty, department_in.faculty_id):
             raise HTTPException(status_code=400, detail="Faculty ID not found")
 
         # Check uniqueness
@@ -53,6 +69,7 @@ class DepartmentService:
             faculty_id=department_in.faculty_id,
         )
         db.add(department)
+        await invalidation_bus.publish(db, "departments", "create")
         await db.commit()
         await db.refresh(department)
         return department
@@ -61,10 +78,7 @@ class DepartmentService:
         self, db: AsyncSession, *, db_obj: Department, obj_in: DepartmentUpdate
     ) -> Department:
         if obj_in.faculty_id is not None:
-            faculty_result = await db.execute(
-                select(Faculty).where(Faculty.id == obj_in.faculty_id)
-            )
-            if not faculty_result.scalars().first():
+            if not await get_loader(db).load(Faculty, obj_in.faculty_id):
                 raise HTTPException(status_code=400, detail="Faculty ID not found")
 
         if obj_in.name and obj_in.name != db_obj.name:
@@ -78,6 +92,7 @@ class DepartmentService:
             setattr(db_obj, field, value)
 
         db.add(db_obj)
+        await invalidation_bus.publish(db, "departments", "update", db_obj.id)
         await db.commit()
         await db.refresh(db_obj)
         return db_obj
@@ -88,6 +103,7 @@ class DepartmentService:
             raise HTTPException(status_code=404, detail="Department not found")
 
         await db.delete(department)
+        await invalidation_bus.publish(db, "departments", "delete", department.id)
         await db.commit()
         return department
 
@@ -1,10 +1,15 @@
 from typing import List, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func
+from app.db.invalidation import invalidation_bus
+from app.db.pagination import CountStrategy, paginate_counted
 from app.models.edu_plan import EduPlan
 from app.schemas.edu_plan import EduPlanCreate, EduPlanUpdate
 
 
+_SORTS = {"id": (EduPlan.id,), "name": (EduPlan.name, EduPlan.id)}
+
+
 class EduPlanService:
     """
     O'quv rejasi servisi.
@@ -12,10 +17,17 @@ class EduPlanService:
     """
 
     async def get_multi(
-        self, db: AsyncSession, skip: int = 0, limit: int = 100
-    ) -> List[EduPlan]:
-        result = await db.execute(select(EduPlan).offset(skip).limit(limit))
-        return result.scalars().all()
+        self,
+        db: AsyncSession,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        sort: str = "id",
+        count: Optional[CountStrategy] = None,
+    ) -> tuple[List[EduPlan], Optional[int], Optional[str]]:
+        return await paginate_counted(
+            db, select(EduPlan), _SORTS, sort, cursor, skip, limit, count, "edu_plans", {}
+        )
 
     async def get_total_count(self, db: AsyncSession) -> int:
         result = await db.execute(select(func.count(EduPlan.id)))
@@ -32,6 +44,7 @@ class EduPlanService:
             is_active=obj_in.is_active,
         )
         db.add(db_obj)
+        await invalidation_bus.publish(db, "edu_plans", "create")
         await db.commit()
         await db.refresh(db_obj)
         return db_obj
@@ -46,6 +59,7 @@ class EduPlanService:
         if obj_in.is_active is not None:
             db_obj.is_active = obj_in.is_active
 
+        await invalidation_bus.publish(db, "edu_plans", "update", db_obj.id)
         await db.commit()
         await db.refresh(db_obj)
         return db_obj
@@ -54,6 +68,7 @@ class EduPlanService:
         obj = await self.get(db, id)
         if obj:
             await db.delete(obj)
+            await invalidation_bus.publish(db, "edu_plans", "delete", obj.id)
             await db.commit()
         return obj
 
@@ -1,30 +1,48 @@
 from typing import List, Optional
-from sqlalchemy import select
+from sqlalchemy import select, bindparam
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException
 
+from app.db.statements import cached_statement
+from app.db.invalidation import invalidation_bus
+from app.db.pagination import paginate
+from app.services.base import BulkFetchMixin
 from app.models.faculty import Faculty
 from app.schemas.faculty import FacultyCreate, FacultyUpdate
 
 
-class FacultyService:
+@cached_statement
+def _faculty_by_name():
+    return select(Faculty).where(Faculty.name == bindparam("name"))
+
+
+_SORTS = {"id": (Faculty.id,), "name": (Faculty.name, Faculty.id)}
+
+
+class FacultyService(BulkFetchMixin):
     """
     Fakultet servisi.
     Fakultetlar bo'yicha ma'lumotlarni boshqarish.
     """
 
+    model = Faculty
+
     async def get_multi(
-        self, db: AsyncSession, skip: int = 0, limit: int = 100
-    ) -> List[Faculty]:
-        result = await db.execute(select(Faculty).offset(skip).limit(limit))
-        return result.scalars().all()
+        self,
+        db: AsyncSession,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        sort: str = "id",
+    ) -> tuple[List[Faculty], Optional[str]]:
+        return await paginate(db, select(Faculty), _SORTS, sort, cursor, skip, limit)
 
     async def get(self, db: AsyncSession, id: int) -> Optional[Faculty]:
         result = await db.execute(select(Faculty).where(Faculty.id == id))
         return result.scalars().first()
 
     async def get_by_name(self, db: AsyncSession, name: str) -> Optional[Faculty]:
-        result = await db.execute(select(Faculty).where(Faculty.name == name))
+        result = await db.execute(_faculty_by_name(), {"name": name})
         return result.scalars().first()
 
     async def create(self, db: AsyncSession, faculty_in: FacultyCreate) -> Faculty:
@@ -36,6 +54,7 @@ class FacultyService:
 
         faculty = Faculty(name=faculty_in.name, description=faculty_in.description)
         db.add(faculty)
+        await invalidation_bus.publish(db, "faculties", "create")
         await db.commit()
         await db.refresh(faculty)
         return faculty
@@ -55,6 +74,7 @@ class FacultyService:
             setattr(db_obj, field, value)
 
         db.add(db_obj)
+        await invalidation_bus.publish(db, "faculties", "update", db_obj.id)
         await db.commit()
         await db.refresh(db_obj)
         return db_obj
@@ -65,6 +85,7 @@ class FacultyService:
             raise HTTPException(status_code=404, detail="Faculty not found")
 
         await db.delete(faculty)
+        await invalidation_bus.publish(db, "faculties", "delete", faculty.id)
         await db.commit()
         return faculty
 
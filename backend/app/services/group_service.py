@@ -1,36 +1,61 @@
 from typing import List, Optional
-from sqlalchemy import select, func
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.invalidation import invalidation_bus
+from app.db.pagination import CountStrategy, paginate_counted
+from app.db.search import SearchMode, search_clause, search_rank
+from app.services.base import BulkFetchMixin
 from app.models.group import Group
 from app.schemas.group import GroupCreate, GroupUpdate
 
 
-class GroupService:
+_SORTS = {"id": (Group.id,), "name": (Group.name, Group.id)}
+
+
+class GroupService(BulkFetchMixin):
     """
     Guruh servisi.
     Guruhlarni yaratish va qidirish funksiyalarini o'z ichiga oladi.
     """
 
+    model = Group
+
     async def get_multi(
         self,
         db: AsyncSession,
         skip: int = 0,
         limit: int = 100,
         search: Optional[str] = None,
-    ) -> tuple[List[Group], int]:
+        cursor: Optional[str] = None,
+        sort: str = "id",
+        count: Optional[CountStrategy] = None,
+        search_mode: SearchMode = SearchMode.contains,
+    ) -> tuple[List[Group], Optional[int], Optional[str]]:
         """
         Guruhlarni olish.
         Qidiruv (search) parametri orqali nom bo'yicha filtrlash imkoniyati mavjud.
         """
         query = select(Group)
+        rank = None
         if search:
-            query = query.where(Group.name.ilike(f"%{search}%"))
-
-        count_query = select(func.count()).select_from(query.subquery())
-        total = await db.scalar(count_query) or 0
+            query = query.where(search_clause(Group.search_key, search, search_mode))
+            if search_mode is SearchMode.ranked:
+                rank = search_rank(Group.search_key, search)
 
-        result = await db.execute(query.offset(skip).limit(limit))
-        return result.scalars().all(), total
+        items, total, next_cursor = await paginate_counted(
+            db,
+            query,
+            _SORTS,
+            sort,
+            cursor,
+            skip,
+            limit,
+            count,
+            "groups",
+            {"search": search, "search_mode": search_mode if search else None},
+            rank,
+        )
+        return items, total, next_cursor
 
     async def get(self, db: AsyncSession, id: int) -> Optional[Group]:
         result = await db.execute(select(Group).where(Group.id == id))
@@ -39,6 +64,7 @@ class GroupService:
     async def create(self, db: AsyncSession, obj_in: GroupCreate) -> Group:
         db_obj = Group(**obj_in.model_dump())
         db.add(db_obj)
+        await invalidation_bus.publish(db, "groups", "create")
         await db.commit()
         await db.refresh(db_obj)
         return db_obj
@@ -50,6 +76,7 @@ class GroupService:
         for field, value in update_data.items():
             setattr(db_obj, field, value)
         db.add(db_obj)
+        await invalidation_bus.publish(db, "groups", "update", db_obj.id)
         await db.commit()
         await db.refresh(db_obj)
         return db_obj
@@ -58,6 +85,7 @@ class GroupService:
         obj = await self.get(db, id)
         if obj:
             await db.delete(obj)
+            await invalidation_bus.publish(db, "groups", "delete", obj.id)
             await db.commit()
         return obj
 
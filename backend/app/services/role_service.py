@@ -1,13 +1,53 @@
 from typing import List, Optional
+from sqlalchemy import func, update
 from sqlalchemy.future import select
 from sqlalchemy.orm import selectinload
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException
 
+from app.db.invalidation import invalidation_bus
 from app.models.role import Role, Permission
+from app.models.user import User, user_roles
 from app.schemas.role import RoleCreate, RoleUpdate
 
 
+async def _revoke_role_tokens(db: AsyncSession, role_id: int) -> None:
+    """Rol egalari tokenlaridagi ruxsatnomalar eskiradi - versiyani oshiramiz."""
+    await db.execute(
+        update(User)
+        .where(
+            User.id.in_(
+                select(user_roles.c.user_id).where(user_roles.c.role_id == role_id)
+            )
+        )
+        .values(token_version=User.token_version + 1)
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def _sync_auth_roles(
+    db: AsyncSession, role_id: int, old_name: str, new_name: Optional[str]
+) -> None:
+    """
+    Rol nomi o'zgarsa yoki rol o'chirilsa, egalarining users.auth_roles
+    nusxasini ham yangilaydi (new_name=None - o'chirish).
+    """
+    if new_name is None:
+        value = func.array_remove(User.auth_roles, old_name)
+    else:
+        value = func.array_replace(User.auth_roles, old_name, new_name)
+    await db.execute(
+        update(User)
+        .where(
+            User.id.in_(
+                select(user_roles.c.user_id).where(user_roles.c.role_id == role_id)
+            )
+        )
+        .values(auth_roles=value)
+        .execution_options(synchronize_session=False)
+    )
+
+
 class RoleService:
     """
     Rol servisi.
@@ -55,12 +95,22 @@ class RoleService:
             db_role.permissions = perms
 
         db.add(db_role)
+        await invalidation_bus.publish(db, "roles", "create")
         await db.commit()
         await db.refresh(db_role)
         # Eager load for response
         return await self.get(db, db_role.id)
 
     async def update(self, db: AsyncSession, role: Role, role_in: RoleUpdate) -> Role:
+        """
+        Rolni yangilash. Egalarining tokenlari faqat nom yoki ruxsatnomalar
+        to'plami haqiqatan o'zgarganda bekor qilinadi (tavsifni tahrirlash
+        hech kimni tizimdan chiqarmaydi).
+        """
+        renamed = role_in.name != role.name
+        permissions_changed = False
+        if renamed:
+            await _sync_auth_roles(db, role.id, role.name, role_in.name)
         role.name = role_in.name
         role.description = role_in.description
 
@@ -72,9 +122,15 @@ class RoleService:
             stmt = select(Permission).where(Permission.id.in_(role_in.permissions))
             result = await db.execute(stmt)
             perms = result.scalars().all()
+            permissions_changed = {perm.id for perm in perms} != {
+                perm.id for perm in role.permissions
+            }
             role.permissions = perms
 
         db.add(role)
+        if renamed or permissions_changed:
+            await _revoke_role_tokens(db, role.id)
+        await invalidation_bus.publish(db, "roles", "update", role.id)
         await db.commit()
         await db.refresh(role)
         return await self.get(db, role.id)
@@ -83,7 +139,11 @@ class RoleService:
         role = await self.get(db, id)
         if not role:
             raise HTTPException(status_code=404, detail="Role not found")
+        # user_roles qatorlari CASCADE bilan o'chishidan oldin
+        await _revoke_role_tokens(db, role.id)
+        await _sync_auth_roles(db, role.id, role.name, None)
         await db.delete(role)
+        await invalidation_bus.publish(db, "roles", "delete", role.id)
         await db.commit()
         return role
 
@@ -0,0 +1,83 @@
+from typing import Any, Dict, List, Sequence, Tuple
+
+from sqlalchemy import func, literal, select, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.rbac import Permissions
+from app.db.search import (
+    SearchMode,
+    normalize_search_key,
+    prefix_clause,
+    search_clause,
+)
+from app.models.department import Department
+from app.models.faculty import Faculty
+from app.models.group import Group
+from app.models.speciality import Speciality
+from app.models.subject import Subject
+from app.models.user import User
+
+# Tur -> (model, o'qish ruxsatnomasi). Javobdagi tartib ham shu.
+# Har bir model SearchKeyMixin'dan (name + search_key) foydalanadi.
+SEARCH_TYPES: Dict[str, Tuple[Any, str]] = {
+    "faculties": (Faculty, Permissions.FACULTY_READ),
+    "departments": (Department, Permissions.DEPARTMENT_READ),
+    "specialities": (Speciality, Permissions.SPECIALITY_READ),
+    "groups": (Group, Permissions.GROUP_READ),
+    "subjects": (Subject, Permissions.SUBJECT_READ),
+    "users": (User, Permissions.USER_READ),
+}
+
+
+class SearchService:
+    """
+    Umumiy qidiruv servisi.
+    Bir nechta jadval bo'yicha nom qidiruvini bitta UNION ALL so'roviga
+    birlashtiradi: har bir tur o'z indeksidan eng mos N ta qatorni oladi.
+    """
+
+    def _branch(self, type_: str, search: str, limit: int, prefix: bool):
+        model, _ = SEARCH_TYPES[type_]
+        key = model.search_key
+        if prefix:
+            # (search_key COLLATE "C") indeksi: ham LIKE diapazoni, ham tartib,
+            # shuning uchun LIMIT birinchi N qatorda to'xtaydi
+            clause = prefix_clause(key, search)
+            order = (key.collate("C"), model.id)
+        else:
+            # trigram indeksi; qisqa (ya'ni aniqroq mos kelgan) nomlar oldin
+            clause = search_clause(key, search, SearchMode.contains)
+            order = (func.length(key), key, model.id)
+        return (
+            select(literal(type_).label("type"), model.id, model.name)
+            .where(clause)
+            .order_by(*order)
+            .limit(limit)
+        )
+
+    async def search(
+        self,
+        db: AsyncSession,
+        search: str,
+        types: Sequence[str],
+        limit: int = 5,
+        prefix: bool = True,
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Har bir tur bo'yicha eng mos `limit` ta natija ({id, name}).
+        prefix=True - nom boshidan (avtoto'ldirish), aks holda nom ichidan.
+        Qidiruv normallashtirilgan search_key bo'yicha (kirill/lotin, tutuq
+        belgisi variantlari farq qilmaydi).
+        """
+        results: Dict[str, List[Dict[str, Any]]] = {type_: [] for type_ in types}
+        if not types or not normalize_search_key(search):
+            return results
+        query = union_all(
+            *(self._branch(type_, search, limit, prefix) for type_ in types)
+        )
+        for row in (await db.execute(query)).all():
+            results[row.type].append({"id": row.id, "name": row.name})
+        return results
+
+
+search_service = SearchService()
@@ -1,19 +1,35 @@
 from typing import List, Optional
-from sqlalchemy import select
+from sqlalchemy import select, bindparam
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException
 
+from app.db.statements import cached_statement
+from app.db.invalidation import invalidation_bus
+from app.db.pagination import CountStrategy, paginate_counted
+from app.db.search import SearchMode, search_clause, search_rank
+from app.db.loader import get_loader
+from app.services.base import BulkFetchMixin
 from app.models.speciality import Speciality
 from app.models.department import Department
 from app.schemas.speciality import SpecialityCreate, SpecialityUpdate
 
 
-class SpecialityService:
+@cached_statement
+def _speciality_by_name():
+    return select(Speciality).where(Speciality.name == bindparam("name"))
+
+
+_SORTS = {"id": (Speciality.id,), "name": (Speciality.name, Speciality.id)}
+
+
+class SpecialityService(BulkFetchMixin):
     """
     Yo'nalish (Mutaxassislik) servisi.
     Yo'nalishlar bo'yicha qidiruv va filtrlash imkoniyatlari mavjud.
     """
 
+    model = Speciality
+
     async def get_multi(
         self,
         db: AsyncSession,
@@ -22,15 +38,22 @@ class SpecialityService:
         search: Optional[str] = None,
         department_id: Optional[int] = None,
         education_type: Optional[str] = None,
-    ) -> tuple[List[Speciality], int]:
+        cursor: Optional[str] = None,
+        sort: str = "id",
+        count: Optional[CountStrategy] = None,
+        search_mode: SearchMode = SearchMode.contains,
+    ) -> tuple[List[Speciality], Optional[int], Optional[str]]:
         """
         Yo'nalishlarni olish.
         Filtrlar: Qidiruv, Kafedra ID, Ta'lim turi.
         """
         query = select(Speciality)
 
+        rank = None
         if search:
-            query = query.where(Speciality.name.ilike(f"%{search}%"))
+            query = query.where(search_clause(Speciality.search_key, search, search_mode))
+            if search_mode is SearchMode.ranked:
+                rank = search_rank(Speciality.search_key, search)
 
         if department_id:
             query = query.where(Speciality.department_id == department_id)
@@ -38,34 +61,40 @@ class SpecialityService:
         if education_type:
             query = query.where(Speciality.education_type == education_type)
 
-        # Count total
-        # For simplicity and perf in small datasets, separate query or window func
-        # Using func.count() over subquery is common
-        from sqlalchemy import func
-
-        count_query = select(func.count()).select_from(query.subquery())
-        total = await db.scalar(count_query) or 0
-
-        # Apply pagination
-        result = await db.execute(query.offset(skip).limit(limit))
-        return result.scalars().all(), total
+        # Jami: count strategiyasi bo'yicha (window - sahifa so'rovining o'zida)
+        items, total, next_cursor = await paginate_counted(
+            db,
+            query,
+            _SORTS,
+            sort,
+            cursor,
+            skip,
+            limit,
+            count,
+            "specialities",
+            {
+                "search": search,
+                "department_id": department_id,
+                "education_type": education_type,
+                "search_mode": search_mode if search else None,
+            },
+            rank,
+        )
+        return items, total, next_cursor
 
     async def get(self, db: AsyncSession, id: int) -> Optional[Speciality]:
         result = await db.execute(select(Speciality).where(Speciality.id == id))
         return result.scalars().first()
 
     async def get_by_name(self, db: AsyncSession, name: str) -> Optional[Speciality]:
-        result = await db.execute(select(Speciality).where(Speciality.name == name))
+        result = await db.execute(_speciality_by_name(), {"name": name})
         return result.scalars().first()
 
     async def create(
         self, db: AsyncSession, speciality_in: SpecialityCreate
     ) -> Speciality:
         # Check department existence
-        department_result = await db.execute(
-            select(Department).where(Department.id == speciality_in.department_id)
-        )
-        if not department_result.scalars().first():
+        if not await get_loader(db).load(Department, speciality_in.department_id):
             raise HTTPException(status_code=400, detail="Department ID not found")
 
         # Check uniqueness
@@ -80,6 +109,7 @@ class SpecialityService:
             education_type=speciality_in.education_type,
         )
         db.add(speciality)
+        await invalidation_bus.publish(db, "specialities", "create")
         await db.commit()
         await db.refresh(speciality)
         return speciality
@@ -88,10 +118,7 @@ class SpecialityService:
         self, db: AsyncSession, *, db_obj: Speciality, obj_in: SpecialityUpdate
     ) -> Speciality:
         if obj_in.department_id is not None:
-            department_result = await db.execute(
-                select(Department).where(Department.id == obj_in.department_id)
-            )
-            if not department_result.scalars().first():
+            if not await get_loader(db).load(Department, obj_in.department_id):
                 raise HTTPException(status_code=400, detail="Department ID not found")
 
         if obj_in.name and obj_in.name != db_obj.name:
@@ -105,6 +132,7 @@ class SpecialityService:
             setattr(db_obj, field, value)
 
         db.add(db_obj)
+        await invalidation_bus.publish(db, "specialities", "update", db_obj.id)
         await db.commit()
         await db.refresh(db_obj)
         return db_obj
@@ -115,6 +143,7 @@ class SpecialityService:
             raise HTTPException(status_code=404, detail="Speciality not found")
 
         await db.delete(speciality)
+        await invalidation_bus.publish(db, "specialities", "delete", speciality.id)
         await db.commit()
         return speciality
 
@@ -1,38 +1,82 @@
 from typing import List, Optional
-from sqlalchemy import select, func
-from sqlalchemy.orm import selectinload
+from sqlalchemy import select
+from sqlalchemy.orm import load_only, selectinload
 from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.invalidation import invalidation_bus
+from app.db.pagination import CountStrategy, paginate_counted
+from app.db.search import SearchMode, search_clause, search_rank
+from app.db.loader import get_loader
+from app.services.base import BulkFetchMixin
 from app.models.stream import Stream, StreamGroup
 from app.models.group import Group
 from app.schemas.stream import StreamCreate, StreamUpdate
 
 
-class StreamService:
+_SORTS = {"id": (Stream.id,), "name": (Stream.name, Stream.id)}
+# fields= bilan tanlanadigan ustunlar; expand=groups guruhlarni qo'shadi
+STREAM_FIELDS = ("id", "name", "academic_year")
+
+
+class StreamService(BulkFetchMixin):
     """
     Oqim (Stream) servisi.
     Oqimlarni boshqarish (yaratish, guruhlarni biriktirish).
     """
 
+    model = Stream
+    bulk_options = (selectinload(Stream.groups),)
+
     async def get_multi(
         self,
         db: AsyncSession,
         skip: int = 0,
         limit: int = 100,
         search: Optional[str] = None,
-    ) -> tuple[List[Stream], int]:
+        cursor: Optional[str] = None,
+        sort: str = "id",
+        count: Optional[CountStrategy] = None,
+        search_mode: SearchMode = SearchMode.contains,
+        fields: Optional[List[str]] = None,
+        expand: Optional[List[str]] = None,
+    ) -> tuple[List[Stream], Optional[int], Optional[str]]:
         """
         Oqimlarni olish.
         Har bir oqim ichidagi guruhlarni ham yuklaydi (eager load).
+        fields/expand berilsa, faqat so'ralgan ustunlar (va saralash kaliti),
+        guruhlar esa faqat expand=groups bo'lsa yuklanadi.
         """
-        query = select(Stream).options(selectinload(Stream.groups))
+        if fields is None and expand is None:
+            query = select(Stream).options(selectinload(Stream.groups))
+        else:
+            sort_keys = [column.key for column in _SORTS.get(sort.lstrip("-"), ())]
+            columns = dict.fromkeys(
+                ["id", *(STREAM_FIELDS if fields is None else fields), *sort_keys]
+            )
+            query = select(Stream).options(
+                load_only(*(getattr(Stream, column) for column in columns))
+            )
+            if expand and "groups" in expand:
+                query = query.options(selectinload(Stream.groups))
+        rank = None
         if search:
-            query = query.where(Stream.name.ilike(f"%{search}%"))
+            query = query.where(search_clause(Stream.search_key, search, search_mode))
+            if search_mode is SearchMode.ranked:
+                rank = search_rank(Stream.search_key, search)
 
-        count_query = select(func.count()).select_from(query.subquery())
-        total = await db.scalar(count_query) or 0
-
-        result = await db.execute(query.offset(skip).limit(limit))
-        return result.scalars().all(), total
+        items, total, next_cursor = await paginate_counted(
+            db,
+            query,
+            _SORTS,
+            sort,
+            cursor,
+            skip,
+            limit,
+            count,
+            "streams",
+            {"search": search, "search_mode": search_mode if search else None},
+            rank,
+        )
+        return items, total, next_cursor
 
     async def get(self, db: AsyncSession, id: int) -> Optional[Stream]:
         result = await db.execute(
@@ -45,13 +89,10 @@ class StreamService:
 
         if obj_in.group_ids:
             # Fetch groups
-            groups_result = await db.execute(
-                select(Group).where(Group.id.in_(obj_in.group_ids))
-            )
-            groups = groups_result.scalars().all()
-            db_obj.groups = groups
+            db_obj.groups = await get_loader(db).load_existing(Group, obj_in.group_ids)
 
         db.add(db_obj)
+        await invalidation_bus.publish(db, "streams", "create")
         await db.commit()
         # await db.refresh(db_obj) # This expires relationships
         return await self.get(db, db_obj.id)
@@ -65,13 +106,10 @@ class StreamService:
             db_obj.academic_year = obj_in.academic_year
 
         if obj_in.group_ids is not None:
-            groups_result = await db.execute(
-                select(Group).where(Group.id.in_(obj_in.group_ids))
-            )
-            groups = groups_result.scalars().all()
-            db_obj.groups = groups
+            db_obj.groups = await get_loader(db).load_existing(Group, obj_in.group_ids)
 
         db.add(db_obj)
+        await invalidation_bus.publish(db, "streams", "update", db_obj.id)
         await db.commit()
         # await db.refresh(db_obj)
         return await self.get(db, db_obj.id)
@@ -80,6 +118,7 @@ class StreamService:
         obj = await self.get(db, id)
         if obj:
             await db.delete(obj)
+            await invalidation_bus.publish(db, "streams", "delete", obj.id)
             await db.commit()
         return obj
 
@@ -1,35 +1,60 @@
 from typing import List, Optional
-from sqlalchemy import select, func
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.invalidation import invalidation_bus
+from app.db.pagination import CountStrategy, paginate_counted
+from app.db.search import SearchMode, search_clause, search_rank
+from app.services.base import BulkFetchMixin
 from app.models.subject import Subject
 from app.schemas.subject import SubjectCreate, SubjectUpdate
 
 
-class SubjectService:
+_SORTS = {"id": (Subject.id,), "name": (Subject.name, Subject.id)}
+
+
+class SubjectService(BulkFetchMixin):
     """
     Fan (Subject) servisi.
     Fanlarni boshqarish uchun xizmat.
     """
 
+    model = Subject
+
     async def get_multi(
         self,
         db: AsyncSession,
         skip: int = 0,
         limit: int = 100,
         search: Optional[str] = None,
-    ) -> tuple[List[Subject], int]:
+        cursor: Optional[str] = None,
+        sort: str = "id",
+        count: Optional[CountStrategy] = None,
+        search_mode: SearchMode = SearchMode.contains,
+    ) -> tuple[List[Subject], Optional[int], Optional[str]]:
         """
         Fanlarni olish (qidiruv bilan).
         """
         query = select(Subject)
+        rank = None
         if search:
-            query = query.where(Subject.name.ilike(f"%{search}%"))
-
-        count_query = select(func.count()).select_from(query.subquery())
-        total = await db.scalar(count_query) or 0
+            query = query.where(search_clause(Subject.search_key, search, search_mode))
+            if search_mode is SearchMode.ranked:
+                rank = search_rank(Subject.search_key, search)
 
-        result = await db.execute(query.offset(skip).limit(limit))
-        return result.scalars().all(), total
+        items, total, next_cursor = await paginate_counted(
+            db,
+            query,
+            _SORTS,
+            sort,
+            cursor,
+            skip,
+            limit,
+            count,
+            "subjects",
+            {"search": search, "search_mode": search_mode if search else None},
+            rank,
+        )
+        return items, total, next_cursor
 
     async def get(self, db: AsyncSession, id: int) -> Optional[Subject]:
         result = await db.execute(select(Subject).where(Subject.id == id))
@@ -38,6 +63,7 @@ class SubjectService:
     async def create(self, db: AsyncSession, obj_in: SubjectCreate) -> Subject:
         db_obj = Subject(**obj_in.model_dump())
         db.add(db_obj)
+        await invalidation_bus.publish(db, "subjects", "create")
         await db.commit()
         await db.refresh(db_obj)
         return db_obj
@@ -49,6 +75,7 @@ class SubjectService:
         for field, value in update_data.items():
             setattr(db_obj, field, value)
         db.add(db_obj)
+        await invalidation_bus.publish(db, "subjects", "update", db_obj.id)
         await db.commit()
         await db.refresh(db_obj)
         return db_obj
@@ -57,6 +84,7 @@ class SubjectService:
         obj = await self.get(db, id)
         if obj:
             await db.delete(obj)
+            await invalidation_bus.publish(db, "subjects", "delete", obj.id)
             await db.commit()
         return obj
 
@@ -1,10 +1,15 @@
 from typing import List, Optional
-from sqlalchemy import select, func
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.invalidation import invalidation_bus
+from app.db.pagination import CountStrategy, paginate_counted
 from app.models.teacher import Teacher
 from app.schemas.teacher import TeacherCreate, TeacherUpdate
 
 
+_SORTS = {"id": (Teacher.id,)}
+
+
 class TeacherService:
     """
     O'qituvchi servisi.
@@ -12,16 +17,22 @@ class TeacherService:
     """
 
     async def get_multi(
-        self, db: AsyncSession, skip: int = 0, limit: int = 100
-    ) -> tuple[List[Teacher], int]:
+        self,
+        db: AsyncSession,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        sort: str = "id",
+        count: Optional[CountStrategy] = None,
+    ) -> tuple[List[Teacher], Optional[int], Optional[str]]:
         """
         O'qituvchilarni olish.
         """
         query = select(Teacher)
-        count_query = select(func.count()).select_from(query.subquery())
-        total = await db.scalar(count_query) or 0
-        result = await db.execute(query.offset(skip).limit(limit))
-        return result.scalars().all(), total
+        items, total, next_cursor = await paginate_counted(
+            db, query, _SORTS, sort, cursor, skip, limit, count, "teachers", {}
+        )
+        return items, total, next_cursor
 
     async def get(self, db: AsyncSession, id: int) -> Optional[Teacher]:
         result = await db.execute(select(Teacher).where(Teacher.id == id))
@@ -30,6 +41,7 @@ class TeacherService:
     async def create(self, db: AsyncSession, obj_in: TeacherCreate) -> Teacher:
         db_obj = Teacher(**obj_in.model_dump())
         db.add(db_obj)
+        await invalidation_bus.publish(db, "teachers", "create")
         await db.commit()
         await db.refresh(db_obj)
         return db_obj
@@ -41,6 +53,7 @@ class TeacherService:
         for field, value in update_data.items():
             setattr(db_obj, field, value)
         db.add(db_obj)
+        await invalidation_bus.publish(db, "teachers", "update", db_obj.id)
         await db.commit()
         await db.refresh(db_obj)
         return db_obj
@@ -49,6 +62,7 @@ class TeacherService:
         obj = await self.get(db, id)
         if obj:
             await db.delete(obj)
+            await invalidation_bus.publish(db, "teachers", "delete", obj.id)
             await db.commit()
         return obj
 
@@ -0,0 +1,115 @@
+import hashlib
+import secrets
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy import bindparam, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.statements import cached_statement
+from app.models.refresh_token import RefreshToken
+
+
+def _digest(raw_token: str) -> bytes:
+    return hashlib.sha256(raw_token.encode()).digest()
+
+
+@cached_statement
+def _refresh_token_by_hash():
+    return (
+        select(RefreshToken)
+        .where(RefreshToken.token_hash == bindparam("token_hash"))
+        .with_for_update()
+    )
+
+
+def _invalid_refresh_token() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid refresh token"
+    )
+
+
+class TokenService:
+    """
+    Refresh token servisi.
+    Tokenlar tasodifiy satr bo'lib, bazada faqat sha256 digest'i saqlanadi;
+    tekshiruv token_hash bo'yicha bitta indeksli qidiruv. Argon2 ishlatilmaydi.
+    """
+
+    def issue(
+        self, db: AsyncSession, user_id: int, family_id: Optional[str] = None
+    ) -> str:
+        """Yangi refresh token yaratadi (commit chaqiruvchi tomonidan)."""
+        raw_token = secrets.token_urlsafe(32)
+        db.add(
+            RefreshToken(
+                token_hash=_digest(raw_token),
+                user_id=user_id,
+                family_id=family_id or uuid.uuid4().hex,
+                expires_at=datetime.now(timezone.utc)
+                + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS),
+            )
+        )
+        return raw_token
+
+    async def rotate(self, db: AsyncSession, raw_token: str) -> Tuple[int, str]:
+        """
+        Refresh tokenni almashtiradi va (user_id, yangi token) qaytaradi.
+        Allaqachon almashtirilgan token qayta kelsa (o'g'irlangan bo'lishi mumkin),
+        butun oila bekor qilinadi. Bir nechta tab bir vaqtda yangilaganda
+        REFRESH_TOKEN_REUSE_GRACE_SECONDS ichidagi takror oilani bekor qilmaydi.
+        """
+        result = await db.execute(
+            _refresh_token_by_hash(), {"token_hash": _digest(raw_token)}
+        )
+        token = result.scalars().first()
+        now = datetime.now(timezone.utc)
+        if token is None or token.expires_at <= now:
+            raise _invalid_refresh_token()
+
+        if token.revoked_at is not None:
+            grace = timedelta(seconds=settings.REFRESH_TOKEN_REUSE_GRACE_SECONDS)
+            if now - token.revoked_at > grace:
+                await self.revoke_family(db, token.family_id)
+                await db.commit()
+            raise _invalid_refresh_token()
+
+        token.revoked_at = now
+        new_token = self.issue(db, token.user_id, family_id=token.family_id)
+        return token.user_id, new_token
+
+    async def revoke_family(self, db: AsyncSession, family_id: str) -> None:
+        await db.execute(
+            update(RefreshToken)
+            .where(
+                RefreshToken.family_id == family_id,
+                RefreshToken.revoked_at.is_(None),
+            )
+            .values(revoked_at=datetime.now(timezone.utc))
+            .execution_options(synchronize_session=False)
+        )
+
+    async def revoke_by_token(self, db: AsyncSession, raw_token: str) -> None:
+        """Refresh token tegishli bo'lgan butun oilani (sessiyani) bekor qiladi."""
+        family_id = await db.scalar(
+            select(RefreshToken.family_id).where(
+                RefreshToken.token_hash == _digest(raw_token)
+            )
+        )
+        if family_id is not None:
+            await self.revoke_family(db, family_id)
+
+    async def revoke_user(self, db: AsyncSession, user_id: int) -> None:
+        """Foydalanuvchining barcha amaldagi refresh tokenlarini bekor qiladi."""
+        await db.execute(
+            update(RefreshToken)
+            .where(RefreshToken.user_id == user_id, RefreshToken.revoked_at.is_(None))
+            .values(revoked_at=datetime.now(timezone.utc))
+            .execution_options(synchronize_session=False)
+        )
+
+
+token_service = TokenService()
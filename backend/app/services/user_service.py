@@ -1,11 +1,181 @@
-from typing import Optional
+import csv
+import io
+import json
+import re
+from typing import Any, Dict, List, Optional, Tuple
 
+from fastapi import HTTPException, status
+from pydantic import ValidationError
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import bindparam, case, func, insert, or_, select
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import load_only, raiseload
 
 from app.core import security
-from app.models.user import User
-from app.schemas.user import UserCreate, UserRegister
+from app.core.config import settings
+from app.db.invalidation import invalidation_bus
+from app.db.pagination import CountStrategy, paginate_counted
+from app.db.loader import get_loader
+from app.db.search import SearchMode, escape_like, normalize_search_key, search_clause
+from app.db.statements import cached_statement
+from app.services.token_service import token_service
+from app.models.user import User, user_roles
+from app.models.role import Role
+from app.models.department import Department
+from app.schemas.user import (
+    UserBulkReport,
+    UserBulkResult,
+    UserCreate,
+    UserRegister,
+)
+
+
+# Bu maydonlar o'zgarsa, foydalanuvchining avvalgi tokenlari bekor qilinadi
+_TOKEN_FIELDS = {"roles", "is_active", "is_superuser", "hashed_password"}
+
+
+@cached_statement
+def _login_lookup():
+    # JSHSHIR, email yoki username - bitta so'rov (har biri unique indeksli,
+    # Postgres BitmapOr bilan bajaradi). Bir nechta mos kelsa, JSHSHIR ustun.
+    login = bindparam("login")
+    return (
+        select(
+            User.id,
+            User.name,
+            User.hashed_password,
+            User.is_active,
+            User.is_superuser,
+            User.token_version,
+            User.auth_roles,
+        )
+        .where(or_(User.jshshir == login, User.email == login, User.username == login))
+        .order_by(case((User.jshshir == login, 0), (User.email == login, 1), else_=2))
+        .limit(1)
+    )
+
+
+def _set_roles(db_user: User, roles: list[Role]) -> None:
+    """Rollar munosabati va auth_roles nusxasini birga o'rnatadi."""
+    db_user.roles = roles
+    db_user.auth_roles = [role.name for role in roles]
+
+
+def _parse_bulk_rows(content: bytes, fmt: str) -> List[Tuple[int, Any]]:
+    """
+    JSON lines yoki CSV matnini (qator raqami, dict) juftliklariga ajratadi.
+    O'qib bo'lmagan qator uchun dict o'rniga xato matni qaytariladi.
+    CSV'da rollar bitta katakda ";" yoki "|" bilan ajratiladi.
+    """
+    text = content.decode("utf-8-sig")
+    rows: List[Tuple[int, Any]] = []
+    if fmt == "csv":
+        for number, record in enumerate(csv.DictReader(io.StringIO(text)), start=1):
+            data = {
+                key.strip(): value.strip()
+                for key, value in record.items()
+                if key and isinstance(value, str) and value.strip()
+            }
+            if "roles" in data:
+                data["roles"] = [
+                    name.strip()
+                    for name in re.split(r"[;|]", data["roles"])
+                    if name.strip()
+                ]
+            rows.append((number, data))
+        return rows
+
+    for number, line in enumerate(text.splitlines(), start=1):
+        if not line.strip():
+            continue
+        try:
+            data = json.loads(line)
+        except ValueError as exc:
+            rows.append((number, f"Invalid JSON: {exc}"))
+            continue
+        rows.append((number, data if isinstance(data, dict) else "Expected a JSON object"))
+    return rows
+
+
+def _validation_detail(exc: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}"
+        for error in exc.errors()
+    )
+
+
+async def _insert_bulk_rows(
+    db: AsyncSession,
+    rows: List[Tuple[int, UserCreate, str, str]],
+    role_ids: Dict[str, int],
+) -> Dict[str, int]:
+    """
+    (qator raqami, UserCreate, username, xesh) qatorlarini bitta ko'p qatorli
+    INSERT bilan yozadi va rollarini biriktiradi. email -> id qaytaradi;
+    bazada allaqachon bor foydalanuvchilar (parallel so'rov) natijada bo'lmaydi.
+    """
+    inserted = await db.execute(
+        pg_insert(User)
+        .values(
+            [
+                {
+                    "email": user_in.email,
+                    "hashed_password": hashed_password,
+                    "name": user_in.name,
+                    # Core INSERT: @validates ishlamaydi, kalit shu yerda
+                    "search_key": normalize_search_key(user_in.name),
+                    "is_active": True,
+                    "is_superuser": user_in.is_superuser,
+                    "token_version": 0,
+                    "auth_roles": list(dict.fromkeys(user_in.roles)),
+                    "passport_series": user_in.passport_series,
+                    "jshshir": user_in.jshshir,
+                    "username": username,
+                    "phone_number": user_in.phone_number,
+                    "department_id": user_in.department_id,
+                }
+                for _, user_in, username, hashed_password in rows
+            ]
+        )
+        # Parallel so'rov bilan to'qnashuv: qator shunchaki o'tkazib yuboriladi
+        .on_conflict_do_nothing()
+        .returning(User.id, User.email)
+    )
+    user_ids = {row.email: row.id for row in inserted}
+
+    role_rows = [
+        {"user_id": user_ids[user_in.email], "role_id": role_ids[name]}
+        for _, user_in, _, _ in rows
+        if user_in.email in user_ids
+        for name in dict.fromkeys(user_in.roles)
+    ]
+    if role_rows:
+        await db.execute(insert(user_roles).values(role_rows))
+    return user_ids
+
+
+def _db_error_detail(exc: DBAPIError) -> str:
+    # Drayver xabarining birinchi qatori (masalan FK yoki CHECK buzilishi)
+    return str(exc.orig).strip().splitlines()[0] if exc.orig else "Database error"
+
+
+_SORTS = {"id": (User.id,), "email": (User.email, User.id)}
+# Katalog: name saralashi search_key bo'yicha (NULL bo'lmaydi, keyset uchun kerak)
+_DIRECTORY_SORTS = {**_SORTS, "name": (User.search_key, User.id)}
+# Katalog ro'yxati faqat shu ustunlarni o'qiydi; roles munosabati yuklanmaydi
+_DIRECTORY_COLUMNS = (
+    User.id,
+    User.name,
+    User.email,
+    User.username,
+    User.jshshir,
+    User.phone_number,
+    User.department_id,
+    User.is_active,
+    User.auth_roles,
+    User.search_key,
+)
 
 
 class UserService:
@@ -24,23 +194,28 @@ class UserService:
         result = await db.execute(select(User).where(User.jshshir == jshshir))
         return result.scalars().first()
 
+    async def get_login_subject(self, db: AsyncSession, login: str):
+        """
+        Login uchun: JSHSHIR, email yoki username bo'yicha bitta so'rov.
+        Parol hash'i va token claim'lari (auth_roles) bilan qator qaytaradi.
+        """
+        result = await db.execute(_login_lookup(), {"login": login})
+        return result.first()
+
     async def create_user(self, db: AsyncSession, user_in: UserCreate) -> User:
         password = user_in.password or user_in.passport_series
         username = user_in.username or user_in.jshshir
 
         # Fetch Role objects
-        from app.models.role import Role
-
-        roles_stmt = select(Role).where(Role.name.in_(user_in.roles))
-        roles_result = await db.execute(roles_stmt)
-        roles = roles_result.scalars().all()
+        roles = await get_loader(db).load_existing(Role, user_in.roles, by="name")
+        # argon2 xeshlash vaqtida ulanish hovuzda tursin
+        await db.release()
 
         db_user = User(
             email=user_in.email,
-            hashed_password=security.get_password_hash(password),
+            hashed_password=await security.get_password_hash_async(password),
             name=user_in.name,
             # role=user_in.role, # REMOVED: using roles relationship
-            roles=roles,
             is_superuser=user_in.is_superuser,
             passport_series=user_in.passport_series,
             jshshir=user_in.jshshir,
@@ -48,31 +223,192 @@ class UserService:
             phone_number=user_in.phone_number,
             department_id=user_in.department_id,
         )
+        _set_roles(db_user, roles)
         db.add(db_user)
+        await invalidation_bus.publish(db, "users", "create")
         await db.commit()
         await db.refresh(db_user)
         return db_user
 
     async def register_user(self, db: AsyncSession, user_in: UserRegister) -> User:
         # Default role for public registration
-        from app.models.role import Role
-
-        roles_stmt = select(Role).where(Role.name == "student")
-        roles_result = await db.execute(roles_stmt)
-        roles = roles_result.scalars().all()
+        roles = await get_loader(db).load_existing(Role, ["student"], by="name")
+        await db.release()
 
         db_user = User(
             email=user_in.email,
-            hashed_password=security.get_password_hash(user_in.password),
+            hashed_password=await security.get_password_hash_async(user_in.password),
             name=user_in.name,
-            roles=roles,
             is_superuser=False,
         )
+        _set_roles(db_user, roles)
         db.add(db_user)
+        await invalidation_bus.publish(db, "users", "create")
         await db.commit()
         await db.refresh(db_user)
         return db_user
 
+    async def bulk_create(
+        self, db: AsyncSession, content: bytes, fmt: str
+    ) -> UserBulkReport:
+        """
+        Ommaviy foydalanuvchi yaratish (JSON lines yoki CSV).
+        1. Qatorlar tekshiriladi (UserCreate), fayl ichidagi takrorlar aniqlanadi.
+        2. Rollar va kafedralar bittadan IN so'rovi bilan tekshiriladi.
+        3. Bazada mavjud email/JSHSHIR/username'lar xeshlashdan oldin tashlab
+           ketiladi (argon2 qimmat).
+        4. Parollar alohida hovuzda parallel, bo'laklab xeshlanadi.
+        5. users va user_roles ko'p qatorli INSERT bilan, bo'laklab (chunk)
+           yoziladi; har bir bo'lak SAVEPOINT ichida va alohida commit
+           qilinadi. Bo'lak xato bersa (masalan FK), qatorlar birma-bir
+           yoziladi va faqat xato bergan qator "error" bo'ladi.
+        Har bir qator uchun natija (created / skipped / error) qaytariladi.
+        """
+        parsed = _parse_bulk_rows(content, fmt)
+        if len(parsed) > settings.USER_BULK_MAX_ROWS:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"At most {settings.USER_BULK_MAX_ROWS} rows per upload",
+            )
+
+        results: Dict[int, UserBulkResult] = {}
+
+        def reject(number: int, state: str, detail: str, email=None) -> None:
+            results[number] = UserBulkResult(
+                row=number, status=state, email=email, detail=detail
+            )
+
+        valid: List[Tuple[int, UserCreate]] = []
+        for number, data in parsed:
+            if isinstance(data, str):
+                reject(number, "error", data)
+                continue
+            try:
+                valid.append((number, UserCreate.model_validate(data)))
+            except ValidationError as exc:
+                reject(number, "error", _validation_detail(exc), data.get("email"))
+
+        loader = get_loader(db)
+        role_ids = {
+            role.name: role.id
+            for role in await loader.load_existing(
+                Role, {name for _, user_in in valid for name in user_in.roles}, by="name"
+            )
+        }
+        department_ids = {
+            department.id
+            for department in await loader.load_existing(
+                Department,
+                {user_in.department_id for _, user_in in valid if user_in.department_id},
+            )
+        }
+
+        seen: Dict[Tuple[str, str], int] = {}
+        candidates: List[Tuple[int, UserCreate, str]] = []
+        for number, user_in in valid:
+            unknown = [name for name in user_in.roles if name not in role_ids]
+            if unknown:
+                reject(number, "error", f"Unknown roles: {', '.join(unknown)}", user_in.email)
+                continue
+            if user_in.department_id and user_in.department_id not in department_ids:
+                reject(number, "error", "Unknown department", user_in.email)
+                continue
+            username = user_in.username or user_in.jshshir
+            keys = [("email", user_in.email), ("jshshir", user_in.jshshir), ("username", username)]
+            duplicate = next((key for key in keys if key in seen), None)
+            if duplicate is not None:
+                reject(
+                    number,
+                    "error",
+                    f"Duplicate {duplicate[0]} (row {seen[duplicate]})",
+                    user_in.email,
+                )
+                continue
+            seen.update((key, number) for key in keys)
+            candidates.append((number, user_in, username))
+
+        chunk_size = settings.USER_BULK_CHUNK_SIZE
+        taken: Dict[str, set] = {"email": set(), "jshshir": set(), "username": set()}
+        for start in range(0, len(candidates), chunk_size):
+            chunk = candidates[start : start + chunk_size]
+            existing = await db.execute(
+                select(User.email, User.jshshir, User.username).where(
+                    or_(
+                        User.email.in_([user_in.email for _, user_in, _ in chunk]),
+                        User.jshshir.in_([user_in.jshshir for _, user_in, _ in chunk]),
+                        User.username.in_([username for _, _, username in chunk]),
+                    )
+                )
+            )
+            for row in existing:
+                taken["email"].add(row.email)
+                taken["jshshir"].add(row.jshshir)
+                taken["username"].add(row.username)
+
+        pending: List[Tuple[int, UserCreate, str]] = []
+        for number, user_in, username in candidates:
+            values = {"email": user_in.email, "jshshir": user_in.jshshir, "username": username}
+            clash = next((field for field, value in values.items() if value in taken[field]), None)
+            if clash is not None:
+                reject(number, "skipped", f"User with this {clash} already exists", user_in.email)
+            else:
+                pending.append((number, user_in, username))
+
+        # Birinchi bo'lak xeshlanayotganda ulanish band turmaydi (keyingi
+        # bo'laklarda tranzaksiyada yozuvlar bor, release() hech narsa qilmaydi)
+        await db.release()
+        for start in range(0, len(pending), chunk_size):
+            chunk = pending[start : start + chunk_size]
+            hashes = await security.hash_passwords_bulk(
+                [user_in.password or user_in.passport_series for _, user_in, _ in chunk]
+            )
+            rows = [
+                (number, user_in, username, hashed_password)
+                for (number, user_in, username), hashed_password in zip(chunk, hashes)
+            ]
+
+            failed: Dict[int, str] = {}
+            try:
+                async with db.begin_nested():
+                    user_ids = await _insert_bulk_rows(db, rows, role_ids)
+            except DBAPIError:
+                # Bo'lakni qatorlab qayta yozamiz: xato faqat o'z qatoriga tushadi
+                user_ids = {}
+                for row in rows:
+                    try:
+                        async with db.begin_nested():
+                            user_ids.update(await _insert_bulk_rows(db, [row], role_ids))
+                    except DBAPIError as exc:
+                        failed[row[0]] = _db_error_detail(exc)
+
+            for number, user_in, _, _ in rows:
+                if number in failed:
+                    reject(number, "error", failed[number], user_in.email)
+                elif user_in.email not in user_ids:
+                    reject(number, "skipped", "User already exists", user_in.email)
+                else:
+                    results[number] = UserBulkResult(
+                        row=number,
+                        status="created",
+                        id=user_ids[user_in.email],
+                        email=user_in.email,
+                    )
+            if user_ids:
+                await invalidation_bus.publish(db, "users", "create")
+            await db.commit()
+
+        items = [results[number] for number in sorted(results)]
+        counts = {state: 0 for state in ("created", "skipped", "error")}
+        for item in items:
+            counts[item.status] += 1
+        return UserBulkReport(
+            total=len(items),
+            created=counts["created"],
+            skipped=counts["skipped"],
+            failed=counts["error"],
+            items=items,
+        )
+
     async def update_user(
         self, db: AsyncSession, db_user: User, user_in: UserCreate | dict
     ) -> User:
@@ -81,41 +417,119 @@ class UserService:
         else:
             update_data = user_in.model_dump(exclude_unset=True)
 
-            hashed_password = security.get_password_hash(update_data["password"])
+            await db.release()
+            hashed_password = await security.get_password_hash_async(
+                update_data["password"]
+            )
             update_data["hashed_password"] = hashed_password
             del update_data["password"]
 
-        if "roles" in update_data:
-            from app.models.role import Role
+        if _TOKEN_FIELDS.intersection(update_data):
+            db_user.token_version = (db_user.token_version or 0) + 1
+        if {"hashed_password", "is_active"}.intersection(update_data):
+            # Parol o'zgarsa yoki foydalanuvchi bloklansa, sessiyalar ham yopiladi
+            await token_service.revoke_user(db, db_user.id)
 
+        if "roles" in update_data:
             role_names = update_data["roles"]
-            roles_stmt = select(Role).where(Role.name.in_(role_names))
-            roles_result = await db.execute(roles_stmt)
-            roles = roles_result.scalars().all()
-            db_user.roles = roles
+            _set_roles(
+                db_user,
+                await get_loader(db).load_existing(Role, role_names, by="name"),
+            )
             del update_data["roles"]
 
         for field, value in update_data.items():
             setattr(db_user, field, value)
 
         db.add(db_user)
+        await invalidation_bus.publish(db, "users", "update", db_user.id)
         await db.commit()
         await db.refresh(db_user)
         return db_user
 
     async def delete_user(self, db: AsyncSession, db_user: User) -> User:
         await db.delete(db_user)
+        await invalidation_bus.publish(db, "users", "delete", db_user.id)
         await db.commit()
         return db_user
 
     async def get_multi(
-        self, db: AsyncSession, skip: int = 0, limit: int = 100
-    ) -> list[User]:
-        result = await db.execute(select(User).offset(skip).limit(limit))
-        return result.scalars().all()
+        self,
+        db: AsyncSession,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        sort: str = "id",
+        count: Optional[CountStrategy] = None,
+    ) -> tuple[list[User], Optional[int], Optional[str]]:
+        return await paginate_counted(
+            db, select(User), _SORTS, sort, cursor, skip, limit, count, "users", {}
+        )
+
+    async def get_directory(
+        self,
+        db: AsyncSession,
+        skip: int = 0,
+        limit: int = 50,
+        name: Optional[str] = None,
+        email: Optional[str] = None,
+        jshshir: Optional[str] = None,
+        phone_number: Optional[str] = None,
+        role: Optional[str] = None,
+        department_id: Optional[int] = None,
+        cursor: Optional[str] = None,
+        sort: str = "id",
+        count: Optional[CountStrategy] = None,
+    ) -> tuple[list[User], Optional[int], Optional[str]]:
+        """
+        Foydalanuvchilar katalogi: filtrlar va yengil proyeksiya.
+        Har bir filtr indeksga tayanadi:
+          name          - search_key trigram indeksi (kirill/lotin farqsiz);
+          email         - lower(email) prefiksi (text_pattern_ops);
+          jshshir       - aniq moslik (unique indeks);
+          phone_number  - aniq moslik;
+          role          - auth_roles @> ARRAY[rol] (GIN indeks);
+          department_id - (department_id, id) indeksi.
+        Rollar auth_roles'dan olinadi: roles/permissions munosabatlari yuklanmaydi.
+        """
+        query = select(User).options(load_only(*_DIRECTORY_COLUMNS), raiseload(User.roles))
+        if name:
+            query = query.where(search_clause(User.search_key, name, SearchMode.contains))
+        if email:
+            query = query.where(
+                func.lower(User.email).like(f"{escape_like(email.lower())}%", escape="\\")
+            )
+        if jshshir:
+            query = query.where(User.jshshir == jshshir)
+        if phone_number:
+            query = query.where(User.phone_number == phone_number)
+        if role:
+            query = query.where(User.auth_roles.contains([role]))
+        if department_id:
+            query = query.where(User.department_id == department_id)
+
+        return await paginate_counted(
+            db,
+            query,
+            _DIRECTORY_SORTS,
+            sort,
+            cursor,
+            skip,
+            limit,
+            count,
+            "users",
+            {
+                "name": name,
+                "email": email,
+                "jshshir": jshshir,
+                "phone_number": phone_number,
+                "role": role,
+                "department_id": department_id,
+            },
+        )
 
-    def verify_password(self, plain_password: str, hashed_password: str) -> bool:
-        return security.verify_password(plain_password, hashed_password)
+    async def verify_password(self, plain_password: str, hashed_password: str) -> bool:
+        return await security.verify_password_async(plain_password, hashed_password)
 
 
 user_service = UserService()
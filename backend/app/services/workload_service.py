@@ -1,8 +1,19 @@
 from typing import List, Optional
-from sqlalchemy import select, func, update
-from sqlalchemy.orm import selectinload
+from sqlalchemy import Row, select, func, insert, update, bindparam
+from sqlalchemy.orm import load_only, selectinload
 from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.db.statements import cached_statement
+from app.db.invalidation import invalidation_bus
+from app.db.pagination import (
+    CountStrategy,
+    count_strategy,
+    count_total,
+    next_cursor,
+    paginate_counted,
+)
 from app.models.workload import Workload, LoadType
+from app.models.edu_plan import EduPlan
 from app.models.group import Group
 from app.models.stream import Stream
 from app.schemas.workload import (
@@ -13,6 +24,147 @@ from app.schemas.workload import (
 )
 
 
+def _workload_loaders():
+    # Eager load relationships to avoid MissingGreenlet and explicit IDs
+    # We need to load stream.groups because Stream schema includes it
+    return (
+        selectinload(Workload.subject),
+        selectinload(Workload.edu_plan),
+        selectinload(Workload.group),
+        selectinload(Workload.stream).selectinload(Stream.groups),
+    )
+
+
+# fields= bilan tanlanadigan ustunlar va expand= kengaytmalari uchun
+# kerakli tashqi kalitlar (selectinload ota qatordagi kalitni o'qiydi)
+WORKLOAD_FIELDS = (
+    "id",
+    "name",
+    "subject_id",
+    "edu_plan_id",
+    "load_type",
+    "hours",
+    "stream_id",
+    "group_id",
+)
+_EXPAND_KEYS = {
+    "subject": "subject_id",
+    "edu_plan": "edu_plan_id",
+    "group": "group_id",
+    "stream": "stream_id",
+}
+
+
+def _sparse_loaders(fields: List[str], expand: List[str]):
+    """
+    Faqat so'ralgan ustunlar (load_only) va kengaytmalar uchun yuklovchilar.
+    So'ralmagan ichki munosabatlar (edu_plan.speciality, stream.groups)
+    umuman yuklanmaydi.
+    """
+    top = {name.split(".")[0] for name in expand}
+    columns = dict.fromkeys(["id", *fields, *(_EXPAND_KEYS[name] for name in top)])
+    options = [load_only(*(getattr(Workload, column) for column in columns))]
+    if "subject" in top:
+        options.append(selectinload(Workload.subject))
+    if "group" in top:
+        options.append(selectinload(Workload.group))
+    if "edu_plan" in top:
+        loader = selectinload(Workload.edu_plan)
+        options.append(
+            loader.selectinload(EduPlan.speciality)
+            if "edu_plan.speciality" in expand
+            else loader.noload(EduPlan.speciality)
+        )
+    if "stream" in top:
+        loader = selectinload(Workload.stream)
+        options.append(
+            loader.selectinload(Stream.groups)
+            if "stream.groups" in expand
+            else loader.noload(Stream.groups)
+        )
+    return options
+
+
+@cached_statement
+def _workload_by_id():
+    return (
+        select(Workload)
+        .where(Workload.id == bindparam("id"))
+        .options(*_workload_loaders())
+    )
+
+
+def _page_query(by_plan: bool, windowed: bool):
+    query = select(Workload)
+    if windowed:
+        # window strategiyasi: jami sahifa qatorlari bilan birga keladi
+        query = query.add_columns(func.count().over().label("_total"))
+    if by_plan:
+        query = query.where(Workload.edu_plan_id == bindparam("edu_plan_id"))
+    return (
+        query.options(*_workload_loaders())
+        .order_by(Workload.id.desc())
+        .offset(bindparam("skip"))
+        .limit(bindparam("limit"))
+    )
+
+
+@cached_statement
+def _workload_page():
+    return _page_query(by_plan=False, windowed=False)
+
+
+@cached_statement
+def _workload_page_by_plan():
+    return _page_query(by_plan=True, windowed=False)
+
+
+@cached_statement
+def _workload_page_windowed():
+    return _page_query(by_plan=False, windowed=True)
+
+
+@cached_statement
+def _workload_page_by_plan_windowed():
+    return _page_query(by_plan=True, windowed=True)
+
+
+@cached_statement
+def _workload_count():
+    return select(func.count(Workload.id))
+
+
+@cached_statement
+def _workload_count_by_plan():
+    return select(func.count(Workload.id)).where(
+        Workload.edu_plan_id == bindparam("edu_plan_id")
+    )
+
+
+@cached_statement
+def _split_lab_groups():
+    return select(Group.id).where(
+        Group.id.in_(bindparam("ids", expanding=True)),
+        Group.has_lab_subgroups.is_(True),
+    )
+
+
+# create_batch natijasi (RETURNING): munosabatlarsiz, faqat yuklama ustunlari.
+# Ustun qo'shilsa, WORKLOAD_BATCH_CHUNK_SIZE chegarasi (config) ham qayta hisoblanadi.
+_BATCH_COLUMNS = (
+    Workload.id,
+    Workload.subject_id,
+    Workload.edu_plan_id,
+    Workload.load_type,
+    Workload.hours,
+    Workload.name,
+    Workload.stream_id,
+    Workload.group_id,
+)
+
+_SORTS = {"id": (Workload.id,)}
+
+
 class WorkloadService:
     """
     Yuklama (Workload) servisi.
@@ -26,40 +178,65 @@ class WorkloadService:
         skip: int = 0,
         limit: int = 100,
         edu_plan_id: Optional[int] = None,
-    ) -> tuple[List[Workload], int]:
+        cursor: Optional[str] = None,
+        sort: str = "-id",
+        count: Optional[CountStrategy] = None,
+        fields: Optional[List[str]] = None,
+        expand: Optional[List[str]] = None,
+    ) -> tuple[List[Workload], Optional[int], Optional[str]]:
         """
         Yuklamalarni olish.
         Barcha bog'liq ma'lumotlarni (fan, o'qituvchi, guruh) yuklaydi.
+        Jami sanash so'rovi eager-load'siz (faqat workloads bo'yicha) bajariladi.
+        Standart tartibdagi OFFSET sahifalari keshlangan so'rovlardan (window
+        strategiyasida count(*) OVER () bilan), qolgan hollar umumiy
+        sahifalashdan foydalanadi.
+        fields/expand berilsa, faqat so'ralgan ustunlar va munosabatlar yuklanadi.
         """
-        # Eager load relationships to avoid MissingGreenlet and explicit IDs
-        # We need to load stream.groups because Stream schema includes it
-        query = select(Workload).options(
-            selectinload(Workload.subject),
-            selectinload(Workload.edu_plan),
-            selectinload(Workload.group),
-            selectinload(Workload.stream).selectinload(Stream.groups),
-        ).order_by(Workload.id.desc())
-
-        if edu_plan_id:
-            query = query.where(Workload.edu_plan_id == edu_plan_id)
-
-        count_query = select(func.count()).select_from(query.subquery())
-        total = await db.scalar(count_query) or 0
-        result = await db.execute(query.offset(skip).limit(limit))
-        return result.scalars().all(), total
+        count = count_strategy(count)
+        filters = {"edu_plan_id": edu_plan_id} if edu_plan_id else {}
+        sparse = fields is not None or expand is not None
 
-    async def get(self, db: AsyncSession, id: int) -> Optional[Workload]:
-        query = (
-            select(Workload)
-            .where(Workload.id == id)
-            .options(
-                selectinload(Workload.subject),
-                selectinload(Workload.edu_plan),
-                selectinload(Workload.stream).selectinload(Stream.groups),
-                selectinload(Workload.group),
+        if sparse or cursor or sort != "-id":
+            if sparse:
+                loaders = _sparse_loaders(
+                    list(WORKLOAD_FIELDS) if fields is None else fields, expand or []
+                )
+            else:
+                loaders = _workload_loaders()
+            query = select(Workload).options(*loaders)
+            if edu_plan_id:
+                query = query.where(Workload.edu_plan_id == edu_plan_id)
+            return await paginate_counted(
+                db, query, _SORTS, sort, cursor, skip, limit, count, "workloads", filters
             )
-        )
-        result = await db.execute(query)
+
+        params = {**filters, "skip": skip, "limit": limit + 1}
+        count_stmt = _workload_count_by_plan() if edu_plan_id else _workload_count()
+        if count is CountStrategy.window:
+            page_stmt = (
+                _workload_page_by_plan_windowed()
+                if edu_plan_id
+                else _workload_page_windowed()
+            )
+            rows = (await db.execute(page_stmt, params)).all()
+            items, cursor = next_cursor([row[0] for row in rows], _SORTS, sort, limit)
+            if rows:
+                return items, rows[0][1], cursor
+            if not skip:
+                return items, 0, cursor
+            # oxiridan o'tib ketgan sahifa: jami sahifadan olinmaydi
+            count = CountStrategy.cached
+        else:
+            page_stmt = _workload_page_by_plan() if edu_plan_id else _workload_page()
+            result = await db.execute(page_stmt, params)
+            items, cursor = next_cursor(result.scalars().all(), _SORTS, sort, limit)
+
+        total = await count_total(db, count, count_stmt, filters, "workloads", filters)
+        return items, total, cursor
+
+    async def get(self, db: AsyncSession, id: int) -> Optional[Workload]:
+        result = await db.execute(_workload_by_id(), {"id": id})
         return result.scalars().first()
 
     # ... (create, update, delete generic methods are fine unless they used curriculum, which they don't seem to explicitly)
@@ -67,6 +244,7 @@ class WorkloadService:
     async def create(self, db: AsyncSession, obj_in: WorkloadCreate) -> Workload:
         db_obj = Workload(**obj_in.model_dump())
         db.add(db_obj)
+        await invalidation_bus.publish(db, "workloads", "create")
         await db.commit()
         await db.refresh(db_obj)
         return await self.get(db, db_obj.id)
@@ -78,6 +256,7 @@ class WorkloadService:
         for field, value in update_data.items():
             setattr(db_obj, field, value)
         db.add(db_obj)
+        await invalidation_bus.publish(db, "workloads", "update", db_obj.id)
         await db.commit()
         await db.refresh(db_obj)
         return await self.get(db, db_obj.id)
@@ -86,90 +265,98 @@ class WorkloadService:
         obj = await self.get(db, id)
         if obj:
             await db.delete(obj)
+            await invalidation_bus.publish(db, "workloads", "delete", obj.id)
             await db.commit()
         return obj
 
     async def create_batch(
         self, db: AsyncSession, obj_in: WorkloadBatchCreate
-    ) -> List[Workload]:
+    ) -> List[Row]:
         """
         Yuklamalarni ommaviy yaratish (Batch Create).
         Dars turiga qarab (Ma'ruza, Amaliyot, Lab) yuklamalarni oqim yoki guruhlarga bo'lib chiqadi.
         Laboratoriya uchun guruhni guruhchalarga (podguruh) bo'lishni ham qo'llab-quvvatlaydi.
+
+        ORM obyektlarisiz: qatorlar bitta ko'p qatorli INSERT ... RETURNING bilan
+        (WORKLOAD_BATCH_CHUNK_SIZE bo'laklarda, bitta tranzaksiyada) yoziladi va
+        munosabatlarsiz yengil natija qaytariladi.
         """
-        created_workloads = []
+        # Barcha LAB elementlari uchun guruhchaga bo'lingan guruhlar - bitta so'rov
+        lab_group_ids = {
+            group_id
+            for item in obj_in.items
+            if item.load_type == LoadType.LAB
+            for group_id in item.group_ids
+        }
+        split_groups = set()
+        if lab_group_ids:
+            result = await db.execute(_split_lab_groups(), {"ids": list(lab_group_ids)})
+            split_groups = set(result.scalars().all())
 
+        common_data = {
+            "subject_id": obj_in.subject_id,
+            "edu_plan_id": obj_in.edu_plan_id,
+            "name": obj_in.name,
+            "stream_id": None,
+            "group_id": None,
+        }
+        rows = []
         for item in obj_in.items:
-            # Prepare common data
-            common_data = {
-                "subject_id": obj_in.subject_id,
-                "edu_plan_id": obj_in.edu_plan_id,
-                "load_type": item.load_type,
-                "hours": item.hours,
-                "name": obj_in.name,
-            }
-
             if item.load_type == LoadType.LECTURE:
-                # Create for each stream
+                # Har bir oqim uchun
                 for stream_id in item.stream_ids:
-                    workload = Workload(**common_data, stream_id=stream_id)
-                    db.add(workload)
-                    created_workloads.append(workload)
+                    rows.append(
+                        {
+                            **common_data,
+                            "load_type": item.load_type,
+                            "hours": item.hours,
+                            "stream_id": stream_id,
+                        }
+                    )
 
             elif item.load_type == LoadType.PRACTICE:
-                # Create for each group
+                # Har bir guruh uchun
                 for group_id in item.group_ids:
-                    workload = Workload(**common_data, group_id=group_id)
-                    db.add(workload)
-                    created_workloads.append(workload)
-
-            elif item.load_type == LoadType.LAB:
-                # Create for each group, checking for split
-                # Fetch all groups at once to check for split flag
-                if item.group_ids:
-                    group_results = await db.execute(
-                        select(Group).where(Group.id.in_(item.group_ids))
+                    rows.append(
+                        {
+                            **common_data,
+                            "load_type": item.load_type,
+                            "hours": item.hours,
+                            "group_id": group_id,
+                        }
                     )
-                    groups_map = {
-                        group.id: group for group in group_results.scalars().all()
-                    }
-                else:
-                    groups_map = {}
 
+            elif item.load_type == LoadType.LAB:
+                # Guruhchalarga bo'lingan guruhda soat ikki barobar
                 for group_id in item.group_ids:
-                    group = groups_map.get(group_id)
-
-                    final_hours = item.hours
-                    if group and group.has_lab_subgroups:
-                        # Double the hours if group has lab subgroups
-                        final_hours = item.hours * 2
-
-                    # Create single workload
-                    workload = Workload(**common_data, group_id=group_id)
-                    workload.hours = final_hours  # Override hours
-                    db.add(workload)
-                    created_workloads.append(workload)
-
-        await db.commit()
+                    hours = item.hours * 2 if group_id in split_groups else item.hours
+                    rows.append(
+                        {
+                            **common_data,
+                            "load_type": item.load_type,
+                            "hours": hours,
+                            "group_id": group_id,
+                        }
+                    )
 
-        # Re-fetch created workloads with eager loading to satisfy schema
-        if not created_workloads:
+        if not rows:
             return []
 
-        created_ids = [w.id for w in created_workloads]
-        query = (
-            select(Workload)
-            .where(Workload.id.in_(created_ids))
-            .options(
-                selectinload(Workload.subject),
-                selectinload(Workload.edu_plan),
-                selectinload(Workload.stream).selectinload(Stream.groups),
-                selectinload(Workload.group),
+        created = []
+        chunk_size = settings.WORKLOAD_BATCH_CHUNK_SIZE
+        for start in range(0, len(rows), chunk_size):
+            result = await db.execute(
+                insert(Workload)
+                .values(rows[start : start + chunk_size])
+                .returning(*_BATCH_COLUMNS)
             )
+            created.extend(result.all())
+
+        await invalidation_bus.publish(
+            db, "workloads", "create", data={"subject_id": obj_in.subject_id}
         )
-        result = await db.execute(query)
-        fetched_workloads = result.scalars().all()
-        return fetched_workloads
+        await db.commit()
+        return created
 
     async def update_by_subject(
         self, db: AsyncSession, obj_in: WorkloadGroupUpdate
@@ -195,6 +382,9 @@ class WorkloadService:
 
         stmt = stmt.values(**values)
         result = await db.execute(stmt)
+        await invalidation_bus.publish(
+            db, "workloads", "update", data={"subject_id": obj_in.subject_id}
+        )
         await db.commit()
         return result.rowcount
 
@@ -207,6 +397,9 @@ class WorkloadService:
 
         stmt = delete(Workload).where(Workload.subject_id == subject_id)
         result = await db.execute(stmt)
+        await invalidation_bus.publish(
+            db, "workloads", "delete", data={"subject_id": subject_id}
+        )
         await db.commit()
         return result.rowcount
 
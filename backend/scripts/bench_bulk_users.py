@@ -0,0 +1,84 @@
+import argparse
+import csv
+import io
+import time
+import uuid
+
+import httpx
+
+"""
+Ommaviy foydalanuvchi yaratish (POST /users/bulk) benchmarki.
+
+`--rows` ta sun'iy talaba (CSV) yaratib, bitta so'rov bilan yuboradi va
+umumiy vaqt, sekundiga foydalanuvchilar soni hamda hisobot natijalarini
+(created / skipped / error) chiqaradi. Vaqtning asosiy qismi argon2
+xeshlash: u PASSWORD_HASH_BULK_WORKERS (standart: CPU soni) bo'yicha
+parallel bajariladi.
+
+Ishga tushirish (server ishlab turgan bo'lishi kerak):
+  python scripts/bench_bulk_users.py --url http://localhost:8000 \\
+      --username admin@example.com --password admin --rows 10000
+"""
+
+
+def _build_csv(rows: int, role: str) -> bytes:
+    run_id = uuid.uuid4().hex[:8]
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(
+        ["email", "name", "jshshir", "passport_series", "phone_number", "roles"]
+    )
+    for index in range(rows):
+        writer.writerow(
+            [
+                f"bench-{run_id}-{index}@example.com",
+                f"Bench Student {index}",
+                f"9{run_id}{index:06d}",
+                f"AB{index:07d}",
+                f"+99890{index:07d}",
+                role,
+            ]
+        )
+    return buffer.getvalue().encode()
+
+
+def run(args) -> None:
+    api = f"{args.url.rstrip('/')}{args.prefix}"
+    body = _build_csv(args.rows, args.role)
+
+    with httpx.Client(timeout=args.timeout) as client:
+        response = client.post(
+            f"{api}/auth/access-token",
+            data={"username": args.username, "password": args.password},
+        )
+        response.raise_for_status()
+        headers = {
+            "Authorization": f"Bearer {response.json()['access_token']}",
+            "Content-Type": "text/csv",
+        }
+
+        started = time.perf_counter()
+        response = client.post(f"{api}/users/bulk", content=body, headers=headers)
+        elapsed = time.perf_counter() - started
+        response.raise_for_status()
+
+    report = response.json()
+    print(f"rows                {args.rows}  ({len(body) / 1024:.0f} KiB CSV)")
+    print(f"duration            {elapsed:.1f} s")
+    print(f"created             {report['created']}  ({report['created'] / elapsed:.0f} users/s)")
+    print(f"skipped             {report['skipped']}")
+    print(f"failed              {report['failed']}")
+    for item in [item for item in report["items"] if item["status"] == "error"][:5]:
+        print(f"  row {item['row']}: {item['detail']}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bulk user provisioning benchmark")
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--prefix", default="/api/v1")
+    parser.add_argument("--username", required=True)
+    parser.add_argument("--password", required=True)
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--role", default="student")
+    parser.add_argument("--timeout", type=float, default=300.0, help="seconds")
+    run(parser.parse_args())
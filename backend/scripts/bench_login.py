@@ -0,0 +1,130 @@
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+"""
+Login to'lqini (login storm) simulyatsiya qiluvchi benchmark.
+
+Bir vaqtning o'zida:
+  - `--logins` ta parallel oqim /auth/access-token'ga login so'rovlarini yuboradi;
+  - `--probes` ta parallel oqim boshqa endpoint'ni (standart: /health) so'raydi.
+Natijada login/s, 503 (xeshlash navbati to'lgan) soni va boshqa endpoint
+javob vaqtining p50/p99 qiymatlari chiqariladi. Argon2 event loop'ni bloklasa,
+probe p99 login vaqtiga yaqinlashadi; hovuzda bajarilsa millisekundlarda qoladi.
+
+Ishga tushirish (server ishlab turgan bo'lishi kerak):
+  python scripts/bench_login.py --url http://localhost:8000 \\
+      --username admin@example.com --password admin --duration 20
+"""
+
+
+def _percentile(values, pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def _login_worker(client, args, deadline, stats):
+    data = {"username": args.username, "password": args.password}
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        response = await client.post(f"{args.api}/auth/access-token", data=data)
+        elapsed = (time.perf_counter() - started) * 1000
+        if response.status_code == 200:
+            stats["ok"].append(elapsed)
+        elif response.status_code == 503:
+            stats["rejected"] += 1
+        else:
+            stats["errors"] += 1
+
+
+async def _probe_worker(client, args, deadline, latencies, headers):
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        await client.get(args.probe_url, headers=headers)
+        latencies.append((time.perf_counter() - started) * 1000)
+
+
+async def run(args) -> None:
+    args.api = f"{args.url.rstrip('/')}{args.prefix}"
+    args.probe_url = f"{args.url.rstrip('/')}{args.probe_path}"
+    login_stats = {"ok": [], "rejected": 0, "errors": 0}
+    probe_latencies = []
+    limits = httpx.Limits(max_connections=args.logins + args.probes + 4)
+
+    async with httpx.AsyncClient(timeout=60, limits=limits) as client:
+        headers = {}
+        if args.probe_auth:
+            response = await client.post(
+                f"{args.api}/auth/access-token",
+                data={"username": args.username, "password": args.password},
+            )
+            response.raise_for_status()
+            headers["Authorization"] = f"Bearer {response.json()['access_token']}"
+
+        # Faqat probe'lar: login yuklamasisiz bazaviy qiymat
+        baseline = []
+        deadline = time.perf_counter() + min(3.0, args.duration / 4)
+        await asyncio.gather(
+            *(
+                _probe_worker(client, args, deadline, baseline, headers)
+                for _ in range(args.probes)
+            )
+        )
+
+        started = time.perf_counter()
+        deadline = started + args.duration
+        await asyncio.gather(
+            *(
+                _login_worker(client, args, deadline, login_stats)
+                for _ in range(args.logins)
+            ),
+            *(
+                _probe_worker(client, args, deadline, probe_latencies, headers)
+                for _ in range(args.probes)
+            ),
+        )
+        elapsed = time.perf_counter() - started
+
+    ok = login_stats["ok"]
+    print(f"duration            {elapsed:.1f} s")
+    print(f"logins ok           {len(ok)}  ({len(ok) / elapsed:.1f} logins/s)")
+    print(f"logins rejected 503 {login_stats['rejected']}")
+    print(f"logins other errors {login_stats['errors']}")
+    if ok:
+        print(
+            f"login latency       p50 {statistics.median(ok):.1f} ms"
+            f"  p99 {_percentile(ok, 99):.1f} ms"
+        )
+    print(
+        f"{args.probe_path} baseline  p50 {_percentile(baseline, 50):.1f} ms"
+        f"  p99 {_percentile(baseline, 99):.1f} ms"
+    )
+    print(
+        f"{args.probe_path} in storm  p50 {_percentile(probe_latencies, 50):.1f} ms"
+        f"  p99 {_percentile(probe_latencies, 99):.1f} ms"
+        f"  ({len(probe_latencies)} requests)"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Login throughput benchmark")
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--prefix", default="/api/v1")
+    parser.add_argument("--username", required=True)
+    parser.add_argument("--password", required=True)
+    parser.add_argument("--logins", type=int, default=32, help="concurrent login loops")
+    parser.add_argument("--probes", type=int, default=8, help="concurrent probe loops")
+    parser.add_argument("--probe-path", default="/health")
+    parser.add_argument(
+        "--probe-auth",
+        action="store_true",
+        help="send a bearer token with probe requests (for authenticated endpoints)",
+    )
+    parser.add_argument("--duration", type=float, default=20.0, help="seconds")
+    asyncio.run(run(parser.parse_args()))
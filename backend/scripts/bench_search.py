@@ -0,0 +1,125 @@
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import asyncio
+import json
+import random
+
+from sqlalchemy import text
+
+from app.db.search import escape_like, normalize_search_key
+from app.db.session import engine
+
+"""
+Nom bo'yicha qidiruv (search_key LIKE '%...%', trigram o'xshashligi va
+prefiks) benchmarki.
+
+Vaqtinchalik (TEMP) jadvalga `--rows` ta sun'iy nom (lotin va kirill) va
+ilovadagi normalize_search_key() bilan hisoblangan search_key yoziladi.
+Har bir qidiruv so'rovining rejasi EXPLAIN (ANALYZE, FORMAT JSON) bilan ikki
+marta olinadi: search_key indekslarisiz (Seq Scan) va ilovadagi indekslar
+bilan (gin_trgm_ops va search_key COLLATE "C"). Qidiruv so'zi ham ilovadagi
+kabi normallashtiriladi. Natijada reja tugunlari va bajarilish vaqti
+chiqariladi.
+pg_trgm kengaytmasi o'rnatilgan bo'lishi kerak (migratsiya uni yaratadi).
+
+Ishga tushirish (DATABASE_URL sozlangan bo'lishi kerak):
+  python scripts/bench_search.py --rows 200000 --term "dastur"
+"""
+
+_WORDS = [
+    "dasturiy", "injiniring", "kompyuter", "tizimlari", "iqtisodiyot",
+    "matematika", "fizika", "kimyo", "biologiya", "tarix", "filologiya",
+    "pedagogika", "menejment", "buxgalteriya", "energetika", "arxitektura",
+    "Ўзбек", "тили", "адабиёти", "oʻzbek", "tarixi",
+]
+
+_QUERIES = {
+    "contains": (
+        "SELECT id, name FROM bench_names WHERE search_key LIKE :pattern "
+        "ORDER BY length(search_key), search_key, id LIMIT 20"
+    ),
+    "ranked": (
+        "SELECT id, name FROM bench_names "
+        "WHERE search_key LIKE :pattern OR search_key % :term "
+        "ORDER BY similarity(search_key, :term) DESC, id LIMIT 20"
+    ),
+    "prefix": (
+        "SELECT id, name FROM bench_names "
+        'WHERE (search_key COLLATE "C") LIKE :prefix '
+        'ORDER BY search_key COLLATE "C", id LIMIT 20'
+    ),
+}
+
+_INDEXES = (
+    "CREATE INDEX ix_bench_names_search_key_trgm ON bench_names "
+    "USING gin (search_key gin_trgm_ops)",
+    "CREATE INDEX ix_bench_names_search_key_prefix ON bench_names "
+    '(search_key COLLATE "C")',
+)
+
+
+def _names(rows: int):
+    rnd = random.Random(42)
+    for index in range(rows):
+        words = rnd.sample(_WORDS, 3)
+        name = f"{' '.join(words).title()} {index}"
+        yield {"name": name, "key": normalize_search_key(name)}
+
+
+def _nodes(plan: dict):
+    yield plan["Node Type"] + (f" ({plan['Index Name']})" if "Index Name" in plan else "")
+    for child in plan.get("Plans", []):
+        yield from _nodes(child)
+
+
+async def _explain(conn, sql: str, params: dict) -> None:
+    result = await conn.execute(text(f"EXPLAIN (ANALYZE, FORMAT JSON) {sql}"), params)
+    raw = result.scalar()
+    report = (json.loads(raw) if isinstance(raw, str) else raw)[0]
+    print(f"    {report['Execution Time']:>10.2f} ms  {' -> '.join(_nodes(report['Plan']))}")
+
+
+async def run(args) -> None:
+    term = normalize_search_key(args.term)
+    params = {
+        "pattern": f"%{escape_like(term)}%",
+        "prefix": f"{escape_like(term)}%",
+        "term": term,
+    }
+    async with engine.connect() as conn:
+        await conn.execute(
+            text(
+                "CREATE TEMP TABLE bench_names (id serial PRIMARY KEY, "
+                "name varchar NOT NULL, search_key varchar NOT NULL)"
+            )
+        )
+        await conn.execute(
+            text("INSERT INTO bench_names (name, search_key) VALUES (:name, :key)"),
+            list(_names(args.rows)),
+        )
+        await conn.execute(text("ANALYZE bench_names"))
+
+        for label in ("without search_key indexes", "with search_key indexes"):
+            if label == "with search_key indexes":
+                for ddl in _INDEXES:
+                    await conn.execute(text(ddl))
+                await conn.execute(text("ANALYZE bench_names"))
+            print(f"{label} ({args.rows} rows, term={args.term!r} -> {term!r}):")
+            for mode, sql in _QUERIES.items():
+                print(f"  {mode}:")
+                for _ in range(args.repeat):
+                    await _explain(conn, sql, params)
+        await conn.rollback()
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--term", default="dastur")
+    parser.add_argument("--repeat", type=int, default=3)
+    asyncio.run(run(parser.parse_args()))
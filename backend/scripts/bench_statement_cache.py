@@ -0,0 +1,117 @@
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import time
+from sqlalchemy import select
+from sqlalchemy.orm import selectinload
+from sqlalchemy.dialects.postgresql import asyncpg as pg_asyncpg
+
+from app.db import base  # Register all models for SQLAlchemy
+from app.models.workload import Workload
+from app.models.stream import Stream
+from app.models.faculty import Faculty
+from app.models.user import User
+from app.services import workload_service, faculty_service
+from app.api import deps
+
+"""
+Ushbu skript keshlangan (cached_statement) so'rovlar qancha CPU vaqtini
+tejashini o'lchaydi. Bazaga ulanish talab qilinmaydi.
+
+Har bir so'rov uchun uchta holat o'lchanadi:
+  rebuilt  - avvalgi kod: so'rov har safar qayta quriladi, cache key hisoblanadi
+             va SQLAlchemy kompilyatsiya keshidan qidiriladi;
+  cached   - so'rov bir marta quriladi, cache key memoizatsiya qilingan;
+  nocache  - query_cache_size=0 bo'lgandagi to'liq kompilyatsiya (taqqoslash uchun).
+
+Ishga tushirish: python scripts/bench_statement_cache.py [iterations]
+"""
+
+DIALECT = pg_asyncpg.dialect()
+
+
+def _rebuilt_workload_page():
+    return (
+        select(Workload)
+        .options(
+            selectinload(Workload.subject),
+            selectinload(Workload.edu_plan),
+            selectinload(Workload.group),
+            selectinload(Workload.stream).selectinload(Stream.groups),
+        )
+        .order_by(Workload.id.desc())
+        .where(Workload.edu_plan_id == 1)
+        .offset(0)
+        .limit(20)
+    )
+
+
+def _rebuilt_workload_by_id():
+    return (
+        select(Workload)
+        .where(Workload.id == 1)
+        .options(
+            selectinload(Workload.subject),
+            selectinload(Workload.edu_plan),
+            selectinload(Workload.stream).selectinload(Stream.groups),
+            selectinload(Workload.group),
+        )
+    )
+
+
+CASES = [
+    (
+        "WorkloadService.get_multi",
+        _rebuilt_workload_page,
+        workload_service._workload_page_by_plan,
+    ),
+    ("WorkloadService.get", _rebuilt_workload_by_id, workload_service._workload_by_id),
+    (
+        "deps.get_current_user",
+        lambda: select(User).where(User.id == 1),
+        deps._user_by_id,
+    ),
+    (
+        "FacultyService.get_by_name",
+        lambda: select(Faculty).where(Faculty.name == "x"),
+        faculty_service._faculty_by_name,
+    ),
+]
+
+
+def _per_call_us(fn, iterations: int) -> float:
+    started = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - started) / iterations * 1_000_000
+
+
+def run(iterations: int = 5000) -> None:
+    print(f"{'query':<30}{'rebuilt us':>12}{'cached us':>12}{'nocache us':>12}")
+    total_saved = 0.0
+    for name, rebuild, cached in CASES:
+        compiled_cache = {}
+
+        def lookup(stmt):
+            key = stmt._generate_cache_key()
+            compiled = compiled_cache.get(key[0])
+            if compiled is None:
+                compiled = stmt.compile(dialect=DIALECT)
+                compiled_cache[key[0]] = compiled
+            return compiled
+
+        rebuilt_us = _per_call_us(lambda: lookup(rebuild()), iterations)
+        cached_us = _per_call_us(lambda: lookup(cached()), iterations)
+        nocache_us = _per_call_us(
+            lambda: rebuild().compile(dialect=DIALECT), max(iterations // 10, 1)
+        )
+        total_saved += rebuilt_us - cached_us
+        print(f"{name:<30}{rebuilt_us:>12.1f}{cached_us:>12.1f}{nocache_us:>12.1f}")
+
+    print(f"\nCPU saved per request touching all of the above: {total_saved:.1f} us")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 5000)
@@ -0,0 +1,94 @@
+import argparse
+import time
+
+import httpx
+
+"""
+Yuklamalarni ommaviy yaratish (POST /workloads/batch) benchmarki.
+
+Mavjud guruh va oqimlardan (`--groups` tagacha) jami `--rows` ta yuklama
+qatori hosil bo'ladigan batch yig'iladi: ma'ruza oqimlarga, amaliyot va
+laboratoriya guruhlarga (laboratoriyada guruhchaga bo'lingan guruhlar
+bo'yicha LAB bayrog'i bitta so'rov bilan tekshiriladi). Bitta so'rov
+vaqti va sekundiga qatorlar soni chiqariladi.
+
+--cleanup berilsa, oxirida `--subject-id` fanining BARCHA yuklamalari
+o'chiriladi (DELETE /workloads/group), shuning uchun sinov uchun alohida
+fan ishlatilishi kerak.
+
+Ishga tushirish (server ishlab turgan bo'lishi kerak):
+  python scripts/bench_workload_batch.py --url http://localhost:8000 \\
+      --username admin@example.com --password admin --subject-id 1 --rows 10000
+"""
+
+
+def _ids(client: httpx.Client, url: str, size: int) -> list:
+    response = client.get(url, params={"size": size, "include_total": False})
+    response.raise_for_status()
+    return [item["id"] for item in response.json()["items"]]
+
+
+def _build_items(rows: int, group_ids: list, stream_ids: list) -> list:
+    items = []
+    total = 0
+    kinds = [("lecture", stream_ids), ("practice", group_ids), ("lab", group_ids)]
+    while total < rows:
+        for load_type, ids in kinds:
+            ids = ids[: rows - total]
+            if not ids:
+                continue
+            key = "stream_ids" if load_type == "lecture" else "group_ids"
+            items.append({"load_type": load_type, "hours": 30, key: ids})
+            total += len(ids)
+    return items
+
+
+def run(args) -> None:
+    api = f"{args.url.rstrip('/')}{args.prefix}"
+
+    with httpx.Client(timeout=args.timeout) as client:
+        response = client.post(
+            f"{api}/auth/access-token",
+            data={"username": args.username, "password": args.password},
+        )
+        response.raise_for_status()
+        client.headers["Authorization"] = f"Bearer {response.json()['access_token']}"
+
+        group_ids = _ids(client, f"{api}/groups/", args.groups)
+        stream_ids = _ids(client, f"{api}/streams/", args.groups)
+        if not group_ids:
+            raise SystemExit("No groups found: seed groups first")
+        items = _build_items(args.rows, group_ids, stream_ids)
+        body = {"subject_id": args.subject_id, "name": "bench batch", "items": items}
+
+        started = time.perf_counter()
+        response = client.post(f"{api}/workloads/batch", json=body)
+        elapsed = time.perf_counter() - started
+        response.raise_for_status()
+        created = len(response.json())
+
+        print(f"items               {len(items)}")
+        print(f"targets             {len(group_ids)} groups, {len(stream_ids)} streams")
+        print(f"duration            {elapsed:.2f} s")
+        print(f"created             {created}  ({created / elapsed:.0f} rows/s)")
+
+        if args.cleanup:
+            response = client.delete(
+                f"{api}/workloads/group", params={"subject_id": args.subject_id}
+            )
+            response.raise_for_status()
+            print(f"deleted             {response.json()['deleted_count']}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Workload batch create benchmark")
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--prefix", default="/api/v1")
+    parser.add_argument("--username", required=True)
+    parser.add_argument("--password", required=True)
+    parser.add_argument("--subject-id", type=int, required=True)
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--groups", type=int, default=100, help="groups/streams to use")
+    parser.add_argument("--cleanup", action="store_true")
+    parser.add_argument("--timeout", type=float, default=300.0, help="seconds")
+    run(parser.parse_args())
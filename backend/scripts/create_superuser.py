@@ -59,6 +59,7 @@ async def create_superuser():
             is_superuser=True,
             name="Admin User",
             roles=[admin_role],  # SQL Alchemy should handle the relationship
+            auth_roles=[admin_role.name],
         )
 
         db.add(new_user)
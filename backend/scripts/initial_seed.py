@@ -7,25 +7,58 @@ import asyncio
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
+from app.db import base  # Register all models for SQLAlchemy
 from app.db.session import SessionLocal
+from app.db.invalidation import invalidation_bus
 from app.models.role import Role, Permission
-from app.core.rbac import Permissions, ROLE_PERMISSIONS
+from app.models.seed_state import SeedState
+from app.core.rbac import (
+    PERMISSION_BITS,
+    ROLE_PERMISSIONS,
+    role_permissions_fingerprint,
+)
 
 from sqlalchemy.orm import selectinload
 
 """
 Ushbu skript dastlabki rollar (roles) va ruxsatnomalarni (permissions) bazaga yozish uchun ishlatiladi.
+Odatda scripts/prestart.py orqali, faqat ROLE_PERMISSIONS o'zgarganda ishga tushiriladi.
 """
 
+SEED_KEY = "rbac"
+
+
+async def _assign_bits(db: AsyncSession, perms) -> None:
+    """
+    Biti yo'q ruxsatnomalarga bit beradi: iloji bo'lsa PERMISSION_BITS'dagi
+    o'rni, aks holda keyingi bo'sh bit. Mavjud bitlar o'zgartirilmaydi.
+    """
+    result = await db.execute(select(Permission.bit).where(Permission.bit.is_not(None)))
+    taken = set(result.scalars().all())
+    for perm in sorted(perms, key=lambda p: p.slug):
+        if perm.bit is not None:
+            continue
+        preferred = (
+            PERMISSION_BITS.index(perm.slug) if perm.slug in PERMISSION_BITS else None
+        )
+        if preferred is not None and preferred not in taken:
+            perm.bit = preferred
+        else:
+            perm.bit = max(taken, default=-1) + 1
+        taken.add(perm.bit)
+        print(f"Assigned bit {perm.bit} to permission: {perm.slug}")
+
 
 async def seed_data():
     """
     Boshlang'ich ma'lumotlarni yozish funksiyasi:
     1. Ruxsatnomalarni yaratadi.
     2. Rollarni yaratadi va ularga tegishli ruxsatnomalarni biriktiradi.
+    3. ROLE_PERMISSIONS fingerprint'ini seed_state jadvaliga yozadi.
+
+    Barcha ruxsatnoma va rollar bittadan emas, bitta IN so'rovi bilan o'qiladi.
     """
     async with SessionLocal() as db:
-        # ... (permissions seeding same as before) ...
         # 1. Seed Permissions
         print("Seeding permissions...")
         all_permissions = set()
@@ -33,54 +66,60 @@ async def seed_data():
             for perm in perms:
                 all_permissions.add(perm)
 
-        db_perms = {}
-        for perm_slug in all_permissions:
-            stmt = select(Permission).where(Permission.slug == perm_slug)
-            result = await db.execute(stmt)
-            existing_perm = result.scalar_one_or_none()
+        result = await db.execute(
+            select(Permission).where(Permission.slug.in_(all_permissions))
+        )
+        db_perms = {perm.slug: perm for perm in result.scalars().all()}
 
-            if not existing_perm:
-                new_perm = Permission(
-                    slug=perm_slug, description=f"Permission for {perm_slug}"
-                )
-                db.add(new_perm)
-                await db.flush()  # get ID
-                db_perms[perm_slug] = new_perm
-                print(f"Created permission: {perm_slug}")
-            else:
-                db_perms[perm_slug] = existing_perm
+        missing_perms = [
+            Permission(slug=slug, description=f"Permission for {slug}")
+            for slug in sorted(all_permissions - db_perms.keys())
+        ]
+        if missing_perms:
+            db.add_all(missing_perms)
+            await db.flush()  # get IDs
+            for perm in missing_perms:
+                db_perms[perm.slug] = perm
+                print(f"Created permission: {perm.slug}")
+
+        await _assign_bits(db, db_perms.values())
 
         # 2. Seed Roles
         print("Seeding roles...")
+        # Eagerly load permissions to avoid MissingGreenlet
+        result = await db.execute(
+            select(Role)
+            .options(selectinload(Role.permissions))
+            .where(Role.name.in_(ROLE_PERMISSIONS.keys()))
+        )
+        db_roles = {role.name: role for role in result.scalars().all()}
+
         for role_name, perm_slugs in ROLE_PERMISSIONS.items():
-            # Eagerly load permissions to avoid MissingGreenlet
-            stmt = (
-                select(Role)
-                .options(selectinload(Role.permissions))
-                .where(Role.name == role_name)
-            )
-            result = await db.execute(stmt)
-            existing_role = result.scalar_one_or_none()
+            role_perms = [db_perms[slug] for slug in perm_slugs if slug in db_perms]
+            existing_role = db_roles.get(role_name)
 
             if not existing_role:
-                new_role = Role(name=role_name, description=f"Default role {role_name}")
-                db.add(new_role)
-                await db.flush()
-                # Re-fetch with eager load to ensure permissions are bound and to avoid MissingGreenlet
-                result = await db.execute(stmt)
-                existing_role = result.scalar_one()
+                # Yangi obyekt: permissions'ni to'g'ridan-to'g'ri berish lazy load qilmaydi
+                db.add(
+                    Role(
+                        name=role_name,
+                        description=f"Default role {role_name}",
+                        permissions=role_perms,
+                    )
+                )
                 print(f"Created role: {role_name}")
-
-            # Prepare permission objects
-            role_perms = []
-            for slug in perm_slugs:
-                if slug in db_perms:
-                    role_perms.append(db_perms[slug])
+                continue
 
             # Update permissions
             existing_role.permissions = role_perms
             print(f"Updated permissions for role: {role_name}")
 
+        # Ishlab turgan worker'lar rollar keshini tozalasin (rolling restart)
+        await invalidation_bus.publish(db, "roles", "update")
+
+        # 3. Fingerprint
+        await db.merge(SeedState(key=SEED_KEY, fingerprint=role_permissions_fingerprint()))
+
         await db.commit()
         print("Seeding completed.")
 
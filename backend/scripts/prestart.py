@@ -0,0 +1,114 @@
+import sys
+import os
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(BASE_DIR)
+
+import asyncio
+import time
+
+from alembic import command
+from alembic.config import Config
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.core.config import settings
+from app.core.rbac import role_permissions_fingerprint
+from initial_seed import SEED_KEY, seed_data
+
+"""
+Konteyner ishga tushishidan oldin bajariladigan skript (Dockerfile CMD):
+migratsiyalar (alembic upgrade head) va boshlang'ich ma'lumotlar (initial_seed).
+
+Bir nechta replika bir vaqtda ishga tushganda ular bir-biri bilan poyga qilmasligi
+uchun ish Postgres advisory lock ostida bajariladi. Sxema allaqachon head'da va
+ROLE_PERMISSIONS fingerprint'i o'zgarmagan bo'lsa, lock ham olinmaydi - skript
+bir necha millisekundda tugaydi.
+
+Eslatma: advisory lock sessiya darajasida, shuning uchun DATABASE_URL PgBouncer'ning
+transaction rejimiga emas, to'g'ridan-to'g'ri Postgres'ga (yoki session rejimiga)
+qarashi kerak.
+"""
+
+# Ixtiyoriy, lekin barcha replikalarda bir xil bo'lishi shart
+ADVISORY_LOCK_KEY = 7_305_118_421
+
+
+def _alembic_config() -> Config:
+    return Config(os.path.join(BASE_DIR, "alembic.ini"))
+
+
+async def _pending_work(conn: AsyncConnection, heads: set, fingerprint: str):
+    """(migratsiya kerakmi, seed kerakmi) juftligini qaytaradi."""
+    current = set(
+        await conn.run_sync(
+            lambda sync_conn: MigrationContext.configure(sync_conn).get_current_heads()
+        )
+    )
+    needs_migration = current != heads
+
+    stored = None
+    if (await conn.scalar(text("SELECT to_regclass('seed_state')"))) is not None:
+        stored = await conn.scalar(
+            text("SELECT fingerprint FROM seed_state WHERE key = :key"),
+            {"key": SEED_KEY},
+        )
+    # Seed faqat ROLE_PERMISSIONS o'zgarganda (yoki hali bajarilmagan bo'lsa):
+    # rol ruxsatnomalarini adminlar bazada boshqaradi, oddiy migratsiya ularni
+    # seed bilan qayta yozmasligi kerak
+    needs_seed = stored != fingerprint
+    await conn.rollback()
+    return needs_migration, needs_seed
+
+
+async def prestart() -> None:
+    started = time.perf_counter()
+    alembic_cfg = _alembic_config()
+    heads = set(ScriptDirectory.from_config(alembic_cfg).get_heads())
+    fingerprint = role_permissions_fingerprint()
+
+    engine = create_async_engine(settings.DATABASE_URL, poolclass=NullPool)
+    try:
+        async with engine.connect() as conn:
+            needs_migration, needs_seed = await _pending_work(conn, heads, fingerprint)
+            if not needs_migration and not needs_seed:
+                print(
+                    "Schema at head and roles up to date, skipping "
+                    f"({(time.perf_counter() - started) * 1000:.0f} ms)."
+                )
+                return
+
+            print("Waiting for prestart lock...")
+            await conn.execute(
+                text("SELECT pg_advisory_lock(:key)"), {"key": ADVISORY_LOCK_KEY}
+            )
+            await conn.commit()
+            try:
+                # Lock kutilayotganda boshqa replika ishni bajargan bo'lishi mumkin
+                needs_migration, needs_seed = await _pending_work(
+                    conn, heads, fingerprint
+                )
+                if needs_migration:
+                    print("Running migrations...")
+                    # env.py o'zining asyncio.run() siklini ishlatadi - alohida oqimda
+                    await asyncio.to_thread(command.upgrade, alembic_cfg, "head")
+                if needs_seed:
+                    await seed_data()
+                if not needs_migration and not needs_seed:
+                    print("Another replica finished prestart, skipping.")
+            finally:
+                await conn.execute(
+                    text("SELECT pg_advisory_unlock(:key)"), {"key": ADVISORY_LOCK_KEY}
+                )
+                await conn.commit()
+    finally:
+        await engine.dispose()
+
+    print(f"Prestart completed in {time.perf_counter() - started:.1f} s.")
+
+
+if __name__ == "__main__":
+    asyncio.run(prestart())
@@ -1,4 +1,5 @@
 import axios from 'axios';
+import { jwtDecode } from "jwt-decode";
 import useAuthStore from '../store/authStore';
 
 // Access environment variable, fallback to localhost for dev
@@ -11,10 +12,24 @@ const api = axios.create({
     },
 });
 
+// Refresh a little before expiry so requests don't bounce off a 401 first
+const REFRESH_MARGIN_MS = 30 * 1000;
+
+const isExpiring = (token) => {
+    try {
+        return jwtDecode(token).exp * 1000 - REFRESH_MARGIN_MS < Date.now();
+    } catch (error) {
+        return false;
+    }
+};
+
 // Request interceptor for adding auth token
 api.interceptors.request.use(
-    (config) => {
-        const token = localStorage.getItem('token');
+    async (config) => {
+        let token = localStorage.getItem('token');
+        if (token && isExpiring(token) && localStorage.getItem('refresh_token')) {
+            token = await useAuthStore.getState().refreshSession();
+        }
         if (token) {
             config.headers['Authorization'] = `Bearer ${token}`;
         }
@@ -28,9 +43,18 @@ api.interceptors.request.use(
 // Response interceptor for handling errors (e.g., 401 unauthorized)
 api.interceptors.response.use(
     (response) => response,
-    (error) => {
+    async (error) => {
+        const original = error.config;
         if (error.response && error.response.status === 401) {
-            // Token might be expired
+            // Token expired or revoked: try the refresh token once, then give up
+            if (original && !original._retried) {
+                original._retried = true;
+                const token = await useAuthStore.getState().refreshSession();
+                if (token) {
+                    original.headers['Authorization'] = `Bearer ${token}`;
+                    return api(original);
+                }
+            }
             const { logout } = useAuthStore.getState();
             logout();
             window.location.href = '/login';
@@ -4,6 +4,23 @@ import axios from 'axios';
 
 const API_URL = import.meta.env.VITE_API_URL || '/rest/api/v1';
 
+const clearStorage = () => {
+    localStorage.removeItem('token');
+    localStorage.removeItem('refresh_token');
+    localStorage.removeItem('permissions');
+};
+
+const userFromToken = (decoded) => ({
+    email: decoded.sub,
+    id: decoded.id,
+    role: decoded.role,
+    name: decoded.name,
+    is_superuser: !!decoded.su
+});
+
+// Only one refresh request at a time; concurrent callers share its result
+let refreshPromise = null;
+
 const useAuthStore = create((set, get) => ({
     user: null,
     token: localStorage.getItem('token'),
@@ -12,6 +29,28 @@ const useAuthStore = create((set, get) => ({
     error: null,
     permissions: [],
 
+    // Stores a token response from /auth/access-token or /auth/refresh
+    setSession: (data) => {
+        const { access_token, refresh_token } = data;
+        localStorage.setItem('token', access_token);
+        if (refresh_token) {
+            localStorage.setItem('refresh_token', refresh_token);
+        }
+
+        const decoded = jwtDecode(access_token);
+        // Token only carries a compact permission bitmask; the list comes with the login response
+        const permissions = data.permissions || decoded.permissions || [];
+        localStorage.setItem('permissions', JSON.stringify(permissions));
+
+        set({
+            token: access_token,
+            isAuthenticated: true,
+            user: userFromToken(decoded),
+            permissions
+        });
+        return access_token;
+    },
+
     login: async (email, password) => {
         set({ loading: true, error: null });
         try {
@@ -25,23 +64,8 @@ const useAuthStore = create((set, get) => ({
                 }
             });
 
-            const { access_token } = response.data;
-            localStorage.setItem('token', access_token);
-
-            const decoded = jwtDecode(access_token);
-
-            set({
-                token: access_token,
-                isAuthenticated: true,
-                user: {
-                    email: decoded.sub,
-                    id: decoded.id,
-                    role: decoded.role,
-                    name: decoded.name
-                },
-                permissions: decoded.permissions || [],
-                loading: false
-            });
+            get().setSession(response.data);
+            set({ loading: false });
 
             return true;
         } catch (error) {
@@ -54,8 +78,45 @@ const useAuthStore = create((set, get) => ({
         }
     },
 
+    // Exchanges the refresh token for a new access token (no password check).
+    // Resolves to the new access token, or null if the session is over.
+    refreshSession: () => {
+        if (!refreshPromise) {
+            const refresh_token = localStorage.getItem('refresh_token');
+            if (!refresh_token) {
+                return Promise.resolve(null);
+            }
+            refreshPromise = axios
+                .post(`${API_URL}/auth/refresh`, { refresh_token })
+                .then((response) => get().setSession(response.data))
+                .catch(() => {
+                    // Another tab may have rotated the token in the meantime
+                    if (localStorage.getItem('refresh_token') !== refresh_token) {
+                        return localStorage.getItem('token');
+                    }
+                    get().logout();
+                    return null;
+                })
+                .finally(() => {
+                    refreshPromise = null;
+                });
+        }
+        return refreshPromise;
+    },
+
     logout: () => {
-        localStorage.removeItem('token');
+        const token = localStorage.getItem('token');
+        if (token) {
+            // Revoke the access token and end the refresh-token session server-side
+            axios
+                .post(
+                    `${API_URL}/auth/logout`,
+                    { refresh_token: localStorage.getItem('refresh_token') },
+                    { headers: { Authorization: `Bearer ${token}` } }
+                )
+                .catch(() => {});
+        }
+        clearStorage();
         set({ user: null, token: null, isAuthenticated: false, permissions: [] });
     },
 
@@ -64,24 +125,19 @@ const useAuthStore = create((set, get) => ({
         if (token) {
             try {
                 const decoded = jwtDecode(token);
-                // Check if token is expired
-                if (decoded.exp * 1000 < Date.now()) {
-                    localStorage.removeItem('token');
+                // Expired access token is fine while a refresh token is available
+                if (decoded.exp * 1000 < Date.now() && !localStorage.getItem('refresh_token')) {
+                    clearStorage();
                     set({ user: null, token: null, isAuthenticated: false, permissions: [] });
                 } else {
                     set({
-                        user: {
-                            email: decoded.sub,
-                            id: decoded.id,
-                            role: decoded.role,
-                            name: decoded.name
-                        },
-                        permissions: decoded.permissions || [],
+                        user: userFromToken(decoded),
+                        permissions: JSON.parse(localStorage.getItem('permissions') || 'null') || decoded.permissions || [],
                         isAuthenticated: true
                     });
                 }
             } catch (error) {
-                localStorage.removeItem('token');
+                clearStorage();
                 set({ user: null, token: null, isAuthenticated: false, permissions: [] });
             }
         }
@@ -89,10 +145,8 @@ const useAuthStore = create((set, get) => ({
 
     hasPermission: (permission) => {
         const { permissions, user } = get();
-        // If user is superuser (implied by admin role or specific flag if we had one)
-        // For now, let's assume 'admin' role has all perms based on backend mapping, 
-        // but in backend superuser bypasses everything. 
-        // Since we don't send is_superuser in token yet, we rely on permissions list.
+        // Superusers bypass permission checks on the backend as well
+        if (user?.is_superuser) return true;
         if (!permissions) return false;
         return permissions.includes(permission);
     }